@@ -1,31 +1,41 @@
-"""ESolar Cloud Platform Basic Test"""
-import requests
-import json
-import sys
-from esolar import get_esolar_data
-
-REGION = "eu"
-USER = "NAME"
-PASSWORD = "PASSWORD"
-OUTPUT_FILE = "output.txt"
-
-f=open(OUTPUT_FILE, "w")
-try:
-    print("Obtaining plant information")
-    plant_info = get_esolar_data(REGION, USER, PASSWORD)
-    
-    print(f"\nProducing the output into {OUTPUT_FILE}")
-    f.write(json.dumps(plant_info))
-
-    f.close()
-    
-except requests.exceptions.HTTPError as errh:
-    sys.exit(errh)
-except requests.exceptions.ConnectionError as errc:
-    sys.exit(errc)
-except requests.exceptions.Timeout as errt:
-    sys.exit(errt)
-except requests.exceptions.RequestException as errr:
-    sys.exit(errr)
-except ValueError as errv:
-    sys.exit(errv)
+"""ESolar Cloud Platform Basic Test"""
+import asyncio
+import aiohttp
+import json
+import sys
+from esolar import TokenStore, get_esolar_data, set_token_store
+
+REGION = "eu"
+USER = "NAME"
+PASSWORD = "PASSWORD"
+OUTPUT_FILE = "output.txt"
+
+
+async def fetch_plant_info():
+    """Fetch plant data with a private aiohttp client session."""
+    # keep the tokens of the run in memory, not in a user_data.json next to esolar.py
+    set_token_store(TokenStore())
+    async with aiohttp.ClientSession() as websession:
+        return await get_esolar_data(websession, REGION, USER, PASSWORD)
+
+
+f=open(OUTPUT_FILE, "w")
+try:
+    print("Obtaining plant information")
+    plant_info = asyncio.run(fetch_plant_info())
+    
+    print(f"\nProducing the output into {OUTPUT_FILE}")
+    f.write(json.dumps(plant_info))
+
+    f.close()
+    
+except aiohttp.ClientResponseError as errh:
+    sys.exit(errh)
+except aiohttp.ClientConnectionError as errc:
+    sys.exit(errc)
+except TimeoutError as errt:
+    sys.exit(errt)
+except aiohttp.ClientError as errr:
+    sys.exit(errr)
+except ValueError as errv:
+    sys.exit(errv)
@@ -0,0 +1,337 @@
+"""End to end refresh benchmark against the local SAJ API, with JSON baselines
+
+    python benchmark.py --sizes 1 10 100 --save baseline.json
+    python benchmark.py --sizes 1 10 100 --compare baseline.json --threshold wall_s=0.3
+
+For every fleet size a fleet.py fleet is served by the mock in a separate
+process (so its CPU time is not counted), then the full Home Assistant path
+is driven cycle by cycle: ESolarCoordinator._async_update_data (which runs
+get_esolar_data), then the coordinator update of every entity created by
+sensor.async_setup_entry, including create_plant_dashboard_sensors.
+
+Per cycle it measures wall time, requests answered by the mock, CPU time,
+peak traced memory and state writes. The first cycle runs as after a restart,
+with the stored token but nothing fetched yet (cold), the later ones only
+fetch what is due (warm, medians reported).
+Peak memory comes from one extra traced cycle, tracemalloc would skew the
+timings of the others.
+
+--compare exits with 1 when a metric is worse than the baseline by more
+than its threshold (a share, 0.25 is 25%). Thresholds given on the command
+line override those stored in the baseline, which override DEFAULT_THRESHOLDS.
+
+Needs homeassistant installed, the integration is imported as a package.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+
+BASIC_TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.join(BASIC_TEST_DIR, "..")
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BASIC_TEST_DIR)
+
+from homeassistant.const import CONF_PASSWORD, CONF_REGION, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from custom_components.saj_esolar_air import (
+    ESolarCoordinator,
+    _async_get_account,
+    async_setup_token_store,
+)
+from custom_components.saj_esolar_air import sensor
+from custom_components.saj_esolar_air.const import (
+    CONF_INVERTER_SENSORS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MONITORED_SITES,
+    CONF_PV_GRID_DATA,
+    DOMAIN,
+)
+from custom_components.saj_esolar_air.esolar import BASE_URL_ENV, WEB_PLANT_DATA, RateLimiter
+from fleet import generate_fleet
+
+METRICS = ("wall_s", "fetch_s", "process_s", "cpu_s", "requests", "state_writes", "peak_memory_kb")
+DEFAULT_THRESHOLDS = {
+    "wall_s": 0.25,
+    "fetch_s": 0.25,
+    "process_s": 0.25,
+    "cpu_s": 0.25,
+    "requests": 0.0,
+    "state_writes": 0.0,
+    "peak_memory_kb": 0.2,
+}
+# differences below these are noise whatever the share
+NOISE_FLOOR = {"wall_s": 0.01, "fetch_s": 0.01, "process_s": 0.005, "cpu_s": 0.01, "peak_memory_kb": 64}
+USERNAME = "demo"
+PASSWORD = "demo"
+
+
+class BenchmarkEntry:
+    """The parts of a ConfigEntry the coordinator and the sensor platform use."""
+
+    def __init__(self, plant_names, max_concurrency):
+        self.entry_id = "benchmark"
+        self.title = "benchmark"
+        self.domain = DOMAIN
+        self.pref_disable_polling = False
+        self.data = {CONF_REGION: "eu", CONF_USERNAME: USERNAME, CONF_PASSWORD: PASSWORD}
+        self.options = {
+            CONF_MONITORED_SITES: plant_names,
+            CONF_INVERTER_SENSORS: True,
+            CONF_PV_GRID_DATA: True,
+            CONF_MAX_CONCURRENT_REQUESTS: max_concurrency,
+        }
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    async def async_unload(self):
+        for func in reversed(self._on_unload):
+            result = func()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+class MockProcess:
+    """fleet.py --serve running in its own process."""
+
+    def __init__(self, plants, devices, seed, latency, jitter):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BASIC_TEST_DIR, "fleet.py"),
+             "--plants", str(plants), "--devices", str(devices), "--seed", str(seed),
+             "--latency", str(latency), "--jitter", str(jitter),
+             "--serve", "--port", str(self.port)],
+            stdout=subprocess.DEVNULL,
+        )
+
+    async def wait_ready(self, websession, timeout=30.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                return await self.stats(websession)
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError("The mock SAJ API did not start")
+
+    async def stats(self, websession):
+        async with websession.get(f"{self.url}/mock/stats") as response:
+            return await response.json()
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def setup_entities(hass, entry, coordinator):
+    """Create the entities like the sensor platform does and count their state writes."""
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    entities = []
+
+    def add_entities(new_entities, update_before_add=False):
+        entities.extend(new_entities)
+
+    await sensor.async_setup_entry(hass, entry, add_entities)
+    writes = [0]
+
+    def count_write():
+        writes[0] += 1
+
+    for entity in entities:
+        entity.hass = hass
+        entity.async_write_ha_state = count_write
+        await entity.async_update()
+        # what CoordinatorEntity.async_added_to_hass subscribes
+        entry.async_on_unload(
+            coordinator.async_add_listener(
+                entity._handle_coordinator_update, entity.coordinator_context
+            )
+        )
+    return entities, writes
+
+
+async def run_cycle(coordinator, mock, websession, writes):
+    """One refresh: fetch through the coordinator, then update every entity."""
+    before = (await mock.stats(websession))["requests"]
+    writes[0] = 0
+    cpu = time.process_time()
+    start = time.perf_counter()
+    data = await coordinator._async_update_data()
+    fetched = time.perf_counter()
+    coordinator.async_set_updated_data(data)
+    done = time.perf_counter()
+    cpu = time.process_time() - cpu
+    after = (await mock.stats(websession))["requests"]
+    return {
+        "wall_s": done - start,
+        "fetch_s": fetched - start,
+        "process_s": done - fetched,
+        "cpu_s": cpu,
+        "requests": after - before,
+        "state_writes": writes[0],
+    }
+
+
+async def run_size(plants, args):
+    """Benchmark one fleet size, return its cold and warm cycle metrics."""
+    mock = MockProcess(plants, args.devices, args.seed, args.latency, args.jitter)
+    config_dir = tempfile.TemporaryDirectory()
+    hass = HomeAssistant(config_dir.name)
+    entry = None
+    try:
+        async with aiohttp.ClientSession() as websession:
+            stats = await mock.wait_ready(websession)
+            os.environ[BASE_URL_ENV] = f"{mock.url}/dev-api/api/v1"
+            plant_names = [plant["entry"]["plantName"] for plant in generate_fleet(plants, args.devices, args.seed)]
+            entry = BenchmarkEntry(plant_names, args.concurrency)
+            await async_setup_token_store(hass)
+            account = await _async_get_account(hass, entry)
+            if not args.cloud_rate_limit:
+                # the mock does not rate limit, measure the integration and not the limiter
+                account.limiter = RateLimiter(rate=10000.0, burst=10000)
+            coordinator = ESolarCoordinator(hass, entry, account)
+            # the first refresh of the entry setup, the entities are created from its data
+            coordinator.data = await coordinator._async_update_data()
+            entities, writes = await setup_entities(hass, entry, coordinator)
+            # forget everything fetched, like a restart: only the stored token is left
+            WEB_PLANT_DATA.clear()
+            await account.reset("benchmark", drop_session=True)
+
+            cycles = [await run_cycle(coordinator, mock, websession, writes) for _ in range(args.cycles)]
+            tracemalloc.start()
+            await run_cycle(coordinator, mock, websession, writes)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            await coordinator.async_shutdown()
+            await account.close()
+    finally:
+        if entry is not None:
+            await entry.async_unload()
+        await hass.async_stop(force=True)
+        mock.stop()
+        config_dir.cleanup()
+
+    warm = cycles[1:] or cycles
+    result = {
+        "plants": stats["plants"],
+        "devices": stats["devices"],
+        "entities": len(entities),
+        "cold": cycles[0],
+        "warm": {metric: statistics.median(cycle[metric] for cycle in warm) for metric in cycles[0]},
+    }
+    result["warm"]["peak_memory_kb"] = round(peak / 1024)
+    return result
+
+
+def compare(results, baseline, thresholds):
+    """Print the differences to the baseline and return the regressions."""
+    regressions = []
+    for size, result in results.items():
+        base = baseline["results"].get(size)
+        if base is None:
+            print(f"{size} plants: not in the baseline")
+            continue
+        for phase in ("cold", "warm"):
+            for metric in METRICS:
+                if metric not in result[phase] or metric not in base[phase]:
+                    continue
+                new, old = result[phase][metric], base[phase][metric]
+                limit = old * (1 + thresholds[metric])
+                worse = new > limit and new - old > NOISE_FLOOR.get(metric, 0)
+                change = (new - old) / old * 100 if old else 0.0
+                print(f"{size:>6} {phase:<5}{metric:<16}{old:>12.4g}{new:>12.4g}{change:>+9.1f}%{'  REGRESSION' if worse else ''}")
+                if worse:
+                    regressions.append((size, phase, metric, old, new))
+    return regressions
+
+
+def print_results(results):
+    print(f"{'plants':>6} {'phase':<6}" + "".join(f"{metric:>15}" for metric in METRICS))
+    for size, result in results.items():
+        for phase in ("cold", "warm"):
+            print(f"{size:>6} {phase:<6}" + "".join(
+                f"{result[phase].get(metric, ''):>15.4g}" if metric in result[phase] else f"{'':>15}"
+                for metric in METRICS
+            ))
+        print(f"{'':>6} {result['devices']} devices, {result['entities']} entities")
+
+
+def parse_thresholds(values):
+    thresholds = {}
+    for value in values or []:
+        metric, _, share = value.partition("=")
+        if metric not in DEFAULT_THRESHOLDS:
+            sys.exit(f"Unknown metric {metric}, known: {', '.join(DEFAULT_THRESHOLDS)}")
+        thresholds[metric] = float(share)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="fleet sizes in plants")
+    parser.add_argument("--devices", type=int, default=2, help="devices per plant")
+    parser.add_argument("--cycles", type=int, default=5, help="measured cycles per size, the first one is cold")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock answer delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=4, help="max concurrent requests option")
+    parser.add_argument("--cloud-rate-limit", action="store_true", help="keep the request rate limit of the cloud")
+    parser.add_argument("--save", metavar="FILE", help="store the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results to a baseline")
+    parser.add_argument("--threshold", action="append", metavar="METRIC=SHARE", help="allowed regression, e.g. wall_s=0.3")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        print(f"Benchmarking {size} plant(s)...", flush=True)
+        results[str(size)] = asyncio.run(run_size(size, args))
+    print()
+    print_results(results)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {key: getattr(args, key) for key in ("devices", "cycles", "seed", "latency", "jitter", "concurrency", "cloud_rate_limit")},
+        "thresholds": {**DEFAULT_THRESHOLDS, **parse_thresholds(args.threshold)},
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=1)
+        print(f"\nBaseline written to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("options") != report["options"]:
+            print(f"\nWarning: the baseline was taken with {baseline.get('options')}")
+        thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {}), **parse_thresholds(args.threshold)}
+        print(f"\n{'plants':>6} {'phase':<5}{'metric':<16}{'baseline':>12}{'now':>12}{'change':>10}")
+        regressions = compare(results, baseline, thresholds)
+        if regressions:
+            sys.exit(f"\n{len(regressions)} metric(s) regressed beyond their threshold")
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
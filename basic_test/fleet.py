@@ -0,0 +1,332 @@
+"""Synthetic SAJ fleets for scale testing, served by mock_server.py or written as fixtures
+
+    python fleet.py --plants 200 --devices 3 --serve --port 8765
+    python fleet.py --plants 50 --fixture fleet_50
+
+A fleet is a list of plant records in the form MockSajApi serves. Plants
+cycle through the flow types recognised by set_energy_flow_type (CMP, C6,
+CH2, H2, Lora) and plain grid tied and storage plants. Records are internally
+consistent: device serial numbers, batteries, SEC/EMS modules, PV strings
+and alarms all refer to each other, and the totals of a plant add up from
+its devices. The same seed always gives the same fleet.
+
+--fixture runs a full refresh against the served fleet and stores the result
+the way get_esolar_data_static_file reads it (data/<name>.json next to
+esolar.py), for BASIC_TEST runs without any HTTP.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import sys
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_server import MockSajApi
+
+# flow type: plant type, detail flags, device model prefix, rated power range (kW)
+FLOW_TYPES = {
+    "CMP": (1, {"ifCMPDevice": 1, "ifInstallPv": 1}, "CMP", (5, 15)),
+    "C6": (1, {"ifCHDevice": 1, "ifC6Device": 1, "isInstallEms": 1, "queryDeviceDataType": 2}, "C6", (50, 125)),
+    "CH2": (1, {"ifCHDevice": 1}, "CH2", (29.9, 50)),
+    "H2": (1, {"hasH2Device": 1}, "H2", (5, 10)),
+    "Lora": (0, {"isInstallLoraMeter": 1}, "R6", (3, 10)),
+    "Grid": (0, {}, "R5", (3, 10)),
+    "Storage": (1, {"isInstallMeter": 1}, "H1", (3, 6)),
+}
+STORAGE_FLOW_TYPES = ("CMP", "C6", "CH2", "H2", "Storage")
+FIXTURE_CONCURRENCY = 16
+
+CITIES = [
+    ("Budapest", "HU", 47.50, 19.04),
+    ("Vienna", "AT", 48.21, 16.37),
+    ("Munich", "DE", 48.14, 11.58),
+    ("Milan", "IT", 45.46, 9.19),
+    ("Madrid", "ES", 40.42, -3.70),
+    ("Warsaw", "PL", 52.23, 21.01),
+    ("Amsterdam", "NL", 52.37, 4.90),
+    ("Lisbon", "PT", 38.72, -9.14),
+]
+
+ALARMS = [
+    ("Grid voltage high", 1, "W0101"),
+    ("Grid frequency out of range", 2, "W0203"),
+    ("PV insulation resistance low", 3, "E0302"),
+    ("Battery communication lost", 2, "E0508"),
+    ("Fan failure", 1, "W0710"),
+]
+
+
+def generate_fleet(plants=10, devices=2, seed=0, flow_types=None, offline_share=0.05, alarm_share=0.2):
+    """Return ``plants`` plant records with ``devices`` devices each."""
+    rng = random.Random(seed)
+    kinds = list(flow_types or FLOW_TYPES)
+    return [
+        _plant(rng, index, kinds[index % len(kinds)], devices, rng.random() < offline_share, alarm_share)
+        for index in range(plants)
+    ]
+
+
+def _serial(rng, prefix, length=18):
+    digits = "".join(rng.choice("0123456789ABCDEFGHJKLMNPRSTUVWXYZ") for _ in range(length - len(prefix)))
+    return prefix + digits
+
+
+def _plant(rng, index, kind, device_count, offline, alarm_share):
+    plant_type, flags, model, power_range = FLOW_TYPES[kind]
+    storage = kind in STORAGE_FLOW_TYPES
+    city, country, latitude, longitude = rng.choice(CITIES)
+    uid = f"{rng.getrandbits(32):08x}-{rng.getrandbits(16):04x}-4{rng.getrandbits(12):03x}-a{rng.getrandbits(12):03x}-{rng.getrandbits(48):012x}"
+    name = f"{kind} plant {index + 1:04d}"
+    plant_no = f"P{index + 1:07d}"
+
+    devices, device_stats, device_battery = [], {}, {}
+    for number in range(max(1, device_count)):
+        rated = round(rng.uniform(*power_range), 1)
+        serial = _serial(rng, model)
+        built_in_battery = storage and number == 0
+        devices.append({
+            "deviceSn": serial,
+            "deviceModel": f"{model}-{rated:g}K-T2",
+            "devicePc": serial,
+            "aliases": f"{name} inverter {number + 1}",
+            # 2: inverter with a built in battery, 0: PV inverter
+            "type": 2 if built_in_battery else 0,
+            "isMasterFlag": int(number == 0),
+            "onLine": 0 if offline else 1,
+            "runningState": 3 if offline else 1,
+            "hasBattery": int(built_in_battery),
+            "ratedPower": rated,
+            "displayFw": f"V1.{rng.randrange(100):03d}",
+            "masterMCUFw": f"V3.{rng.randrange(1000):03d}",
+        })
+        years = rng.uniform(0.5, 6)
+        total = round(rated * 1100 * years, 1)
+        device_stats[serial] = {
+            "pvStrings": rng.randrange(1, 5),
+            "monthPvEnergy": round(rated * rng.uniform(40, 160), 1),
+            "totalPvEnergy": total,
+        }
+        if built_in_battery:
+            capacity = rng.choice((5.1, 10.2, 15.3))
+            device_stats[serial].update({
+                "batCapcity": 100,
+                "todayBatChgEnergy": round(capacity * rng.uniform(0.2, 0.9), 2),
+                "todayBatDisEnergy": round(capacity * rng.uniform(0.2, 0.9), 2),
+                "totalBatChgEnergy": round(capacity * 300 * years, 1),
+                "totalBatDisEnergy": round(capacity * 280 * years, 1),
+            })
+            device_battery[serial] = {"batEnergyPercent": rng.randrange(10, 100), "batTemperature": round(rng.uniform(15, 35), 1)}
+
+    system_power = round(sum(device["ratedPower"] for device in devices), 1)
+    total_energy = round(sum(stats["totalPvEnergy"] for stats in device_stats.values()), 1)
+    month_energy = round(sum(stats["monthPvEnergy"] for stats in device_stats.values()), 1)
+    price = rng.choice((0.08, 0.12, 0.15, 0.2))
+
+    batteries = [
+        {
+            "batSn": serial,
+            "bmsSn": _serial(rng, "BMS"),
+            "batModel": rng.choice(("B1-5.1-48", "B2-10.2-96", "HS2-15.3-BAT")),
+            "bmsHardwareVersion": "V1.0",
+            "bmsSoftwareVersion": f"V2.{rng.randrange(10)}",
+            "unitOfTemperature": "C",
+            "type": 1,
+        }
+        for serial in device_battery
+    ]
+    meter = kind in ("Storage", "C6", "CMP") or rng.random() < 0.3
+    modules = [
+        {"moduleSn": _serial(rng, "M3W"), "moduleModel": "eSolar AIO3", "moduleFw": f"V1.{rng.randrange(100)}"}
+        for _ in range(1 if meter else 0)
+    ]
+    ems = [
+        {
+            "emsModuleSn": _serial(rng, "EMS"),
+            "emsModulePc": _serial(rng, "EMS"),
+            "emsModuleName": f"{name} EMS",
+            "emsModel": "EMS-C6",
+            "firmwareVersion": f"V1.{rng.randrange(50)}",
+            "hardwareVersion": "V1.0",
+        }
+        for _ in range(1 if kind == "C6" else 0)
+    ]
+    if kind == "C6":
+        # queryDeviceDataType 2 plants are queried by their EMS module
+        modules = [{"moduleSn": ems[0]["emsModuleSn"], "moduleModel": "EMS-C6", "moduleFw": ems[0]["firmwareVersion"]}]
+
+    alarms = []
+    if rng.random() < alarm_share:
+        today = datetime.datetime.now().replace(microsecond=0)
+        for _ in range(rng.randrange(1, 4)):
+            message, level, code = rng.choice(ALARMS)
+            device = rng.choice(devices)
+            start = today - datetime.timedelta(hours=rng.uniform(0, 60))
+            alarms.append({
+                "alarmId": rng.getrandbits(40),
+                "alarmName": message,
+                "alarmCode": code,
+                "alarmLevel": level,
+                "alarmStartTime": start.strftime("%Y-%m-%d %H:%M:%S"),
+                "alarmCommonState": rng.choice((1, 3)),
+                "deviceSn": device["deviceSn"],
+                "deviceSnType": device["type"],
+                "plantUid": uid,
+                "plantName": name,
+                "plantCountry": country,
+            })
+
+    details = {
+        "plantId": 1000000 + index,
+        "plantNo": plant_no,
+        "fullAddress": f"{rng.randrange(1, 200)} Solar street, {city}",
+        "latitude": round(latitude + rng.uniform(-0.5, 0.5), 4),
+        "longitude": round(longitude + rng.uniform(-0.5, 0.5), 4),
+        "timeZone": "UTC+01:00",
+        "currency": "EUR",
+        "createDate": (datetime.date.today() - datetime.timedelta(days=rng.randrange(100, 2000))).strftime("%Y-%m-%d 10:00:00"),
+        "ownerName": f"Owner {index + 1}",
+        "ownerEmail": f"owner{index + 1}@example.com",
+        "plantLogo": "",
+        "systemPower": system_power,
+        "isInstallMeter": int(meter),
+        "isInstallEms": 0,
+        "isInstallLoraMeter": 0,
+        "ifCMPDevice": 0,
+        "ifCHDevice": 0,
+        "ifC6Device": 0,
+        "hasH2Device": 0,
+        "ifInstallPv": 1,
+        "queryDeviceDataType": 1,
+        "totalReduceCo2": round(total_energy * 0.000997, 2),
+        "totalCoal": round(total_energy * 0.0004, 2),
+        "totalPlantTreeNum": round(total_energy * 0.054, 1),
+        "yearReduceCo2": round(total_energy * 0.0002, 2),
+        "yearCoal": round(total_energy * 0.00008, 2),
+        "yearPlantTreeNum": round(total_energy * 0.011, 1),
+        **flags,
+    }
+    return {
+        "entry": {
+            "plantUid": uid,
+            "plantName": name,
+            "plantNo": plant_no,
+            "type": plant_type,
+            "systemPower": system_power,
+            "isOnline": "N" if offline else "Y",
+            "runningState": 3 if offline else 1,
+        },
+        "details": details,
+        "statistics": {
+            "monthPvEnergy": month_energy,
+            "yearPvEnergy": round(total_energy * 0.3, 1),
+            "totalPvEnergy": total_energy,
+            "todayIncome": 0.0,
+            "monthIncome": round(month_energy * price, 2),
+            "yesterdayIncome": round(system_power * 4 * price, 2),
+            "totalIncome": round(total_energy * price, 2),
+            "incomeToday": 0.0,
+            "incomeMonth": round(month_energy * price, 2),
+            "incomeLastMonth": round(month_energy * 1.2 * price, 2),
+            "incomeTotal": round(total_energy * price, 2),
+        },
+        "overview": {
+            "totalEnergy": total_energy,
+            "todaySellEnergy": 0.0,
+            "totalSellEnergy": round(total_energy * 0.35, 1),
+            "todayBuyEnergy": round(rng.uniform(0, 5), 2),
+            "totalBuyEnergy": round(total_energy * 0.25, 1),
+            "peakPower": round(system_power * rng.uniform(0.7, 0.95), 2),
+        },
+        "flow": {
+            "homeLoadPower": round(system_power * rng.uniform(60, 200)),
+            "userModeName": "Self-use mode" if storage else "",
+            **({
+                "batEnergyPercent": next(iter(device_battery.values()))["batEnergyPercent"],
+                "usableBatCapacity": rng.choice((5.1, 10.2, 15.3)),
+                "batteryWorkTime": round(rng.uniform(2, 12), 1),
+            } if device_battery else {}),
+        },
+        "devices": devices,
+        "device_stats": device_stats,
+        "device_battery": device_battery,
+        "batteries": batteries,
+        "modules": modules,
+        "ems": ems,
+        "alarms": alarms,
+    }
+
+
+async def write_fixture(fleet, name, username="demo", password="demo"):
+    """Refresh the fleet through esolar.py and store the result as a BASIC_TEST fixture."""
+    # esolar.py is imported as part of the integration package, which needs homeassistant
+    sys.path.insert(0, REPO_DIR)
+    from custom_components.saj_esolar_air.esolar import (
+        BASE_URL_ENV, ESolarAccount, RateLimiter, TokenStore, get_esolar_data, set_token_store,
+    )
+
+    api = MockSajApi(fleet, username=username, password=password)
+    os.environ[BASE_URL_ENV] = await api.start()
+    # the mock tokens must not end up in user_data.json next to esolar.py
+    set_token_store(TokenStore())
+    account = ESolarAccount("eu", username, FIXTURE_CONCURRENCY)
+    # the mock does not rate limit, large fleets would take minutes at the cloud's pace
+    account.limiter = RateLimiter(rate=1000.0, burst=1000)
+    try:
+        plant_info = await get_esolar_data(account, "eu", username, password, max_concurrency=FIXTURE_CONCURRENCY)
+    finally:
+        await account.close()
+        await api.stop()
+    data_dir = os.path.join(REPO_DIR, "custom_components", "saj_esolar_air", "data")
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"data": {"runtime_data": plant_info}}, file, indent=1)
+    return path
+
+
+async def serve(fleet, args):
+    api = MockSajApi(fleet, latency=args.latency, jitter=args.jitter, seed=args.seed)
+    url = await api.start(args.host, args.port)
+    stats = api.stats()
+    print(f"Mock SAJ API serving {stats['plants']} plants with {stats['devices']} devices on {url}")
+    print(f"export SAJ_ESOLAR_BASE_URL={url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plants", type=int, default=10)
+    parser.add_argument("--devices", type=int, default=2, help="devices per plant")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--flow-types", nargs="*", choices=sorted(FLOW_TYPES), help="only these flow types")
+    parser.add_argument("--json", metavar="FILE", help="write the fleet records to FILE")
+    parser.add_argument("--fixture", metavar="NAME", help="write a BASIC_TEST fixture data/NAME.json")
+    parser.add_argument("--serve", action="store_true", help="serve the fleet with mock_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fleet = generate_fleet(args.plants, args.devices, args.seed, args.flow_types)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(fleet, file, indent=1)
+        print(f"{len(fleet)} plants written to {args.json}")
+    if args.fixture:
+        print(f"Fixture written to {asyncio.run(write_fixture(fleet, args.fixture))}")
+    if args.serve:
+        try:
+            asyncio.run(serve(fleet, args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
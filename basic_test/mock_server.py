@@ -0,0 +1,576 @@
+"""Local stand-in for the SAJ dev-api/api/v1 endpoints used by the integration
+
+Serves a fleet of plants over HTTP with the same signing, token and paging
+rules as the SAJ cloud, so esolar.py can be run end to end without network:
+
+    python mock_server.py --port 8765 --latency 0.2
+    SAJ_ESOLAR_BASE_URL=http://127.0.0.1:8765/dev-api/api/v1 python basic_test.py
+
+Log in with the --username / --password given (demo / demo by default).
+fleet.py generates larger fleets and serves them the same way.
+Request counters per endpoint are served unsigned on /mock/stats.
+"""
+import argparse
+import asyncio
+import binascii
+import copy
+import datetime
+import math
+import os
+import random
+import secrets
+import sys
+import time
+from collections import Counter
+
+from aiohttp import web
+from Crypto.Cipher import AES
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components", "saj_esolar_air"))
+from elekeeper import PASSWORD_ENCRYPTION_KEY, calc_signature, sun_elevation
+
+API_PREFIX = "/dev-api/api/v1"
+TOKEN_TTL = 7200
+
+# SAJ answers every failure with HTTP 200 and an errCode
+ERR_SIGNATURE = 10001
+ERR_CREDENTIALS = 10004
+ERR_TOKEN = 401
+
+
+def demo_fleet():
+    """One H1 storage plant with an R5 inverter next to it, enough to walk every stage."""
+    uid = "00000000-0000-0000-0000-000000000001"
+    inverter_sn = "H1S2602J2119E01121"
+    pv_inverter_sn = "R5S2502J2108E00456"
+    module_sn = "M3W2202J2135E00123"
+    return [
+        {
+            "entry": {
+                "plantUid": uid,
+                "plantName": "Demo H1 plant",
+                "plantNo": "P0000001",
+                "type": 1,
+                "systemPower": 6.0,
+                "isOnline": "Y",
+                "runningState": 1,
+            },
+            "details": {
+                "plantId": 1000001,
+                "plantNo": "P0000001",
+                "fullAddress": "Demo street 1, Budapest",
+                "latitude": 47.4979,
+                "longitude": 19.0402,
+                "timeZone": "UTC+01:00",
+                "currency": "EUR",
+                "createDate": "2023-04-01 10:00:00",
+                "ownerName": "Demo owner",
+                "ownerEmail": "owner@example.com",
+                "plantLogo": "",
+                "systemPower": 6.0,
+                "isInstallMeter": 1,
+                "isInstallEms": 0,
+                "isInstallLoraMeter": 0,
+                "ifCMPDevice": 0,
+                "ifCHDevice": 0,
+                "ifC6Device": 0,
+                "hasH2Device": 0,
+                "ifInstallPv": 1,
+                "queryDeviceDataType": 1,
+                "totalReduceCo2": 12.3,
+                "totalCoal": 4.9,
+                "totalPlantTreeNum": 670.0,
+                "yearReduceCo2": 2.1,
+                "yearCoal": 0.8,
+                "yearPlantTreeNum": 115.0,
+            },
+            "statistics": {
+                "todayPvEnergy": 0.0,
+                "monthPvEnergy": 310.5,
+                "yearPvEnergy": 5120.2,
+                "totalPvEnergy": 12480.7,
+                "todayIncome": 0.0,
+                "monthIncome": 31.05,
+                "yesterdayIncome": 2.4,
+                "totalIncome": 1248.07,
+                "incomeToday": 0.0,
+                "incomeMonth": 31.05,
+                "incomeLastMonth": 52.3,
+                "incomeTotal": 1248.07,
+                "todayEquivalentHours": 0.0,
+            },
+            "overview": {
+                "totalEnergy": 12480.7,
+                "todaySellEnergy": 0.0,
+                "totalSellEnergy": 4210.3,
+                "todayBuyEnergy": 1.2,
+                "totalBuyEnergy": 3120.9,
+                "peakPower": 5.4,
+            },
+            "flow": {
+                "homeLoadPower": 650,
+                "userModeName": "Self-use mode",
+                "batEnergyPercent": 64,
+                "usableBatCapacity": 5.1,
+                "batteryWorkTime": 7.9,
+            },
+            "devices": [
+                {
+                    "deviceSn": inverter_sn,
+                    "deviceModel": "H1-6K-S2",
+                    "devicePc": "H1S2602J2119E01121",
+                    "aliases": "Inverter",
+                    "type": 2,
+                    "isMasterFlag": 1,
+                    "onLine": 1,
+                    "runningState": 1,
+                    "hasBattery": 1,
+                    "displayFw": "V1.012",
+                    "masterMCUFw": "V3.220",
+                },
+                {
+                    "deviceSn": pv_inverter_sn,
+                    "deviceModel": "R5-5K-T2",
+                    "devicePc": "R5S2502J2108E00456",
+                    "aliases": "PV inverter",
+                    "type": 0,
+                    "isMasterFlag": 0,
+                    "onLine": 1,
+                    "runningState": 1,
+                    "hasBattery": 0,
+                    "displayFw": "V1.004",
+                    "masterMCUFw": "V2.105",
+                },
+            ],
+            "device_stats": {
+                inverter_sn: {
+                    "monthPvEnergy": 310.5,
+                    "totalPvEnergy": 12480.7,
+                    "todayBatChgEnergy": 2.1,
+                    "todayBatDisEnergy": 1.7,
+                    "totalBatChgEnergy": 2210.4,
+                    "totalBatDisEnergy": 1980.2,
+                    "batCapcity": 100,
+                },
+            },
+            "device_battery": {
+                inverter_sn: {"batEnergyPercent": 64, "batTemperature": 24.5},
+            },
+            "batteries": [
+                {
+                    "batSn": inverter_sn,
+                    "bmsSn": "BMS2602J2119E0011",
+                    "batModel": "B1-5.1-48",
+                    "bmsHardwareVersion": "V1.0",
+                    "bmsSoftwareVersion": "V2.3",
+                    "unitOfTemperature": "C",
+                    "type": 1,
+                },
+            ],
+            "modules": [
+                {"moduleSn": module_sn, "moduleModel": "eSolar AIO3", "moduleFw": "V1.45"},
+            ],
+            "alarms": [],
+        }
+    ]
+
+
+class MockSajApi:
+    """aiohttp application answering like the SAJ dev-api for a fleet of plants.
+
+    Requests must carry a valid signature, data requests a token that was
+    issued by login or refresh and has not expired. Every answer is delayed
+    by ``latency`` plus up to ``jitter`` seconds, ``error_rate`` of the data
+    requests fail with HTTP 500.
+    """
+
+    def __init__(self, fleet=None, username="demo", password="demo", latency=0.0, jitter=0.0,
+                 token_ttl=TOKEN_TTL, error_rate=0.0, seed=None):
+        self.fleet = fleet if fleet is not None else demo_fleet()
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.token_ttl = token_ttl
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.rejected = Counter()
+        self.tokens = {}
+        self.refresh_tokens = set()
+        self.logins = 0
+        self.url = None
+        self._runner = None
+        self._plants = {}
+        self._devices = {}
+        self._index()
+        self.app = web.Application(middlewares=[_api_errors])
+        self.app.router.add_get("/mock/stats", self._stats)
+        self.app.router.add_route("*", API_PREFIX + "/{path:.*}", self._dispatch)
+        self._routes = {
+            "sys/common/ali/getCaptchaInfo": self._captcha,
+            "sys/login": self._login,
+            "sys/refreshToken": self._refresh,
+            "monitor/plant/getEndUserPlantList": self._plant_list,
+            "monitor/plant/getOnePlantInfo": self._plant_info,
+            "monitor/home/getPlantStatisticsData": self._plant_statistics,
+            "monitor/device/getDeviceList": self._device_list,
+            "monitor/device/getOneDeviceInfo": self._device_info,
+            "monitor/deviceData/findRawdataPageList": self._raw_data,
+            "monitor/home/getPlantGridOverviewInfo": self._overview,
+            "monitor/home/getDeviceEneryFlowData": self._flow,
+            "monitor/sec/plantSECModuleList": self._sec_modules,
+            "monitor/home/getSecSelfUseEnergyData": self._self_use_energy,
+            "monitor/plant/chart/getSecSelfUseEnergyData": self._self_use_energy,
+            "monitor/plant/chart/getSelfUseEnergyData": self._self_use_energy,
+            "monitor/battery/getBatteryList": self._battery_list,
+            "monitor/battery/getOneDeviceBatteryInfo": self._device_battery,
+            "monitor/plant/ems/getEmsListByPlant": self._ems_list,
+            "alarm/device/userAlarmPage": self._alarm_page,
+        }
+
+    def _index(self):
+        for plant in self.fleet:
+            self._plants[plant["entry"]["plantUid"]] = plant
+            for device in plant["devices"]:
+                self._devices[device["deviceSn"]] = (plant, device)
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Serve the API and return its base URL (what base_url() returns for a region)."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}{API_PREFIX}"
+        return self.url
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_stats(self):
+        """Forget the request counters."""
+        self.requests.clear()
+        self.rejected.clear()
+
+    def stats(self):
+        """Return the request counters."""
+        return {
+            "requests": sum(self.requests.values()),
+            "per_endpoint": dict(self.requests),
+            "rejected": dict(self.rejected),
+            "logins": self.logins,
+            "plants": len(self.fleet),
+            "devices": len(self._devices),
+        }
+
+    async def _stats(self, request):
+        return web.json_response(self.stats())
+
+    async def _dispatch(self, request):
+        path = request.match_info["path"]
+        handler = self._routes.get(path)
+        if handler is None:
+            return web.json_response({"errCode": 404, "errMsg": f"Unknown endpoint {path}"}, status=404)
+        self.requests[path] += 1
+        params = dict(request.query)
+        if request.method == "POST":
+            params.update(await request.post())
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if not self._signature_valid(params):
+            self.rejected["signature"] += 1
+            return _error(ERR_SIGNATURE, "Signature verification failed")
+        if not path.startswith("sys/"):
+            if not self._token_valid(request):
+                self.rejected["token"] += 1
+                return _error(ERR_TOKEN, "Token invalid or expired, please login again")
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.rejected["injected"] += 1
+                return web.Response(status=500, text="Injected error")
+        return web.json_response({"errCode": 0, "errMsg": "success", "data": handler(params)})
+
+    def _signature_valid(self, params):
+        sign_params = params.get("signParams")
+        signature = params.get("signature")
+        if not sign_params or not signature:
+            return False
+        try:
+            signed = {key: params[key] for key in sign_params.split(",")}
+        except KeyError:
+            return False
+        return calc_signature(signed)["signature"] == signature
+
+    def _token_valid(self, request):
+        header = request.headers.get("Authorization", "")
+        token = header[len("Bearer "):] if header.startswith("Bearer ") else None
+        expires = self.tokens.get(token)
+        return expires is not None and expires > time.time()
+
+    def _issue_token(self):
+        token = secrets.token_hex(16)
+        refresh_token = secrets.token_hex(16)
+        self.tokens[token] = time.time() + self.token_ttl
+        self.refresh_tokens.add(refresh_token)
+        return {"token": token, "tokenHead": "Bearer ", "expiresIn": self.token_ttl, "refreshToken": refresh_token}
+
+    # auth
+
+    def _captcha(self, params):
+        return {}
+
+    def _login(self, params):
+        if params.get("username") != self.username or params.get("password") != _encrypt(self.password):
+            raise _ApiError(ERR_CREDENTIALS, "Invalid username or password")
+        self.logins += 1
+        return self._issue_token()
+
+    def _refresh(self, params):
+        refresh_token = params.get("refreshToken")
+        if refresh_token not in self.refresh_tokens:
+            raise _ApiError(ERR_TOKEN, "Refresh token invalid, please login again")
+        self.refresh_tokens.discard(refresh_token)
+        return self._issue_token()
+
+    # plants
+
+    def _plant(self, params):
+        plant = self._plants.get(params.get("plantUid"))
+        if plant is None:
+            raise _ApiError(500, "Plant not found")
+        return plant
+
+    def _plant_list(self, params):
+        entries = [self._live_entry(plant) for plant in self.fleet]
+        return _page(entries, params)
+
+    def _plant_info(self, params):
+        plant = self._plant(params)
+        return {
+            **plant["entry"],
+            **plant["details"],
+            "deviceSnList": [device["deviceSn"] for device in plant["devices"]],
+            "moduleSnList": [module["moduleSn"] for module in plant["modules"]],
+        }
+
+    def _plant_statistics(self, params):
+        plant = self._plant(params)
+        return {**plant["statistics"], **self._energy_today(plant), "deviceSnList": [d["deviceSn"] for d in plant["devices"]]}
+
+    def _overview(self, params):
+        plant = self._plant(params)
+        return {**plant["overview"], "updateDate": _now_str(), "dataTime": _now_str()}
+
+    def _flow(self, params):
+        plant = self._plant(params)
+        return self._live_power(plant)
+
+    def _sec_modules(self, params):
+        return copy.deepcopy(self._plant(params)["modules"])
+
+    def _self_use_energy(self, params):
+        plant = self._plant(params)
+        energy = self._energy_today(plant)["todayPvEnergy"]
+        return {
+            "moduleSn": params.get("moduleSn") or params.get("emsSn") or params.get("deviceSn"),
+            "gridPower": self._live_power(plant)["sysGridPowerwatt"],
+            "selfUseEnergy": round(energy * 0.7, 2),
+            "sellEnergy": round(energy * 0.3, 2),
+        }
+
+    def _ems_list(self, params):
+        return _page(copy.deepcopy(self._plant(params).get("ems", [])), params)
+
+    def _battery_list(self, params):
+        return _page(copy.deepcopy(self._plant(params)["batteries"]), params)
+
+    def _alarm_page(self, params):
+        plant = self._plant(params)
+        state = int(params.get("alarmCommonState", 3))
+        alarms = [alarm for alarm in plant["alarms"] if alarm.get("alarmCommonState", 3) == state]
+        return _page(copy.deepcopy(alarms), params)
+
+    # devices
+
+    def _device(self, params):
+        found = self._devices.get(params.get("deviceSn"))
+        if found is None:
+            raise _ApiError(500, "Device not found")
+        return found
+
+    def _device_list(self, params):
+        return _page(copy.deepcopy(self._plant(params)["devices"]), params)
+
+    def _device_info(self, params):
+        plant, device = self._device(params)
+        live = self._live_power(plant)
+        stats = dict(plant.get("device_stats", {}).get(device["deviceSn"], {}))
+        strings = stats.pop("pvStrings", 1)
+        power = round(live["totalPvPower"] * _power_share(plant, device))
+        stats = {
+            **stats,
+            **self._energy_today(plant),
+            "powerNow": power,
+            "totalLoadPowerwatt": live["homeLoadPower"],
+            "backupTotalLoadPowerWatt": 0,
+            "gridDirection": live["gridDirection"],
+            "batPower": live["batPower"],
+            "batCurrent": round(live["batPower"] / 52.0, 1),
+            "pvList": [{"pvNo": number + 1, "pvPower": round(power / strings)} for number in range(strings)],
+            "gridList": [{"gridNo": 1, "gridPower": live["sysGridPowerwatt"]}],
+            "updateDate": _now_str(),
+            "dataTime": _now_str(),
+        }
+        return {**copy.deepcopy(device), "deviceStatisticsData": stats}
+
+    def _raw_data(self, params):
+        plant, device = self._device(params)
+        power = round(self._live_power(plant)["totalPvPower"] * _power_share(plant, device))
+        row = {
+            "deviceSn": device["deviceSn"],
+            "datetime": _now_str(),
+            "deviceTemp": 38.5,
+            "deviceTempStr": "38.5",
+            "pac": power,
+            "pVP": power,
+            "backupTotalLoadPowerWatt": 0,
+            "isShowModuleSignal": 1,
+            "moduleSignal": -61,
+        }
+        return _page([row], params)
+
+    def _device_battery(self, params):
+        plant, device = self._device(params)
+        battery = plant.get("device_battery", {}).get(device["deviceSn"])
+        if battery is None:
+            return None
+        return {**battery, "batPower": self._live_power(plant)["batPower"], "baseBatteryBtnBeanList": []}
+
+    # values following the sun at the plant's location
+
+    def _sun(self, plant):
+        try:
+            elevation = sun_elevation(plant["details"]["latitude"], plant["details"]["longitude"])
+        except (KeyError, TypeError):
+            return 0.0
+        return max(0.0, math.sin(math.radians(elevation)))
+
+    def _live_power(self, plant):
+        offline = plant["entry"].get("isOnline") == "N"
+        pv = 0 if offline else round(plant["entry"]["systemPower"] * 1000 * 0.8 * self._sun(plant))
+        load = plant["flow"].get("homeLoadPower", 500)
+        has_battery = bool(plant["batteries"])
+        battery = max(-3000, min(3000, pv - load)) if has_battery else 0
+        grid = pv - load - battery
+        return {
+            **plant["flow"],
+            "solarPower": pv,
+            "totalPvPower": pv,
+            "powerNow": pv,
+            "nowPower": pv,
+            "homeLoadPower": load,
+            "totalLoadPowerwatt": load,
+            "batPower": abs(battery),
+            "batteryDirection": 0 if not battery else (1 if battery > 0 else -1),
+            "sysGridPowerwatt": abs(grid),
+            "gridDirection": 0 if not grid else (1 if grid > 0 else -1),
+            "pvDirection": 1 if pv else 0,
+            "outPutDirection": 1 if load else 0,
+            "selfUseRate": 100 if pv <= load else round(load / pv * 100),
+            "deviceStatus": 0 if offline else 1,
+            "isOnline": plant["entry"].get("isOnline", "Y"),
+            "runningState": plant["entry"].get("runningState", 1),
+        }
+
+    def _energy_today(self, plant):
+        # a clear day yields about 4.5 kWh per kWp, spread over the daylight hours
+        now = datetime.datetime.now()
+        day_share = max(0.0, min(1.0, (now.hour + now.minute / 60 - 6) / 14))
+        today = round(plant["entry"]["systemPower"] * 4.5 * day_share, 2)
+        return {"todayPvEnergy": today, "todayEquivalentHours": round(today / plant["entry"]["systemPower"], 2)}
+
+    def _live_entry(self, plant):
+        live = self._live_power(plant)
+        return {
+            **plant["entry"],
+            "nowPower": live["totalPvPower"],
+            "todayElectricity": self._energy_today(plant)["todayPvEnergy"],
+        }
+
+
+class _ApiError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def _error(code, message):
+    return web.json_response({"errCode": code, "errMsg": message, "data": None})
+
+
+@web.middleware
+async def _api_errors(request, handler):
+    try:
+        return await handler(request)
+    except _ApiError as err:
+        return _error(err.code, str(err))
+
+
+def _power_share(plant, device):
+    # devices without a rated power split the plant evenly
+    rated = [d.get("ratedPower") or 1 for d in plant["devices"]]
+    return (device.get("ratedPower") or 1) / sum(rated)
+
+
+def _page(items, params):
+    page_no = int(params.get("pageNo", 1))
+    page_size = int(params.get("pageSize", 10))
+    start = (page_no - 1) * page_size
+    return {"list": items[start:start + page_size], "total": len(items), "pageNo": page_no, "pageSize": page_size}
+
+
+def _encrypt(password):
+    cipher = AES.new(binascii.unhexlify(PASSWORD_ENCRYPTION_KEY), AES.MODE_ECB)
+    data = password.encode()
+    padding = 16 - len(data) % 16
+    return binascii.hexlify(cipher.encrypt(data + bytes([padding] * padding))).decode()
+
+
+def _now_str():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+async def serve(args):
+    api = MockSajApi(username=args.username, password=args.password, latency=args.latency,
+                     jitter=args.jitter, token_ttl=args.token_ttl, error_rate=args.error_rate)
+    url = await api.start(args.host, args.port)
+    print(f"Mock SAJ API serving {len(api.fleet)} plant(s) on {url}")
+    print(f"export SAJ_ESOLAR_BASE_URL={url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--username", default="demo")
+    parser.add_argument("--password", default="demo")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds more")
+    parser.add_argument("--token-ttl", type=int, default=TOKEN_TTL, help="token lifetime in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of data requests failing with HTTP 500")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Check how the per-plant fetch pipeline deals with failing requests"""
+import asyncio
+import datetime
+import functools
+import os
+import sys
+
+# esolar.py is imported as part of the integration package, which needs homeassistant
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from custom_components.saj_esolar_air.esolar import PLANT_PIPELINE, _is_isolated_failure
+from custom_components.saj_esolar_air.pipeline import TIER_COUNTER, RefreshSchedule, Stage, StagePipeline
+
+DEVICE_SN = "HSS2602J2119E0011"
+CYCLES = 4
+
+
+def alarm(state):
+    """An alarm of today, as userAlarmPage lists it."""
+    return {
+        "deviceSn": DEVICE_SN,
+        "deviceSnType": 1,
+        "plantUid": "plant-1",
+        "plantName": "Test plant",
+        "plantCountry": "HU",
+        "alarmCommonState": state,
+        "alarmStartTime": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def test_plant():
+    """A plant with one device, as the device list merges it."""
+    return {
+        "plantUid": "plant-1",
+        "plantName": "Test plant",
+        "devices": [{"deviceSn": DEVICE_SN}],
+    }
+
+
+class FakeSession:
+    """Answer the alarm requests, failing the ones of the given states."""
+
+    def __init__(self):
+        self.failing_states = set()
+
+    async def post(self, url, data):
+        state = int(data["alarmCommonState"])
+        if state in self.failing_states:
+            raise ValueError(f"alarm list of state {state} failed")
+        return {"errCode": 0, "data": {"list": [alarm(state)]}}
+
+
+async def run_cycle(pipeline, session, plant, schedule):
+    schedule.start_cycle()
+    return await pipeline.run(
+        "eu", session, plant, schedule, plant["plantUid"], isolate=_is_isolated_failure
+    )
+
+
+async def failed_pending_alarms():
+    """A failed pending list must not let the closed list add to the old counters."""
+    pipeline = PLANT_PIPELINE.subset(("alarms",))
+    schedule = RefreshSchedule(static_seconds=0, counter_cycles=1)
+    session = FakeSession()
+    plant = test_plant()
+
+    await run_cycle(pipeline, session, plant, schedule)
+    counted = (plant["todayAlarmNum"], len(plant["devices"][0]["alarmList"]))
+    if counted != (2, 2):
+        sys.exit(f"Expected 2 alarms after the first cycle, counted {counted}")
+
+    session.failing_states = {1}
+    for cycle in range(CYCLES):
+        run = await run_cycle(pipeline, session, plant, schedule)
+        if "alarms" not in run.failed:
+            sys.exit(f"Cycle {cycle + 2}: the failed pending list was not reported")
+        counted = (plant["todayAlarmNum"], len(plant["devices"][0]["alarmList"]))
+        if counted != (2, 2):
+            sys.exit(f"Cycle {cycle + 2}: the alarms of the last good cycle grew to {counted}")
+
+    session.failing_states = set()
+    await run_cycle(pipeline, session, plant, schedule)
+    counted = (plant["todayAlarmNum"], len(plant["devices"][0]["alarmList"]))
+    if counted != (2, 2):
+        sys.exit(f"Expected 2 alarms after the recovery, counted {counted}")
+    print(f"Alarm counters kept over {CYCLES} cycles with a failing pending list")
+
+
+async def first_cycle_failure():
+    """A stage failing before it ever had data must only leave out what requires it."""
+    failing = {"devices"}
+
+    async def fetch(name, region, session, plant):
+        if name in failing:
+            raise ValueError(f"{name} failed")
+        return name
+
+    def merge(plant, result):
+        plant.setdefault("merged", []).append(result)
+
+    pipeline = StagePipeline(
+        [
+            Stage("details", functools.partial(fetch, "details"), merge, provides=("details",)),
+            Stage("devices", functools.partial(fetch, "devices"), merge, provides=("devices",)),
+            Stage("device_info", functools.partial(fetch, "device_info"), merge,
+                  requires=("devices",), provides=("device_info",)),
+            Stage("flow", functools.partial(fetch, "flow"), merge,
+                  requires=("details", "device_info"), provides=("flow",)),
+            Stage("alarms", functools.partial(fetch, "alarms"), merge, provides=("alarms",)),
+        ]
+    )
+    schedule = RefreshSchedule(static_seconds=0, counter_cycles=1)
+    plant = {"plantUid": "plant-1"}
+
+    run = await run_cycle(pipeline, None, plant, schedule)
+    if plant["merged"] != ["details", "alarms"]:
+        sys.exit(f"Expected the stages not requiring the devices to merge, merged {plant['merged']}")
+    if list(run.failed) != ["devices"] or run.missing != ["device_info", "flow"]:
+        sys.exit(f"Expected devices failed and what requires it missing: {run.as_dict()}")
+    if schedule.stale("plant-1").get("devices", {}).get("age", 0) is not None:
+        sys.exit(f"Expected the devices reported missing: {schedule.stale('plant-1')}")
+
+    failing.clear()
+    plant["merged"] = []
+    run = await run_cycle(pipeline, None, plant, schedule)
+    if plant["merged"] != ["details", "devices", "device_info", "flow", "alarms"] or run.missing:
+        sys.exit(f"Expected every stage to merge after the recovery, merged {plant['merged']}")
+    if schedule.stale("plant-1"):
+        sys.exit(f"Expected no stale data after the recovery: {schedule.stale('plant-1')}")
+    print("A stage failing on the first cycle only left out the stages requiring it")
+
+
+async def empty_answer():
+    """A stage answered with nothing must wait for its tier like one that merged data."""
+    fetched = []
+
+    async def fetch(region, session, plant):
+        fetched.append(plant["plantUid"])
+        return None
+
+    pipeline = StagePipeline([Stage("statistics", fetch, provides=("statistics",), tier=TIER_COUNTER)])
+    schedule = RefreshSchedule(static_seconds=0, counter_cycles=3)
+    plant = {"plantUid": "plant-1"}
+    for _ in range(CYCLES):
+        await run_cycle(pipeline, None, plant, schedule)
+    if len(fetched) != 2:
+        sys.exit(f"Expected the empty counter stage fetched on cycles 1 and 4, fetched {len(fetched)} times")
+    print(f"An empty answer was fetched {len(fetched)} times in {CYCLES} cycles")
+
+
+async def main():
+    await failed_pending_alarms()
+    await first_cycle_failure()
+    await empty_answer()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
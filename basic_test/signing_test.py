@@ -0,0 +1,78 @@
+"""Check the fast request signer against the reference one and benchmark both"""
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "custom_components", "saj_esolar_air"))
+from elekeeper import calc_signature, calc_signature_reference, generatkey
+
+SAMPLES = 20000
+BENCHMARK_SECONDS = 2.0
+SEED = 20240601
+
+# printable ascii plus some latin-1, the query params are encoded as latin-1
+ALPHABET = string.ascii_letters + string.digits + string.punctuation + " " + "áéíóöúüÁÉÍÓÖÚÜ"
+
+
+def random_value(rng):
+    """A value like the ones put in a query: text, number, date, empty."""
+    kind = rng.randrange(5)
+    if kind == 0:
+        return "".join(rng.choice(ALPHABET) for _ in range(rng.randrange(0, 40)))
+    if kind == 1:
+        return rng.randrange(-10**12, 10**12)
+    if kind == 2:
+        return f"{rng.randrange(2000, 2100)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 00:00:00"
+    if kind == 3:
+        return ""
+    return rng.random() * 1000
+
+
+def random_params(rng):
+    """A param dict like the ones sent to the SAJ API."""
+    params = {
+        "appProjectName": "elekeeper",
+        "clientDate": "2024-06-01",
+        "lang": "en",
+        "timeStamp": rng.randrange(10**12, 10**13),
+        "random": "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(32)),
+        "clientId": "esolar-monitor-admin",
+    }
+    for _ in range(rng.randrange(0, 12)):
+        key = "".join(rng.choice(string.ascii_letters) for _ in range(rng.randrange(1, 16)))
+        params[key] = random_value(rng)
+    return params
+
+
+def property_test(samples):
+    """Both signers must produce the very same signed dict."""
+    rng = random.Random(SEED)
+    for index in range(samples):
+        params = random_params(rng)
+        fast = calc_signature(dict(params))
+        reference = calc_signature_reference(dict(params))
+        if fast != reference:
+            sys.exit(f"Mismatch on sample {index}: {params}\n fast: {fast}\n reference: {reference}")
+    print(f"{samples} random param dicts signed the same by both signers")
+
+
+def benchmark(name, func, params):
+    """Report how many requests the signer signs per second."""
+    timer = timeit.Timer(lambda: func(dict(params)))
+    number, _ = timer.autorange()
+    repeat = max(3, int(BENCHMARK_SECONDS / max(timer.timeit(number), 1e-9)))
+    best = min(timer.repeat(repeat=min(repeat, 7), number=number)) / number
+    print(f"{name:<28}{1 / best:>12,.0f} signs/s {best * 1e6:>9.2f} us/sign")
+    return best
+
+
+params = random_params(random.Random(SEED))
+property_test(SAMPLES)
+print()
+reference = benchmark("calc_signature_reference", calc_signature_reference, params)
+fast = benchmark("calc_signature", calc_signature, params)
+benchmark("generatkey(32)", lambda _: generatkey(32), params)
+benchmark("generatkey + calc_signature", lambda p: calc_signature({**p, "random": generatkey(32)}), params)
+print(f"\ncalc_signature is {reference / fast:.1f}x faster than the reference signer")
@@ -1,36 +1,90 @@
 """The eSolar integration."""
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from datetime import timedelta
 import logging
-from typing import Any, TypedDict, cast
-import requests
+import time
+from typing import Any, NoReturn, TypedDict, cast
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_REGION, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
 from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import CONF_MONITORED_SITES, CONF_PV_GRID_DATA, CONF_UPDATE_INTERVAL, DOMAIN, CONF_PLANT_UPDATE_INTERVAL, UNAVAILABLE_PLANTS
-from .esolar import get_esolar_data
+from .const import (
+    CONF_COUNTER_REFRESH_CYCLES,
+    CONF_IDLE_UPDATE_INTERVAL,
+    CONF_KEEP_RAW_DATA,
+    CONF_LIVE_UPDATE_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MONITORED_SITES,
+    CONF_PV_GRID_DATA,
+    CONF_STATE_HEARTBEAT_INTERVAL,
+    CONF_STATIC_REFRESH_INTERVAL,
+    CONF_UPDATE_INTERVAL,
+    DATA_ACCOUNTS,
+    DATA_CAPABILITIES,
+    DATA_RATE_LIMITS,
+    DATA_TOKEN_STORE,
+    DEFAULT_COUNTER_REFRESH_CYCLES,
+    DEFAULT_IDLE_UPDATE_INTERVAL,
+    DEFAULT_KEEP_RAW_DATA,
+    DEFAULT_LIVE_UPDATE_INTERVAL,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_STATE_HEARTBEAT_INTERVAL,
+    DEFAULT_STATIC_REFRESH_INTERVAL,
+    DOMAIN,
+    CONF_PLANT_UPDATE_INTERVAL,
+    IDLE_PLANTS,
+    STALE_DATA,
+    UNAVAILABLE_PLANTS,
+)
+from .esolar import (
+    ESolarAccount,
+    TokenStore,
+    get_esolar_data,
+    get_esolar_live_data,
+    read_legacy_user_data,
+    remove_legacy_user_data,
+    set_token_store,
+)
+from .plant_index import EMPTY_INDEX, PathListeners, PlantIndex, changed_paths
+from .sensor_helpers import StateWriteStats
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# share of the update interval a refresh may take before it sheds work
+CYCLE_BUDGET_SHARE = 0.8
+RATE_LIMIT_STORAGE_KEY = f"{DOMAIN}.rate_limits"
+RATE_LIMIT_STORAGE_VERSION = 1
+RATE_LIMIT_SAVE_DELAY = 10
+CAPABILITY_STORAGE_KEY = f"{DOMAIN}.capabilities"
+CAPABILITY_STORAGE_VERSION = 1
+CAPABILITY_SAVE_DELAY = 60
+TOKEN_STORAGE_KEY = f"{DOMAIN}.tokens"
+TOKEN_STORAGE_VERSION = 1
+TOKEN_SAVE_DELAY = 10
+
 
 class ESolarResponse(TypedDict, total=False):
     """API response."""
     plantList: list[dict]
     status: str
     unavailablePlants: list[str]
+    idlePlants: dict[str, str]
 
 async def update_listener(hass, entry):
     """Handle options update."""
     _LOGGER.debug(entry.options)
+    # the coordinators, the live lane and the account pool size are set up
+    # from the options, so they only take effect with a reload
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_migrate_entry(hass, entry):
@@ -58,9 +112,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False  # Sikertelen migráció esetén ne folytassa
 
     """Set up eSolar from a config entry."""
-    coordinator = ESolarCoordinator(hass, entry)
+    await async_setup_token_store(hass)
+    account = await _async_get_account(hass, entry)
+    entry.async_on_unload(lambda: _async_release_account(hass, entry, account))
+    coordinator = ESolarCoordinator(hass, entry, account)
     await coordinator.async_config_entry_first_refresh()
 
+    if entry.options.get(CONF_LIVE_UPDATE_INTERVAL, DEFAULT_LIVE_UPDATE_INTERVAL):
+        # polls once power entities subscribe to it
+        coordinator.live_coordinator = ESolarLiveCoordinator(hass, entry, coordinator)
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -80,20 +141,236 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
-class ESolarCoordinator(DataUpdateCoordinator[ESolarResponse]):
+async def _async_get_account(hass: HomeAssistant, entry: ConfigEntry) -> ESolarAccount:
+    """Return the account shared by the entries logging in with the same user."""
+    _store, rate_limits = await _async_load_rate_limits(hass)
+    _store, capabilities = await _async_load_capabilities(hass)
+    accounts = hass.data[DOMAIN].setdefault(DATA_ACCOUNTS, {})
+    key = (entry.data.get(CONF_REGION), entry.data.get(CONF_USERNAME))
+    if key not in accounts:
+        accounts[key] = ESolarAccount(*key)
+        # a cooldown started before the reload or restart still applies
+        accounts[key].limiter.restore(rate_limits.get(_account_storage_key(*key), {}))
+        # so do the endpoints known to return nothing
+        accounts[key].breaker.restore(capabilities.get(_account_storage_key(*key), {}))
+    account = accounts[key]
+    account.add_entry(
+        entry.entry_id,
+        entry.options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+    )
+    return account
+
+
+async def _async_release_account(
+    hass: HomeAssistant, entry: ConfigEntry, account: ESolarAccount
+) -> None:
+    """Close the shared account once its last entry is unloaded."""
+    _async_save_account_state(hass, account)
+    account.remove_entry(entry.entry_id)
+    if account.entries:
+        return
+    accounts = hass.data.get(DOMAIN, {}).get(DATA_ACCOUNTS, {})
+    if accounts.get((account.region, account.username)) is account:
+        del accounts[(account.region, account.username)]
+    await account.close()
+
+
+async def async_setup_token_store(hass: HomeAssistant) -> TokenStore:
+    """Load the token store once, shared by every entry and the config flow."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_TOKEN_STORE not in domain_data:
+        domain_data[DATA_TOKEN_STORE] = hass.async_create_task(
+            _async_load_token_store(hass)
+        )
+    return await domain_data[DATA_TOKEN_STORE]
+
+
+async def _async_load_token_store(hass: HomeAssistant) -> TokenStore:
+    """Load the saved tokens, migrating user_data.json on the first run."""
+    store = Store(hass, TOKEN_STORAGE_VERSION, TOKEN_STORAGE_KEY, private=True)
+    data = await store.async_load()
+    if data is None:
+        data = await hass.async_add_executor_job(read_legacy_user_data) or {}
+        if data:
+            await store.async_save(data)
+            await hass.async_add_executor_job(remove_legacy_user_data)
+            _LOGGER.debug("Migrated the tokens of %s account(s) from user_data.json", len(data))
+
+    token_store = TokenStore(data)
+    token_store.on_change = lambda: store.async_delay_save(
+        lambda: token_store.data, TOKEN_SAVE_DELAY
+    )
+    set_token_store(token_store)
+    return token_store
+
+
+def _account_storage_key(region: str, username: str) -> str:
+    """Return the key of an account in the rate limit and capability stores."""
+    return f"{region}:{username}"
+
+
+async def _async_load_rate_limits(hass: HomeAssistant) -> tuple[Store, dict]:
+    """Return the rate limit store and its data, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_RATE_LIMITS not in domain_data:
+        store = Store(hass, RATE_LIMIT_STORAGE_VERSION, RATE_LIMIT_STORAGE_KEY)
+        rate_limits = await store.async_load() or {}
+        domain_data.setdefault(DATA_RATE_LIMITS, (store, rate_limits))
+    return domain_data[DATA_RATE_LIMITS]
+
+
+async def _async_load_capabilities(hass: HomeAssistant) -> tuple[Store, dict]:
+    """Return the capability store and its data, loading it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CAPABILITIES not in domain_data:
+        store = Store(hass, CAPABILITY_STORAGE_VERSION, CAPABILITY_STORAGE_KEY)
+        capabilities = await store.async_load() or {}
+        domain_data.setdefault(DATA_CAPABILITIES, (store, capabilities))
+    return domain_data[DATA_CAPABILITIES]
+
+
+@callback
+def _async_save_account_state(hass: HomeAssistant, account: ESolarAccount) -> None:
+    """Persist what an account learned that has to survive a restart."""
+    _async_save_rate_limit(hass, account)
+    _async_save_capabilities(hass, account)
+
+
+@callback
+def _async_save_capabilities(hass: HomeAssistant, account: ESolarAccount) -> None:
+    """Persist the open capability circuits of an account when they changed."""
+    store, capabilities = hass.data[DOMAIN][DATA_CAPABILITIES]
+    key = _account_storage_key(account.region, account.username)
+    state = account.breaker.state()
+    if not state:
+        if capabilities.pop(key, None) is None:
+            return
+    elif capabilities.get(key) == state:
+        return
+    else:
+        capabilities[key] = state
+    store.async_delay_save(lambda: capabilities, CAPABILITY_SAVE_DELAY)
+
+
+@callback
+def _async_save_rate_limit(hass: HomeAssistant, account: ESolarAccount) -> None:
+    """Persist the rate limit cooldown of an account when it changed."""
+    store, rate_limits = hass.data[DOMAIN][DATA_RATE_LIMITS]
+    key = _account_storage_key(account.region, account.username)
+    state = account.limiter.state()
+    if not state["backoff_level"] and not account.limiter.cooldown_remaining():
+        if rate_limits.pop(key, None) is None:
+            return
+    elif rate_limits.get(key) == state:
+        return
+    else:
+        rate_limits[key] = state
+    store.async_delay_save(lambda: rate_limits, RATE_LIMIT_SAVE_DELAY)
+
+
+class _PathNotifyingCoordinator(DataUpdateCoordinator[ESolarResponse]):
+    """Coordinator notifying only the listeners whose data paths changed.
+
+    Entities pass the paths of the data they read as their coordinator
+    context (see PlantIndex for the paths). After a refresh the new
+    fingerprints are compared with those of the last refresh, and only
+    listeners of changed paths run. Every listener runs on the first
+    refresh, when the refresh fails or recovers, and once the state
+    heartbeat is due, so unchanged states are still written then.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        self._path_listeners = PathListeners()
+        self._fingerprints: Mapping[tuple, int] | None = None
+        self._changed_paths: set[tuple] | None = None
+        self._notified_success: bool | None = None
+        self._notified_all_at = 0.0
+
+    @property
+    def state_heartbeat(self) -> float:
+        """Return the seconds after which unchanged states are written again.
+
+        Read from the options every time, so a changed option applies at once.
+        """
+        return 60 * self.config_entry.options.get(
+            CONF_STATE_HEARTBEAT_INTERVAL, DEFAULT_STATE_HEARTBEAT_INTERVAL
+        )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, of the context paths when given."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        remove_paths = self._path_listeners.add(context, update_callback)
+
+        @callback
+        def remove() -> None:
+            remove_paths()
+            remove_listener()
+
+        return remove
+
+    def _track_changes(self, index: PlantIndex) -> None:
+        """Remember which paths the refresh changed, for the next notification."""
+        self._changed_paths = changed_paths(self._fingerprints, index.fingerprints)
+        self._fingerprints = index.fingerprints
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners of the changed paths, or all when due."""
+        changed, self._changed_paths = self._changed_paths, None
+        now = time.monotonic()
+        if (
+            changed is None
+            or not self.last_update_success
+            or self._notified_success is not True
+            or now - self._notified_all_at >= self.state_heartbeat
+        ):
+            self._notified_success = self.last_update_success
+            self._notified_all_at = now
+            super().async_update_listeners()
+            return
+
+        listeners = self._path_listeners.listeners(changed)
+        _LOGGER.debug(
+            "%s paths changed, notifying %s of %s listeners",
+            len(changed),
+            len(listeners),
+            len(self._listeners),
+        )
+        for update_callback in listeners:
+            update_callback()
+
+
+class ESolarCoordinator(_PathNotifyingCoordinator):
     """Data update coordinator."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, account: ESolarAccount
+    ) -> None:
         """Initialize the coordinator."""
         update_interval = timedelta(minutes=(entry.options.get(CONF_PLANT_UPDATE_INTERVAL) or CONF_UPDATE_INTERVAL))
+        self._active_interval = update_interval
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=DOMAIN,
             update_interval=update_interval,
             always_update=True,
         )
         self._entry = entry
+        self.live_coordinator: ESolarLiveCoordinator | None = None
+        # shared with the other entries of the account, outlives refresh cycles
+        self.account = account
+        # rebuilt with every refresh, entities look their data up here
+        self.index: PlantIndex = EMPTY_INDEX
+        self.state_writes = StateWriteStats()
+        # the entities were set up while some plant data was still missing
+        self._set_up_incomplete = False
 
     @property
     def entry_id(self) -> str:
@@ -102,10 +379,19 @@ class ESolarCoordinator(DataUpdateCoordinator[ESolarResponse]):
 
     async def _async_update_data(self) -> ESolarResponse:
         """Fetch the latest data from the source."""
+        _log_state_writes(self.state_writes)
         try:
-            data = await self.hass.async_add_executor_job(
-                get_data, self.hass, self._entry.data, self._entry.options
+            data = await get_data(
+                self.account,
+                self._entry.data,
+                self._entry.options,
+                cycle_budget=self.update_interval.total_seconds() * CYCLE_BUDGET_SHARE,
             )
+        except APIRatelimitExceeded as err:
+            raise UpdateFailed(
+                "SAJ API rate limit exceeded, pausing requests for "
+                f"{self.account.limiter.cooldown_remaining():.0f} s"
+            ) from err
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
         except PlantUnavailable as err:
@@ -114,10 +400,59 @@ class ESolarCoordinator(DataUpdateCoordinator[ESolarResponse]):
             raise UpdateFailed(str(err)) from err
         except ESolarError as err:
             raise UpdateFailed(str(err)) from err
+        finally:
+            _async_save_account_state(self.hass, self.account)
 
         self._update_unavailable_plant_issues(data.get(UNAVAILABLE_PLANTS) or [])
+        self._reload_when_complete(data)
+        self._adapt_update_interval(data)
+        self.index = PlantIndex(data, self.index)
+        self._track_changes(self.index)
         return data
 
+    @callback
+    def _reload_when_complete(self, data: ESolarResponse) -> None:
+        """Set the entities up again once the data missing at setup is there.
+
+        Stages failing before they ever returned data do not fail the refresh,
+        so the first one may miss the devices or batteries entities are made for.
+        """
+        missing = any(
+            info["age"] is None
+            for slices in (data.get(STALE_DATA) or {}).values()
+            for info in slices.values()
+        )
+        if self.data is None:
+            self._set_up_incomplete = missing
+        elif self._set_up_incomplete and not missing:
+            _LOGGER.debug("The data missing at setup arrived, reloading the entities")
+            self._set_up_incomplete = False
+            self.hass.config_entries.async_schedule_reload(self._entry.entry_id)
+
+    @callback
+    def _adapt_update_interval(self, data: ESolarResponse) -> None:
+        """Poll less often while every plant is idle (night or offline)."""
+        idle = data.get(IDLE_PLANTS) or {}
+        all_idle = bool(data.get("plantList")) and all(
+            plant.get("plantName") in idle for plant in data["plantList"]
+        )
+        update_interval = self._active_interval
+        if all_idle:
+            # read every cycle, so a changed option applies from the next one
+            update_interval = max(
+                update_interval,
+                timedelta(
+                    minutes=self._entry.options.get(
+                        CONF_IDLE_UPDATE_INTERVAL, DEFAULT_IDLE_UPDATE_INTERVAL
+                    )
+                ),
+            )
+        if update_interval != self.update_interval:
+            _LOGGER.debug(
+                "Update interval set to %s, idle plants: %s", update_interval, idle
+            )
+            self.update_interval = update_interval
+
     @callback
     def _update_unavailable_plant_issues(self, unavailable_plants: list[str]) -> None:
         """Surface plants that are configured but no longer accessible."""
@@ -138,6 +473,67 @@ class ESolarCoordinator(DataUpdateCoordinator[ESolarResponse]):
             translation_placeholders={"plants": plant_list},
         )
 
+
+def _log_state_writes(state_writes: StateWriteStats) -> None:
+    """Close the state write counts of the entity updates since the last refresh."""
+    counts = state_writes.begin_cycle()
+    if counts is not None:
+        _LOGGER.debug(
+            "Entity updates wrote %s states (%s heartbeats), skipped %s unchanged",
+            counts["written"],
+            counts["heartbeats"],
+            counts["skipped"],
+        )
+
+
+class ESolarLiveCoordinator(_PathNotifyingCoordinator):
+    """Fast lane coordinator refreshing only the live power data.
+
+    It updates the plant data of the main coordinator in place, so power
+    entities subscribed to both read the latest values from either refresh.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, coordinator: ESolarCoordinator
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_live",
+            update_interval=timedelta(
+                seconds=entry.options[CONF_LIVE_UPDATE_INTERVAL]
+            ),
+            always_update=True,
+        )
+        self._entry = entry
+        self._coordinator = coordinator
+
+    async def _async_update_data(self) -> ESolarResponse:
+        """Fetch the latest live power data."""
+        if not self._coordinator.last_update_success:
+            # the full refresh is failing, it reports the problem
+            raise UpdateFailed("Waiting for a successful full refresh")
+        _log_state_writes(self._coordinator.state_writes)
+        try:
+            data = await get_live_data(
+                self._coordinator.account,
+                self._entry.data,
+                self._entry.options,
+                cycle_budget=self.update_interval.total_seconds() * CYCLE_BUDGET_SHARE,
+            )
+        except ESolarError as err:
+            raise UpdateFailed(str(err)) from err
+        finally:
+            _async_save_account_state(self.hass, self._coordinator.account)
+
+        # the records of the merged nodes are read again
+        self._coordinator.index = PlantIndex(data, self._coordinator.index)
+        self._track_changes(self._coordinator.index)
+        return data
+
+
 class ESolarError(HomeAssistantError):
     """Base error."""
 
@@ -158,8 +554,11 @@ class UnknownError(ESolarError):
     """Raised when an unknown error occurs."""
 
 
-def get_data(
-    hass: HomeAssistant, config: Mapping[str, Any], options: Mapping[str, Any]
+async def get_data(
+    account: ESolarAccount,
+    config: Mapping[str, Any],
+    options: Mapping[str, Any],
+    cycle_budget: float | None = None,
 ) -> ESolarResponse:
     """Get data from the API."""
 
@@ -168,6 +567,16 @@ def get_data(
     region = config.get(CONF_REGION)
     plants = options.get(CONF_MONITORED_SITES)
     use_pv_grid_attributes = options.get(CONF_PV_GRID_DATA)
+    max_concurrency = options.get(
+        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+    )
+    static_refresh_interval = options.get(
+        CONF_STATIC_REFRESH_INTERVAL, DEFAULT_STATIC_REFRESH_INTERVAL
+    )
+    counter_refresh_cycles = options.get(
+        CONF_COUNTER_REFRESH_CYCLES, DEFAULT_COUNTER_REFRESH_CYCLES
+    )
+    keep_raw_data = options.get(CONF_KEEP_RAW_DATA, DEFAULT_KEEP_RAW_DATA)
 
     try:
         _LOGGER.debug(
@@ -176,32 +585,22 @@ def get_data(
             plants,
             use_pv_grid_attributes,
         )
-        plant_info = get_esolar_data(region, username, password, plants, use_pv_grid_attributes)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+        plant_info = await get_esolar_data(
+            account,
+            region,
+            username,
+            password,
+            plants,
+            use_pv_grid_attributes,
+            max_concurrency=max_concurrency,
+            static_refresh_interval=static_refresh_interval,
+            counter_refresh_cycles=counter_refresh_cycles,
+            cycle_budget=cycle_budget,
+            keep_raw_data=keep_raw_data,
+        )
+
     except ValueError as err:
-        err_str = str(err)
-
-        if "Invalid authentication credentials" in err_str:
-            raise InvalidAuth from err
-        if "captcha verification" in err_str.lower():
-            raise InvalidAuth from err
-        if "session rejected" in err_str.lower():
-            raise InvalidAuth from err
-        if "API rate limit exceeded." in err_str:
-            raise APIRatelimitExceeded from err
-        if "No accessible plants configured" in err_str:
-            raise PlantUnavailable(err_str) from err
-
-        _LOGGER.exception("Unexpected exception")
-        raise UnknownError from err
+        _raise_esolar_error(err)
 
     else:
         if "error" in plant_info:
@@ -211,3 +610,49 @@ def get_data(
             _LOGGER.exception("Unexpected response: %s", plant_info)
             raise UnknownError
     return cast(ESolarResponse, plant_info)
+
+
+async def get_live_data(
+    account: ESolarAccount,
+    config: Mapping[str, Any],
+    options: Mapping[str, Any],
+    cycle_budget: float | None = None,
+) -> ESolarResponse:
+    """Get the live power data from the API."""
+    try:
+        plant_info = await get_esolar_live_data(
+            account,
+            config.get(CONF_REGION),
+            config.get(CONF_USERNAME),
+            config.get(CONF_PASSWORD),
+            options.get(CONF_MONITORED_SITES),
+            max_concurrency=options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            ),
+            cycle_budget=cycle_budget,
+            keep_raw_data=options.get(CONF_KEEP_RAW_DATA, DEFAULT_KEEP_RAW_DATA),
+        )
+    except ValueError as err:
+        _raise_esolar_error(err)
+    return cast(ESolarResponse, plant_info)
+
+
+def _raise_esolar_error(err: ValueError) -> NoReturn:
+    """Translate a ValueError raised by the API layer into an ESolarError."""
+    err_str = str(err)
+
+    if "Invalid authentication credentials" in err_str:
+        raise InvalidAuth from err
+    if "captcha verification" in err_str.lower():
+        raise InvalidAuth from err
+    if "session rejected" in err_str.lower():
+        raise InvalidAuth from err
+    if "API rate limit exceeded." in err_str:
+        raise APIRatelimitExceeded from err
+    if "No accessible plants configured" in err_str:
+        raise PlantUnavailable(err_str) from err
+    if "No plant data to refresh yet" in err_str:
+        raise UnknownError(err_str) from err
+
+    _LOGGER.exception("Unexpected exception")
+    raise UnknownError from err
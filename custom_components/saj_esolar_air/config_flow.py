@@ -4,7 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import requests
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -13,21 +13,37 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig
 
+from . import async_setup_token_store
 from .const import (
     CONF_INVERTER_SENSORS,
     CONF_MONITORED_SITES,
     CONF_PV_GRID_DATA,
     DOMAIN,
     CONF_PLANT_UPDATE_INTERVAL,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    CONF_STATIC_REFRESH_INTERVAL,
+    DEFAULT_STATIC_REFRESH_INTERVAL,
+    CONF_COUNTER_REFRESH_CYCLES,
+    DEFAULT_COUNTER_REFRESH_CYCLES,
+    CONF_LIVE_UPDATE_INTERVAL,
+    DEFAULT_LIVE_UPDATE_INTERVAL,
+    CONF_IDLE_UPDATE_INTERVAL,
+    DEFAULT_IDLE_UPDATE_INTERVAL,
+    CONF_STATE_HEARTBEAT_INTERVAL,
+    DEFAULT_STATE_HEARTBEAT_INTERVAL,
+    CONF_KEEP_RAW_DATA,
+    DEFAULT_KEEP_RAW_DATA,
     CONF_REGION,
     CONF_REGION_EU,
     CONF_REGION_IN,
     CONF_REGION_CN
 )
 from .esolar import (
-    clear_user_tokens,
+    async_clear_user_tokens,
     esolar_web_autenticate,
     SessionAuthError,
     web_get_plant,
@@ -61,20 +77,25 @@ class ESolarHub:
         """Initialize."""
         self.plant_list: dict[str, Any] = {}
 
-    def auth_and_get_solar_plants(self, region: str, username: str, password: str) -> bool:
+    async def auth_and_get_solar_plants(
+        self, hass: HomeAssistant, region: str, username: str, password: str
+    ) -> bool:
         """Download and list available inverters."""
+        websession = async_get_clientsession(hass)
+        await async_setup_token_store(hass)
         try:
             for attempt in range(2):
                 try:
                     if attempt > 0:
-                        clear_user_tokens(username, password)
-                    session = esolar_web_autenticate(
+                        await async_clear_user_tokens(username, password)
+                    session = await esolar_web_autenticate(
+                        websession,
                         region,
                         username,
                         password,
                         force_login=attempt > 0,
                     )
-                    self.plant_list = web_get_plant(region, session).get("plantList")
+                    self.plant_list = (await web_get_plant(region, session)).get("plantList")
                     return bool(self.plant_list)
                 except SessionAuthError:
                     if attempt == 0:
@@ -84,17 +105,17 @@ class ESolarHub:
                         )
                         continue
                     return False
-        except requests.exceptions.HTTPError:
+        except aiohttp.ClientResponseError:
             _LOGGER.error("Login: HTTPError")
             return False
-        except requests.exceptions.ConnectionError:
+        except aiohttp.ClientConnectionError:
             _LOGGER.error("Login: ConnectionError")
             return False
-        except requests.exceptions.Timeout:
+        except TimeoutError:
             _LOGGER.error("Login: Timeout")
             return False
-        except requests.exceptions.RequestException:
-            _LOGGER.error("Login: RequestException")
+        except aiohttp.ClientError:
+            _LOGGER.error("Login: ClientError")
             return False
         except ValueError as err:
             _LOGGER.error("Login failed: %s", err)
@@ -106,8 +127,8 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """Validate that the user input allows us to connect and fetch list of sites."""
 
     hub = ESolarHub()
-    if not await hass.async_add_executor_job(
-        hub.auth_and_get_solar_plants,
+    if not await hub.auth_and_get_solar_plants(
+        hass,
         data[CONF_REGION],
         data[CONF_USERNAME],
         data[CONF_PASSWORD]
@@ -164,7 +185,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception during reauth")
             errors["base"] = "unknown"
         else:
-            clear_user_tokens(user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
+            await async_clear_user_tokens(
+                user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+            )
             return self.async_update_reload_and_abort(
                 reauth_entry,
                 data={
@@ -258,9 +281,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             if len(user_input[CONF_MONITORED_SITES]) > 0:
-                user_input.update({CONF_INVERTER_SENSORS: self._get_reconfigure_entry().options.get(CONF_INVERTER_SENSORS)})
-                user_input.update({CONF_PV_GRID_DATA: self._get_reconfigure_entry().options.get(CONF_PV_GRID_DATA)})
-                user_input.update({CONF_PLANT_UPDATE_INTERVAL: self._get_reconfigure_entry().options.get(CONF_PLANT_UPDATE_INTERVAL)})
+                # keep every other option, only the sites are reconfigured
+                options = {
+                    **self._get_reconfigure_entry().options,
+                    CONF_MONITORED_SITES: user_input[CONF_MONITORED_SITES],
+                }
 
                 _LOGGER.debug(
                     f"Reconfigure: Store data in hass. {self.data}"
@@ -269,7 +294,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_update_reload_and_abort(
                     self._get_reconfigure_entry(),
                     data=self.data,
-                    options=user_input,
+                    options=options,
                     reload_even_if_entry_is_unchanged=False
                 )
 
@@ -315,10 +340,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     self._get_reconfigure_entry(),
                     data=self.data,
                     options={
+                        **self._get_reconfigure_entry().options,
                         CONF_MONITORED_SITES: self.sites,
-                        CONF_INVERTER_SENSORS: self._get_reconfigure_entry().options.get(CONF_INVERTER_SENSORS),
-                        CONF_PV_GRID_DATA: self._get_reconfigure_entry().options.get(CONF_PV_GRID_DATA),
-                        CONF_PLANT_UPDATE_INTERVAL: self._get_reconfigure_entry().options.get(CONF_PLANT_UPDATE_INTERVAL),
                     },
                     reload_even_if_entry_is_unchanged=False,
                 )
@@ -374,6 +397,48 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_PLANT_UPDATE_INTERVAL,
                         default=self.config_entry.options.get(CONF_PLANT_UPDATE_INTERVAL),
                     ): int,
+                    vol.Required(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=16)),
+                    vol.Required(
+                        CONF_STATIC_REFRESH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_STATIC_REFRESH_INTERVAL, DEFAULT_STATIC_REFRESH_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=1440)),
+                    vol.Required(
+                        CONF_COUNTER_REFRESH_CYCLES,
+                        default=self.config_entry.options.get(
+                            CONF_COUNTER_REFRESH_CYCLES, DEFAULT_COUNTER_REFRESH_CYCLES
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=24)),
+                    vol.Required(
+                        CONF_LIVE_UPDATE_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_LIVE_UPDATE_INTERVAL, DEFAULT_LIVE_UPDATE_INTERVAL
+                        ),
+                    ): vol.Any(0, vol.All(int, vol.Range(min=30, max=300))),
+                    vol.Required(
+                        CONF_IDLE_UPDATE_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_IDLE_UPDATE_INTERVAL, DEFAULT_IDLE_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=240)),
+                    vol.Required(
+                        CONF_STATE_HEARTBEAT_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_STATE_HEARTBEAT_INTERVAL, DEFAULT_STATE_HEARTBEAT_INTERVAL
+                        ),
+                    ): vol.All(int, vol.Range(min=0, max=1440)),
+                    vol.Required(
+                        CONF_KEEP_RAW_DATA,
+                        default=self.config_entry.options.get(
+                            CONF_KEEP_RAW_DATA, DEFAULT_KEEP_RAW_DATA
+                        ),
+                    ): bool,
                 }
             ),
         )
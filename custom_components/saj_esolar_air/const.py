@@ -2,6 +2,11 @@
 from typing import Final
 
 DOMAIN = "saj_esolar_air"
+# hass.data[DOMAIN] key of the accounts shared by config entries
+DATA_ACCOUNTS = "accounts"
+DATA_CAPABILITIES = "capabilities"
+DATA_RATE_LIMITS = "rate_limits"
+DATA_TOKEN_STORE = "token_store"
 CONF_MONITORED_SITES = "monitored_sites"
 CONF_REGION = "region"
 CONF_REGION_EU = "eu"
@@ -14,6 +19,20 @@ MANUFACTURER = "SAJ"
 CONF_INVERTER_SENSORS: Final = "show_inverter_sensors"
 CONF_PV_GRID_DATA: Final = "show_pv_grid_data"
 CONF_PLANT_UPDATE_INTERVAL: Final = "plant_update_interval"
+CONF_MAX_CONCURRENT_REQUESTS: Final = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+CONF_STATIC_REFRESH_INTERVAL: Final = "static_refresh_interval"
+DEFAULT_STATIC_REFRESH_INTERVAL = 60
+CONF_COUNTER_REFRESH_CYCLES: Final = "counter_refresh_cycles"
+DEFAULT_COUNTER_REFRESH_CYCLES = 3
+CONF_LIVE_UPDATE_INTERVAL: Final = "live_update_interval"
+DEFAULT_LIVE_UPDATE_INTERVAL = 0
+CONF_IDLE_UPDATE_INTERVAL: Final = "idle_update_interval"
+DEFAULT_IDLE_UPDATE_INTERVAL = 30
+CONF_STATE_HEARTBEAT_INTERVAL: Final = "state_heartbeat_interval"
+DEFAULT_STATE_HEARTBEAT_INTERVAL = 60
+CONF_KEEP_RAW_DATA: Final = "keep_raw_data"
+DEFAULT_KEEP_RAW_DATA = False
 
 # Misc
 P_UNKNOWN = "Unknown"
@@ -140,7 +159,11 @@ P_OWNER_EMAIL = 'Owner email'
 P_NO = 'Plant No.'
 P_ID = 'Plant ID'
 P_TODAY_ALARM_NUM = 'Plant today alarm number'
+P_STALE_DATA = 'Stale data age (s)'
+P_ENDPOINTS = 'Endpoints'
 UNAVAILABLE_PLANTS = "unavailablePlants"
+IDLE_PLANTS = "idlePlants"
+STALE_DATA = "staleData"
 PLANT_RUNNING_STATE_OFFLINE = 3
 
 P_GRID_AC1 = 'AC1'
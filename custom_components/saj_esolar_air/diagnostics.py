@@ -11,6 +11,8 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntry
 
 from custom_components.saj_esolar_air import DOMAIN
+from .const import CONF_KEEP_RAW_DATA, DEFAULT_KEEP_RAW_DATA
+from .esolar import WEB_PLANT_DATA
 
 
 async def async_get_config_entry_diagnostics(
@@ -47,11 +49,24 @@ def _async_get_diagnostics(
     sensitive_keys = [CONF_PASSWORD, CONF_USERNAME, "latitude", "longitude", "latitudeStr", "longitudeStr", "plantUid", "address", "deviceSnList",
                       "deviceSn", "devicePc", "modulePc", "moduleSn", "userUid", "fullAddress", "ownerEmail", "moduleSnList",
                       "email", "plantId", "plantNo", "officeId", "reportId", "aliases", "identifiers", "serial_number",
-                      "emsModulePc", "emsModuleSn", "batSn", "bmsSn", "emsSn"]
+                      "emsModulePc", "emsModuleSn", "batSn", "bmsSn", "emsSn", "target",
+                      # the same fields in the normalized model
+                      "uid", "sn", "full_address", "owner_email", "plant_no", "plant_id", "device_pc", "module_pc",
+                      "module_sn", "bms_sn"]
     data = {
         "name": entry.title,
         "entry": config,
         "runtime_data": runtime_data,
+        # the answers are pruned to the keys read unless the option keeps them
+        "raw_data_kept": entry.options.get(CONF_KEEP_RAW_DATA, DEFAULT_KEEP_RAW_DATA),
+        "model": [plant.as_dict() for plant in coordinator.index.plants.values()],
+        "connections": coordinator.account.stats(),
+        "plant_cache": WEB_PLANT_DATA.stats(),
+        "request_metrics": {
+            "last_cycle": ((runtime_data or {}).get("cycle") or {}).get("endpoints"),
+            "since_start": coordinator.account.metrics.stats(),
+        },
+        "state_writes": coordinator.state_writes.stats(),
     }
     if device is not None:
         data["device"] = device.dict_repr
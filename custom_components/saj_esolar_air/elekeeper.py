@@ -3,6 +3,7 @@ import calendar
 import datetime
 import hashlib
 import binascii
+import math
 from Crypto.Cipher import AES
 import urllib.parse
 import random
@@ -17,6 +18,18 @@ QUERY_SIGN_KEY = "ktoKRLgQPjvNyUZO8lVc9kU1Bsip6XIe" #extracted from elekeeper ap
 
 def calc_signature(_dict):
     """ Sign a web request query params (data) """
+    keys_str = ','.join(_dict)
+    string = dict_to_sorted_string(_dict)+"&key="+QUERY_SIGN_KEY
+    h = hashlib.md5(string.encode('latin-1')).hexdigest()
+    # sign() spelled out: the hex SHA-1 of the md5 hex, the same bytes in one step
+    signature = hashlib.sha1(h.encode()).hexdigest().upper()
+
+    _dict['signature'] = signature
+    _dict['signParams'] = keys_str
+    return _dict
+
+def calc_signature_reference(_dict):
+    """ Sign like the elekeeper app.js does, word by word (slow, kept to check calc_signature) """
     keys = _dict.keys()
     keys_str = ','.join(keys)
     string = dict_to_sorted_string(_dict)+"&key="+QUERY_SIGN_KEY
@@ -49,11 +62,10 @@ def sha1_hash(data):
     else:
         data = str(data).encode()  # Egyéb típusok átalakítása
 
-    sha1 = hashlib.sha1()
-    sha1.update(data)
+    digest = hashlib.sha1(data).digest()
 
     # SHA-1 hash 20 bájt, 5 darab 32 bites számként visszaadva
-    result = [int.from_bytes(sha1.digest()[i:i + 4], "big", signed=True) for i in range(0, 20, 4)]
+    result = [int.from_bytes(digest[i:i + 4], "big", signed=True) for i in range(0, 20, 4)]
     return result
 
 def extract_bytes_from_words(words):
@@ -95,7 +107,7 @@ def pad_pkcs7(data, block_size=16):
 
 def generatkey(length):
     chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-    return ''.join(random.choice(chars) for _ in range(length))
+    return ''.join(random.choices(chars, k=length))
 
 ### 4. methods used for data extraction
 
@@ -144,6 +156,37 @@ def is_today(date_string, date_format="%Y-%m-%d %H:%M:%S"):
     except ValueError:
         return False
 
+def sun_elevation(latitude, longitude, when=None):
+    """Return the elevation of the sun in degrees (NOAA approximation)."""
+    if when is None:
+        when = datetime.now(ZoneInfo("UTC"))
+    when = when.astimezone(ZoneInfo("UTC"))
+    hour = when.hour + when.minute / 60 + when.second / 3600
+    gamma = 2 * math.pi / 365 * (when.timetuple().tm_yday - 1 + (hour - 12) / 24)
+    declination = (
+        0.006918
+        - 0.399912 * math.cos(gamma)
+        + 0.070257 * math.sin(gamma)
+        - 0.006758 * math.cos(2 * gamma)
+        + 0.000907 * math.sin(2 * gamma)
+        - 0.002697 * math.cos(3 * gamma)
+        + 0.00148 * math.sin(3 * gamma)
+    )
+    equation_of_time = 229.18 * (
+        0.000075
+        + 0.001868 * math.cos(gamma)
+        - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma)
+        - 0.040849 * math.sin(2 * gamma)
+    )
+    solar_minutes = hour * 60 + equation_of_time + 4 * float(longitude)
+    hour_angle = math.radians(solar_minutes / 4 - 180)
+    lat = math.radians(float(latitude))
+    sin_elevation = math.sin(lat) * math.sin(declination) + math.cos(lat) * math.cos(
+        declination
+    ) * math.cos(hour_angle)
+    return math.degrees(math.asin(max(-1.0, min(1.0, sin_elevation))))
+
 def set_energy_flow_type(plant):
     if plant.get("ifCMPDevice") == 1 and plant.get("ifInstallPv") == 1:
         plant["flowType"] = "CMP"
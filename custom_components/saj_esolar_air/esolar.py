@@ -1,20 +1,88 @@
 """ESolar Cloud Platform data fetchers."""
+import asyncio
+import collections
+import contextlib
+import contextvars
 import datetime
+import functools
 import time
 import logging
 import json
 import hashlib
 import os
-import requests
+import random
+from typing import Any
+import aiohttp
 from dateutil.relativedelta import relativedelta
-from .elekeeper import calc_signature, encrypt, generatkey, is_today, prepare_data_for_query
-from .const import UNAVAILABLE_PLANTS
+from .elekeeper import (
+    calc_signature,
+    encrypt,
+    generatkey,
+    is_today,
+    prepare_data_for_query,
+    sun_elevation,
+)
+from .const import (
+    DEFAULT_COUNTER_REFRESH_CYCLES,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_STATIC_REFRESH_INTERVAL,
+    IDLE_PLANTS,
+    STALE_DATA,
+    UNAVAILABLE_PLANTS,
+)
+from .pipeline import (
+    IDLE_SKIP,
+    IDLE_STORAGE,
+    PRIORITY_ALARM,
+    PRIORITY_COUNTER,
+    PRIORITY_STATIC,
+    TIER_COUNTER,
+    TIER_STATIC,
+    CycleBudget,
+    RefreshSchedule,
+    check_budget,
+    Stage,
+    StagePipeline,
+)
+from .plant_cache import PlantDataCache, plant_cache_key
+from .model import DEVICE_KEYS, PLANT_KEYS, STATISTICS_KEYS, plant_is_offline
 
 _LOGGER = logging.getLogger(__name__)
 
 WEB_TIMEOUT = 30
+# requests get at least this long, even when the cycle budget is used up
+MIN_WEB_TIMEOUT = 5
+KEEPALIVE_TIMEOUT = 120
+PLANT_LIST_TTL = 60
+# account request budget: sustained requests per second and burst size
+REQUEST_RATE = 5.0
+REQUEST_BURST = 100
+# rate limit cooldown, doubled on every limit hit in a row
+BACKOFF_BASE = 60
+BACKOFF_MAX = 3600
+RATE_LIMIT_KEYWORDS = (
+    "rate limit",
+    "too many",
+    "too frequent",
+    "frequently",
+)
+# optional endpoints are suppressed after this many answers without data in a row
+CAPABILITY_THRESHOLD = 3
+CAPABILITY_BACKOFF_BASE = 15 * 60
+CAPABILITY_BACKOFF_MAX = 24 * 60 * 60
+# latencies kept per endpoint for the percentiles
+LATENCY_SAMPLES = 200
+# renew access tokens this long before they expire, plus up to the jitter
+TOKEN_REFRESH_LEAD = 600
+TOKEN_REFRESH_JITTER = 300
+# tokens closer to expiry than this are left to the refresh cycle
+TOKEN_REFRESH_MIN_DELAY = 30
+# below this the panels produce next to nothing (civil dusk is at -6)
+NIGHT_SUN_ELEVATION = -3.0
 END_USER_PLANT_LIST = None
-WEB_PLANT_DATA: dict = {}
+WEB_PLANT_DATA = PlantDataCache()
+# set by the integration; without it (CLI, tests) tokens live in user_data.json
+TOKEN_STORE = None
 CAPTCHA_REQUIRED_MSG = (
     "SAJ login requires captcha verification. "
     "Log in at https://eop.saj-electric.com/ in a browser, then reload the integration."
@@ -38,7 +106,51 @@ class SessionAuthError(Exception):
     """Raised when the SAJ API rejects the current session or token."""
 
 
+class RateLimitError(Exception):
+    """Raised when the SAJ API asks to slow down, or while cooling down after it."""
+
+
+# requests sent and answered by the refresh cycle running in the current task tree
+_CYCLE_REQUESTS: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "saj_cycle_requests", default=None
+)
+# request metrics of the refresh cycle running in the current task tree
+_CYCLE_METRICS: contextvars.ContextVar["RequestMetrics | None"] = contextvars.ContextVar(
+    "saj_cycle_metrics", default=None
+)
+# time budget of the refresh cycle running in the current task tree
+_CYCLE_BUDGET: contextvars.ContextVar[CycleBudget | None] = contextvars.ContextVar(
+    "saj_cycle_budget", default=None
+)
+# whether the refresh cycle running in the current task tree merges the
+# answers whole, for the diagnostics, instead of pruned to the read keys
+_KEEP_RAW: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "saj_keep_raw", default=False
+)
+
+# The keys kept of the plant and device answers: what the model records
+# read, plus what the stages and the entity setup read of the raw dicts.
+_PLANT_ANSWER_KEYS = PLANT_KEYS | frozenset({
+    "deviceSnList", "moduleSnList", "emsModules", "queryDeviceDataType",
+    "isInstallMeter", "isInstallEms", "isInstallLoraMeter", "flowType",
+    "ifCMPDevice", "ifCHDevice", "ifC6Device", "ifInstallPv", "hasH2Device",
+})
+_DEVICE_ANSWER_KEYS = DEVICE_KEYS | frozenset({
+    "isMasterFlag", "batEnergyPercent",
+})
+_STATISTICS_ANSWER_KEYS = STATISTICS_KEYS
+
+
+def _request_timeout() -> float:
+    """Return the timeout of the next request, bounded by the cycle budget."""
+    budget = _CYCLE_BUDGET.get()
+    if budget is None:
+        return WEB_TIMEOUT
+    return max(MIN_WEB_TIMEOUT, min(WEB_TIMEOUT, budget.remaining()))
+
+
 BASIC_TEST = False
+BASE_URL_ENV = "SAJ_ESOLAR_BASE_URL"
 VERBOSE_DEBUG = False
 
 if BASIC_TEST:
@@ -50,6 +162,10 @@ if BASIC_TEST:
 
 def base_url(region):
     """SAJ eSolar Helper Function - Returns the base URL for the region."""
+    override = os.environ.get(BASE_URL_ENV)
+    if override:
+        # local stand-in API, see basic_test/mock_server.py
+        return override.rstrip("/")
     if region == "eu":
         return "https://eop.saj-electric.com/dev-api/api/v1"
     elif region == "in":
@@ -59,41 +175,927 @@ def base_url(region):
     else:
         raise ValueError("Region not set. Please run Configure again")
 
+
+class SingleFlight:
+    """Share one execution of identical calls that are in flight together.
+
+    With a ``ttl`` the result is also handed to callers arriving within that
+    many seconds after the call finished.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the call registry."""
+        self.coalesced = 0
+        self._calls: dict[Any, asyncio.Future] = {}
+        self._results: dict[Any, tuple[float, Any]] = {}
+
+    async def run(self, key, factory, ttl: float = 0.0):
+        """Return the result of ``factory()``, sharing it with identical calls."""
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            self.coalesced += 1
+            return cached[1]
+
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._finished, key, ttl))
+        else:
+            self.coalesced += 1
+        # a cancelled caller must not cancel the call other callers wait for
+        return await asyncio.shield(task)
+
+    def _finished(self, key, ttl: float, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # also marks a failure as retrieved when every caller was cancelled
+        if task.cancelled() or task.exception() is not None or not ttl:
+            return
+        self._results[key] = (time.monotonic(), task.result())
+
+
+class ConcurrencyLimit:
+    """Cap on the number of requests in flight that can change at any time.
+
+    A raised cap lets waiting requests go right away, a lowered one holds new
+    requests back until enough of the running ones are done.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the cap, nothing is in flight yet."""
+        self.limit = max(1, int(limit))
+        self.active = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+    def resize(self, limit: int) -> None:
+        """Apply a changed cap."""
+        self.limit = max(1, int(limit))
+        self._wake()
+
+    async def __aenter__(self) -> None:
+        while self.active >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # hand a wake-up this request can no longer use to the next one
+                self._wake()
+                raise
+        self.active += 1
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self.active
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class RateLimiter:
+    """Token bucket every request of one account goes through.
+
+    When the API signals a rate limit, no request is sent until a cooldown
+    with exponential backoff and jitter has passed. The cooldown is kept in
+    wall clock time so it can be persisted and restored.
+    """
+
+    def __init__(
+        self, rate: float = REQUEST_RATE, burst: int = REQUEST_BURST
+    ) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.cooldown_until = 0.0
+        self.backoff_level = 0
+        self.limit_hits = 0
+        self.waited = 0.0
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def cooldown_remaining(self) -> float:
+        """Return the seconds left of the cooldown."""
+        return max(0.0, self.cooldown_until - time.time())
+
+    async def acquire(self) -> None:
+        """Take a token, waiting for one when the bucket is empty."""
+        self._check_cooldown()
+        async with self._lock:
+            # a rate limit may have been hit while waiting for the lock
+            self._check_cooldown()
+            self._refill()
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self.tokens -= 1
+
+    def penalize(self) -> float | None:
+        """Start the cooldown after a rate limit answer and return its length.
+
+        Answers to requests sent before the cooldown started return None, so
+        one burst of limited requests counts as a single backoff step.
+        """
+        self.limit_hits += 1
+        if self.cooldown_remaining():
+            return None
+        self.backoff_level += 1
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.backoff_level - 1))
+        delay = random.uniform(delay / 2, delay)
+        self.cooldown_until = time.time() + delay
+        self.tokens = 0.0
+        return delay
+
+    def succeeded(self) -> None:
+        """Forget the backoff once a request passes after the cooldown."""
+        if self.backoff_level and not self.cooldown_remaining():
+            self.backoff_level = 0
+
+    def state(self) -> dict:
+        """Return what has to survive a reload."""
+        return {
+            "cooldown_until": self.cooldown_until,
+            "backoff_level": self.backoff_level,
+        }
+
+    def restore(self, state: dict) -> None:
+        """Continue a cooldown saved by state()."""
+        self.cooldown_until = float(state.get("cooldown_until") or 0)
+        self.backoff_level = int(state.get("backoff_level") or 0)
+
+    def stats(self) -> dict:
+        """Return the bucket level and the cooldown."""
+        self._refill()
+        return {
+            "bucket_tokens": round(max(0.0, self.tokens), 1),
+            "bucket_capacity": self.capacity,
+            "cooldown_remaining": round(self.cooldown_remaining()),
+            "backoff_level": self.backoff_level,
+            "limit_hits": self.limit_hits,
+            "waited_seconds": round(self.waited, 1),
+        }
+
+    def _check_cooldown(self) -> None:
+        remaining = self.cooldown_remaining()
+        if remaining:
+            raise RateLimitError(f"cooling down for another {remaining:.0f} s")
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+
+class CapabilityBreaker:
+    """Circuit breaker per (endpoint, plant or device) of optional endpoints.
+
+    Some endpoints never return data for some plant or device types. After
+    ``threshold`` answers without data (or errors) in a row the circuit opens
+    and the call is skipped, as if it returned nothing, until a backoff window
+    has passed. Then one probe goes out: data closes the circuit, another
+    empty answer reopens it for twice as long. Windows are kept in wall clock
+    time so they can be persisted and restored.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CAPABILITY_THRESHOLD,
+        base: float = CAPABILITY_BACKOFF_BASE,
+        maximum: float = CAPABILITY_BACKOFF_MAX,
+    ) -> None:
+        """Initialize with every circuit closed."""
+        self.threshold = threshold
+        self.base = base
+        self.maximum = maximum
+        self.wasted = 0
+        self.suppressed = 0
+        self.probes = 0
+        # (endpoint, target) -> [empty answers in a row, window, open until]
+        self._circuits: dict[tuple[str, str], list] = {}
+
+    def allow(self, endpoint: str, target: str) -> bool:
+        """Return False while the circuit of the call is open."""
+        circuit = self._circuits.get((endpoint, target))
+        if circuit is None or not circuit[2]:
+            return True
+        if circuit[2] > time.time():
+            self.suppressed += 1
+            return False
+        self.probes += 1
+        return True
+
+    def record(self, endpoint: str, target: str, empty: bool) -> None:
+        """Record the outcome of a call that was allowed."""
+        key = (endpoint, target)
+        if not empty:
+            circuit = self._circuits.pop(key, None)
+            if circuit is not None and circuit[2]:
+                _LOGGER.debug("%s answers again for %s", endpoint, target)
+            return
+        self.wasted += 1
+        circuit = self._circuits.setdefault(key, [0, 0.0, 0.0])
+        circuit[0] += 1
+        if circuit[0] < self.threshold:
+            return
+        # first opening, or a failed probe
+        circuit[1] = min(self.maximum, circuit[1] * 2 or self.base)
+        circuit[2] = time.time() + circuit[1]
+        _LOGGER.debug(
+            "%s returned nothing %s times for %s, skipping it for %.0f s",
+            endpoint,
+            circuit[0],
+            target,
+            circuit[1],
+        )
+
+    def state(self) -> dict:
+        """Return what has to survive a restart."""
+        return {
+            f"{endpoint}|{target}": list(circuit)
+            for (endpoint, target), circuit in self._circuits.items()
+            if circuit[2]
+        }
+
+    def restore(self, state: dict) -> None:
+        """Reopen the circuits saved by state()."""
+        for key, circuit in state.items():
+            endpoint, _, target = key.partition("|")
+            self._circuits[(endpoint, target)] = [
+                int(circuit[0]),
+                float(circuit[1]),
+                float(circuit[2]),
+            ]
+
+    def stats(self) -> dict:
+        """Return the open circuits and the calls wasted and saved."""
+        now = time.time()
+        return {
+            "wasted_calls": self.wasted,
+            "suppressed_calls": self.suppressed,
+            "probes": self.probes,
+            "open": [
+                {
+                    "endpoint": endpoint,
+                    "target": target,
+                    "empty_answers": circuit[0],
+                    "window": round(circuit[1]),
+                    "retry_in": round(max(0.0, circuit[2] - now)),
+                }
+                for (endpoint, target), circuit in self._circuits.items()
+                if circuit[2]
+            ],
+        }
+
+
+class RequestMetrics:
+    """Request counters and latencies per SAJ endpoint.
+
+    The account keeps one since startup, every refresh cycle one of its own.
+    Percentiles are taken over the last LATENCY_SAMPLES requests of an endpoint.
+    """
+
+    def __init__(self, samples: int = LATENCY_SAMPLES) -> None:
+        """Initialize without any request."""
+        self.samples = samples
+        # endpoint -> [requests, errors, bytes received, seconds, recent latencies]
+        self._endpoints: dict[str, list] = {}
+
+    def record(self, endpoint: str, latency: float, received: int, error: bool) -> None:
+        """Count one request that was sent."""
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = [
+                0, 0, 0, 0.0, collections.deque(maxlen=self.samples)
+            ]
+        metrics[0] += 1
+        metrics[1] += int(error)
+        metrics[2] += received
+        metrics[3] += latency
+        metrics[4].append(latency)
+
+    def stats(self) -> dict:
+        """Return the totals and the endpoints, the one taking the most time first."""
+        endpoints = sorted(self._endpoints.items(), key=lambda item: -item[1][3])
+        return {
+            "requests": sum(metrics[0] for _, metrics in endpoints),
+            "errors": sum(metrics[1] for _, metrics in endpoints),
+            "bytes": sum(metrics[2] for _, metrics in endpoints),
+            "request_time_ms": round(sum(metrics[3] for _, metrics in endpoints) * 1000),
+            "endpoints": {
+                endpoint: {
+                    "requests": metrics[0],
+                    "errors": metrics[1],
+                    "bytes": metrics[2],
+                    **_latency_percentiles(metrics[4]),
+                }
+                for endpoint, metrics in endpoints
+            },
+        }
+
+
+def _latency_percentiles(latencies) -> dict:
+    """Return p50, p95 and max of the latencies in milliseconds."""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"p50_ms": None, "p95_ms": None, "max_ms": None}
+
+    def percentile(share: float) -> int:
+        return round(ordered[round(share * (len(ordered) - 1))] * 1000)
+
+    return {"p50_ms": percentile(0.5), "p95_ms": percentile(0.95), "max_ms": percentile(1.0)}
+
+
+def _endpoint_name(url: str) -> str:
+    """Return the endpoint of an API URL, e.g. monitor/plant/getOnePlantInfo."""
+    return url.partition("/api/v1/")[2] or url
+
+
+def _capability_allowed(session, endpoint: str, target: str) -> bool:
+    """Return False when the optional endpoint is known to have nothing for the target."""
+    breaker = getattr(session, "breaker", None)
+    return breaker is None or breaker.allow(endpoint, target)
+
+
+def _record_capability(session, endpoint: str, target: str, result):
+    """Tell the capability breaker whether the endpoint had data, return the data.
+
+    API error answers of optional endpoints are parsed to None, so they count
+    as empty too.
+    """
+    breaker = getattr(session, "breaker", None)
+    if breaker is not None:
+        breaker.record(endpoint, target, not result)
+    return result
+
+
+def _is_rate_limited(answer) -> bool:
+    """Return True when a SAJ API answer reports a rate limit."""
+    if not isinstance(answer, dict) or answer.get("errCode", 0) in (0, None):
+        return False
+    err_msg = str(answer.get("errMsg") or "").lower()
+    return any(keyword in err_msg for keyword in RATE_LIMIT_KEYWORDS)
+
+
+class ESolarSession:
+    """Authenticated SAJ web session.
+
+    Requests go through a plain aiohttp client session or through an
+    ESolarConnectionPool.
+    """
+
+    def __init__(
+        self,
+        websession,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        limiter: RateLimiter | None = None,
+        breaker: CapabilityBreaker | None = None,
+        metrics: RequestMetrics | None = None,
+        concurrency: ConcurrencyLimit | None = None,
+    ) -> None:
+        """Initialize the session."""
+        self.websession = websession
+        self.limiter = limiter
+        self.breaker = breaker
+        self.metrics = metrics
+        self.headers: dict[str, str] = {}
+        self.expires: int | None = None
+        self.request_count = 0
+        self.calls = SingleFlight()
+        # caps the number of in-flight requests of one account
+        self.concurrency = concurrency or ConcurrencyLimit(max_concurrency)
+
+    def token_valid(self) -> bool:
+        """Return True while the access token has not expired."""
+        return self.expires is not None and self.expires > time.time()
+
+    async def get(self, url: str, params: dict) -> dict:
+        """Send a signed GET request and return the decoded JSON answer."""
+        return await self._request("GET", url, params=params)
+
+    async def post(self, url: str, data: dict) -> dict:
+        """Send a signed form POST request and return the decoded JSON answer."""
+        return await self._request("POST", url, data=data)
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        """Perform a request against the SAJ API."""
+        # SAJ expects every query/form value as text (aiohttp rejects ints in params)
+        for key in ("params", "data"):
+            if key in kwargs:
+                kwargs[key] = {k: str(v) for k, v in kwargs[key].items()}
+
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        cycle_requests = _CYCLE_REQUESTS.get()
+        async with self.concurrency, _client_lease(self.websession) as client:
+            # the wait for a connection may have used up the cycle budget
+            check_budget(_CYCLE_BUDGET.get())
+            self.request_count += 1
+            if cycle_requests is not None:
+                cycle_requests[0] += 1
+            started = time.monotonic()
+            body = b""
+            answer = None
+            try:
+                async with client.request(
+                    method,
+                    url,
+                    headers=self.headers,
+                    timeout=aiohttp.ClientTimeout(total=_request_timeout()),
+                    **kwargs,
+                ) as response:
+                    if response.status == 429:
+                        self._rate_limited(url, "HTTP 429")
+                    response.raise_for_status()
+
+                    if response.status != 200:
+                        raise ValueError(f"SAJ API error for {url}: {response.status}")
+
+                    body = await response.read()
+                    answer = json.loads(body) if body.strip() else None
+            finally:
+                self._record(url, time.monotonic() - started, len(body), answer)
+
+        if _is_rate_limited(answer):
+            self._rate_limited(url, answer.get("errMsg"))
+        if self.limiter is not None:
+            self.limiter.succeeded()
+        if cycle_requests is not None:
+            cycle_requests[1] += 1
+        return answer
+
+    def _record(self, url: str, latency: float, received: int, answer) -> None:
+        """Add a request to the account and cycle metrics, API error answers count as errors."""
+        error = not isinstance(answer, dict) or answer.get("errCode", 0) not in (0, None)
+        endpoint = _endpoint_name(url)
+        for metrics in (self.metrics, _CYCLE_METRICS.get()):
+            if metrics is not None:
+                metrics.record(endpoint, latency, received, error)
+
+    def _rate_limited(self, url: str, reason) -> None:
+        """Back off and raise RateLimitError for a rate limited request."""
+        delay = self.limiter.penalize() if self.limiter is not None else None
+        if delay is not None:
+            _LOGGER.warning(
+                "SAJ API rate limit hit (%s), pausing requests for %.0f s",
+                reason,
+                delay,
+            )
+        raise RateLimitError(f"{url}: {reason}")
+
+
+class ESolarConnectionPool:
+    """Long-lived keep-alive connection pool of one SAJ account.
+
+    The aiohttp client session is created on first use and kept across
+    refresh cycles, so the TCP/TLS handshake is paid once instead of every
+    cycle. It is only rebuilt after an auth or connection error, or when the
+    pool size changes. Requests lease the client, so a replaced client is
+    closed once its last request is done instead of under it.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+    ) -> None:
+        """Initialize the pool, no connection is opened yet."""
+        self.max_connections = max(1, int(max_connections))
+        self.keepalive_timeout = keepalive_timeout
+        self.handshakes = 0
+        self.reused = 0
+        self.rebuilds = 0
+        self._client: aiohttp.ClientSession | None = None
+        self._client_size = 0
+        # clients with requests in flight, mapped to the number of those requests
+        self._leases: dict[aiohttp.ClientSession, int] = {}
+
+    def configure(self, max_connections: int) -> None:
+        """Apply a changed pool size, the next request rebuilds the pool."""
+        self.max_connections = max(1, int(max_connections))
+
+    @contextlib.asynccontextmanager
+    async def lease(self):
+        """Lend the pooled client session to one request."""
+        client = await self.client()
+        self._leases[client] = self._leases.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            self._leases[client] -= 1
+            if not self._leases[client]:
+                del self._leases[client]
+                if client is not self._client:
+                    # replaced while the request was in flight
+                    await client.close()
+
+    async def client(self) -> aiohttp.ClientSession:
+        """Return the pooled client session, creating it when needed."""
+        if self._client is not None and (
+            self._client.closed or self._client_size != self.max_connections
+        ):
+            await self.reset("pool settings changed")
+        if self._client is None:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_connection_create)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+            self._client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections,
+                    keepalive_timeout=self.keepalive_timeout,
+                ),
+                headers={"Accept-Encoding": "gzip, deflate"},
+                trace_configs=[trace_config],
+            )
+            self._client_size = self.max_connections
+        return self._client
+
+    async def reset(self, reason: str) -> None:
+        """Drop every pooled connection, the next request opens new ones."""
+        if self._client is None:
+            return
+        _LOGGER.debug("Rebuilding SAJ connection pool: %s", reason)
+        client, self._client = self._client, None
+        self.rebuilds += 1
+        if client not in self._leases:
+            await client.close()
+
+    async def close(self) -> None:
+        """Close the pool for good, with the clients of requests still in flight."""
+        clients = set(self._leases)
+        if self._client is not None:
+            clients.add(self._client)
+        self._client = None
+        self._leases.clear()
+        for client in clients:
+            await client.close()
+
+    def stats(self) -> dict:
+        """Return the handshake and connection reuse counters."""
+        connections = self.handshakes + self.reused
+        return {
+            "pool_size": self.max_connections,
+            "handshakes": self.handshakes,
+            "reused": self.reused,
+            "reuse_rate": round(self.reused / connections, 3) if connections else None,
+            "rebuilds": self.rebuilds,
+        }
+
+    async def _on_connection_create(self, session, context, params) -> None:
+        self.handshakes += 1
+
+    async def _on_connection_reuse(self, session, context, params) -> None:
+        self.reused += 1
+
+
+class ESolarAccount:
+    """SAJ account shared by every config entry that logs in with it.
+
+    Entries of the same (region, username) share one connection pool, one
+    authenticated session and one plant list, so logins and plant list
+    requests are not repeated per entry. The pool and the cap on requests in
+    flight are sized for the entry asking for the most concurrent requests. A background task renews the token
+    before it expires, so refresh cycles do not have to wait for auth.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        username: str,
+        max_connections: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize the account, nothing is sent yet."""
+        self.region = region
+        self.username = username
+        self.default_connections = max_connections
+        self.pool = ESolarConnectionPool(max_connections)
+        # shared by the sessions of the account, so a re-login keeps counting
+        self.concurrency = ConcurrencyLimit(max_connections)
+        self.limiter = RateLimiter()
+        self.breaker = CapabilityBreaker()
+        self.metrics = RequestMetrics()
+        self.session: ESolarSession | None = None
+        self.calls = SingleFlight()
+        self.logins = 0
+        # config entries using the account, mapped to their concurrency setting
+        self.entries: dict[str, int] = {}
+        self.background_renewals = 0
+        self.background_failures = 0
+        self.in_cycle_auth = 0
+        self._password: str | None = None
+        self._renew_task: asyncio.Task | None = None
+        self._renew_at: float | None = None
+        # cached plant data keys, mapped to the lock of the lanes merging into it
+        self._data_locks: dict[tuple, asyncio.Lock] = {}
+
+    def data_lock(self, key: tuple) -> asyncio.Lock:
+        """Return the lock the refresh lanes hold while merging into plant data."""
+        return self._data_locks.setdefault(key, asyncio.Lock())
+
+    def add_entry(self, entry_id: str, max_connections: int) -> None:
+        """Register a config entry, or apply its changed concurrency setting."""
+        self.entries[entry_id] = max_connections
+        self._resize()
+
+    def remove_entry(self, entry_id: str) -> None:
+        """Unregister a config entry."""
+        self.entries.pop(entry_id, None)
+        self._resize()
+
+    def _resize(self) -> None:
+        """Size the pool and the request cap for the entry asking for the most."""
+        size = max(self.entries.values(), default=self.default_connections)
+        self.pool.configure(size)
+        self.concurrency.resize(size)
+
+    async def authenticate(
+        self, region, username, password, force_login: bool = False
+    ) -> ESolarSession:
+        """Return the shared session, logging in when the token is gone."""
+        self._password = password
+        session = self.session
+        if not force_login and session is not None and session.token_valid():
+            return session
+        if self.logins:
+            # the background renewal did not keep the token valid
+            self.in_cycle_auth += 1
+        return await self.calls.run(
+            ("login", force_login),
+            functools.partial(self._login, region, username, password, force_login),
+        )
+
+    async def reset(self, reason: str, *, drop_session: bool = False) -> None:
+        """Rebuild the connection pool and optionally forget the session."""
+        if drop_session:
+            self.session = None
+            self._cancel_renewal()
+        await self.pool.reset(reason)
+
+    async def close(self) -> None:
+        """Close the connection pool for good."""
+        self.session = None
+        self._cancel_renewal()
+        await self.pool.close()
+
+    def stats(self) -> dict:
+        """Return the connection and request sharing counters."""
+        calls = self.calls.coalesced
+        if self.session is not None:
+            calls += self.session.calls.coalesced
+        return {
+            **self.pool.stats(),
+            "entries": len(self.entries),
+            "logins": self.logins,
+            "coalesced_calls": calls,
+            "rate_limit": self.limiter.stats(),
+            "capabilities": self.breaker.stats(),
+            "token_renewal": {
+                "background": self.background_renewals,
+                "background_failures": self.background_failures,
+                "in_cycle": self.in_cycle_auth,
+                "next_in": (
+                    round(max(0.0, self._renew_at - time.time()))
+                    if self._renew_at is not None
+                    else None
+                ),
+            },
+        }
+
+    async def _login(
+        self, region, username, password, force_login, renew: bool = False
+    ) -> ESolarSession:
+        # a renewal swaps the token of the live session, requests in flight keep going
+        session = self.session if renew and self.session is not None else None
+        session = await _authenticate(
+            session
+            or ESolarSession(
+                self.pool,
+                self.pool.max_connections,
+                self.limiter,
+                self.breaker,
+                self.metrics,
+                self.concurrency,
+            ),
+            region,
+            username,
+            password,
+            force_login,
+            renew=renew,
+        )
+        self.logins += 1
+        self.session = session
+        self._schedule_renewal(session)
+        return session
+
+    def _schedule_renewal(self, session: ESolarSession) -> None:
+        """Renew the token of the session shortly before it expires."""
+        self._cancel_renewal()
+        if session.expires is None:
+            return
+        remaining = session.expires - time.time()
+        delay = remaining - TOKEN_REFRESH_LEAD - random.uniform(0, TOKEN_REFRESH_JITTER)
+        if delay < remaining / 2:
+            # short lived token, renew it halfway
+            delay = remaining / 2
+        if delay < TOKEN_REFRESH_MIN_DELAY:
+            return
+        self._renew_at = time.time() + delay
+        # a fresh context, the renewal is not part of the cycle that scheduled it
+        self._renew_task = asyncio.get_running_loop().create_task(
+            self._renew_later(delay), context=contextvars.Context()
+        )
+
+    def _cancel_renewal(self) -> None:
+        if self._renew_task is not None:
+            self._renew_task.cancel()
+        self._renew_task = None
+        self._renew_at = None
+
+    async def _renew_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # the login below schedules the next renewal, which must not cancel this task
+        self._renew_task = None
+        self._renew_at = None
+        try:
+            await self.calls.run(
+                ("login", False),
+                functools.partial(
+                    self._login,
+                    self.region,
+                    self.username,
+                    self._password,
+                    False,
+                    renew=True,
+                ),
+            )
+        except (
+            ValueError,
+            aiohttp.ClientError,
+            TimeoutError,
+            SessionAuthError,
+            RateLimitError,
+        ) as err:
+            # the next refresh cycle authenticates itself
+            self.background_failures += 1
+            _LOGGER.warning(
+                "Background token renewal for %s failed: %s", self.username, err
+            )
+            return
+        self.background_renewals += 1
+        _LOGGER.debug("Renewed the SAJ token of %s in the background", self.username)
+
+
+@contextlib.asynccontextmanager
+async def _client_lease(websession):
+    """Lend the client session to send one request with."""
+    if isinstance(websession, ESolarAccount):
+        websession = websession.pool
+    if isinstance(websession, ESolarConnectionPool):
+        async with websession.lease() as client:
+            yield client
+    else:
+        yield websession
+
+
+async def _reset_connection_pool(websession, reason: str, *, auth: bool = False) -> None:
+    """Rebuild the connection pool, if the caller gave one."""
+    if isinstance(websession, ESolarAccount):
+        await websession.reset(reason, drop_session=auth)
+    elif isinstance(websession, ESolarConnectionPool):
+        await websession.reset(reason)
+
+
+def _plant_data_lock(websession, key: tuple) -> asyncio.Lock:
+    """Return the lock of the cached plant data, shared through the account.
+
+    Without an account nothing else refreshes the same data, a fresh lock will do.
+    """
+    if isinstance(websession, ESolarAccount):
+        return websession.data_lock(key)
+    return asyncio.Lock()
+
+
+def _connection_stats(websession) -> dict | None:
+    """Return the pool counters, if the caller gave a pool or account."""
+    if isinstance(websession, (ESolarAccount, ESolarConnectionPool)):
+        return websession.stats()
+    return None
+
+
+async def _async_run_blocking(func, *args, **kwargs):
+    """Run blocking (disk) work in the default executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def _gather_all(aws):
+    """Run awaitables concurrently and return their results in order.
+
+    Every awaitable runs to completion before the first failure (in item order)
+    is re-raised, so no request is left running in the background.
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+async def _for_each_plant(fetcher, region, session, plant_info, *args):
+    """Run a per-plant fetcher for every plant concurrently."""
+    await _gather_all(
+        fetcher(region, session, plant, *args) for plant in plant_info["plantList"]
+    )
+
+
 def dump(region, username, password):
     """ dumps the data for the region, username and password. Called from the CLI. """
-    plant_info = get_esolar_data(region, username, password)
+    plant_info = asyncio.run(_async_dump(region, username, password))
 
     with open('plant_info.json', 'w') as json_file:
         json.dump(plant_info, json_file, indent=4)
     return
 
-def get_esolar_data(region, username, password, plant_list=None, use_pv_grid_attributes=True):
-    """SAJ eSolar Data Update."""
+
+async def _async_dump(region, username, password):
+    """Fetch the data for dump() with a private aiohttp client session."""
+    async with aiohttp.ClientSession() as websession:
+        return await get_esolar_data(websession, region, username, password)
+
+
+async def get_esolar_data(
+    websession,
+    region,
+    username,
+    password,
+    plant_list=None,
+    use_pv_grid_attributes=True,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    static_refresh_interval: int = DEFAULT_STATIC_REFRESH_INTERVAL,
+    counter_refresh_cycles: int = DEFAULT_COUNTER_REFRESH_CYCLES,
+    cycle_budget: float | None = None,
+    keep_raw_data: bool = False,
+):
+    """SAJ eSolar Data Update.
+
+    With a ``cycle_budget`` (seconds) the requests time out when it runs out
+    and the least important stages are shed once it gets tight. The plant
+    and device answers are merged pruned to the keys something reads,
+    unless ``keep_raw_data`` is set. A shared ESolarAccount sizes its pool
+    from the settings of all its entries, so ``max_concurrency`` only applies
+    to a plain client session.
+    """
     if BASIC_TEST:
         return get_esolar_data_static_file("saj_esolar_air_dusnake_2", plant_list)
 
+    _CYCLE_BUDGET.set(CycleBudget(cycle_budget) if cycle_budget else None)
+    _KEEP_RAW.set(keep_raw_data)
+
     last_auth_error: SessionAuthError | None = None
     for attempt in range(2):
         force_login = attempt > 0
         try:
-            return _fetch_esolar_data(
+            plant_info = await _fetch_esolar_data(
+                websession,
                 region,
                 username,
                 password,
                 plant_list,
                 use_pv_grid_attributes,
                 force_login=force_login,
+                max_concurrency=max_concurrency,
+                static_refresh_interval=static_refresh_interval,
+                counter_refresh_cycles=counter_refresh_cycles,
             )
+            connections = _connection_stats(websession)
+            if connections is not None:
+                plant_info["cycle"]["connections"] = connections
+            return plant_info
+        except aiohttp.ClientConnectionError:
+            await _reset_connection_pool(websession, "connection error")
+            raise
+        except RateLimitError as err:
+            raise ValueError(f"API rate limit exceeded. {err}") from err
         except SessionAuthError as err:
             last_auth_error = err
+            await _reset_connection_pool(websession, "session rejected", auth=True)
             if attempt == 0:
                 _LOGGER.warning(
                     "SAJ session rejected for %s, clearing tokens and re-authenticating: %s",
                     username,
                     err,
                 )
-                clear_user_tokens(username, password)
-                _clear_plant_data_cache(username)
+                await async_clear_user_tokens(username, password)
+                _clear_plant_data_cache(username, region)
                 continue
             break
 
@@ -102,14 +1104,158 @@ def get_esolar_data(region, username, password, plant_list=None, use_pv_grid_att
     ) from last_auth_error
 
 
-def _clear_plant_data_cache(username: str) -> None:
+async def get_esolar_live_data(
+    websession,
+    region,
+    username,
+    password,
+    plant_list=None,
+    *,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    cycle_budget: float | None = None,
+    keep_raw_data: bool = False,
+):
+    """Refresh only the live power stages of the cached plant data.
+
+    The full refresh owns authentication retries and plant discovery; this
+    lane only updates what is already there, never while a full refresh is
+    merging into the same plant data.
+    """
+    if BASIC_TEST:
+        return get_esolar_data_static_file("saj_esolar_air_dusnake_2", plant_list)
+
+    cache_key = plant_cache_key(region, username, plant_list)
+    if not WEB_PLANT_DATA.get(cache_key):
+        raise ValueError("No plant data to refresh yet, waiting for the full refresh")
+
+    cycle_requests = [0, 0]
+    _CYCLE_REQUESTS.set(cycle_requests)
+    _CYCLE_BUDGET.set(CycleBudget(cycle_budget) if cycle_budget else None)
+    _KEEP_RAW.set(keep_raw_data)
+    try:
+        session = await esolar_web_autenticate(
+            websession, region, username, password, max_concurrency=max_concurrency
+        )
+        # waits for a full refresh merging into the same plant data
+        async with _plant_data_lock(websession, cache_key):
+            # the full refresh may have replaced the plant data meanwhile
+            cached = WEB_PLANT_DATA.get(cache_key)
+            if not cached:
+                raise ValueError(
+                    "No plant data to refresh yet, waiting for the full refresh"
+                )
+            plant_info = cached["plant_info"]
+            answered = cycle_requests[1]
+            runs = await _gather_all(
+                LIVE_PIPELINE.run(
+                    region,
+                    session,
+                    plant,
+                    cached["schedule"],
+                    plant["plantUid"],
+                    isolate=_is_isolated_failure,
+                    budget=_CYCLE_BUDGET.get(),
+                )
+                for plant in plant_info["plantList"]
+            )
+            _raise_if_nothing_fetched(runs, cycle_requests[1] - answered)
+            _update_stale_data(plant_info, cached["schedule"])
+            plant_info["live_stamp"] = datetime.datetime.now().strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+    except aiohttp.ClientConnectionError:
+        await _reset_connection_pool(websession, "connection error")
+        raise
+    except RateLimitError as err:
+        raise ValueError(f"API rate limit exceeded. {err}") from err
+    except SessionAuthError as err:
+        await _reset_connection_pool(websession, "session rejected", auth=True)
+        raise ValueError(f"SAJ session rejected during live refresh: {err}") from err
+
+    return plant_info
+
+
+def _clear_plant_data_cache(username: str, region: str | None = None) -> None:
     """Drop in-memory plant metadata cached for a user."""
-    global WEB_PLANT_DATA
-    if username in WEB_PLANT_DATA:
-        del WEB_PLANT_DATA[username]
+    dropped = WEB_PLANT_DATA.invalidate(username, region)
+    if dropped:
+        _LOGGER.debug("Dropped %s cached plant data entries of %s", dropped, username)
+
+
+def _plant_idle_reason(plant, now):
+    """Return why a plant is idle ("offline" or "night"), None when it is not."""
+    if plant_is_offline(plant):
+        return "offline"
+    try:
+        elevation = sun_elevation(plant["latitude"], plant["longitude"], now)
+    except (KeyError, TypeError, ValueError):
+        # no usable location, keep polling
+        return None
+    if elevation < NIGHT_SUN_ELEVATION:
+        return "night"
+    return None
+
+
+def _is_isolated_failure(err: BaseException) -> bool:
+    """Return True for stage failures that may leave the last good data in place.
+
+    Auth and rate limit answers concern the whole account and still fail the
+    cycle, so they are handled (re-login, cooldown) where they belong. An
+    IndexError is what a plant answered without devices raises while its
+    queries are prepared.
+    """
+    if isinstance(err, ValueError) and str(err) == CAPTCHA_REQUIRED_MSG:
+        return False
+    return isinstance(
+        err, (aiohttp.ClientError, TimeoutError, ValueError, KeyError, IndexError, TypeError)
+    )
 
 
-def _fetch_esolar_data(
+def _raise_if_nothing_fetched(runs, answered: int) -> None:
+    """Fail the cycle when no request was answered, stale data alone is no refresh."""
+    failures = [err for run in runs for err in run.failed.values()]
+    if failures and not answered:
+        raise failures[0]
+
+
+def _update_stale_data(plant_info, schedule):
+    """Publish which data slices of which plant are left from a failed refresh."""
+    stale = {}
+    for plant in plant_info["plantList"]:
+        slices = schedule.stale(plant["plantUid"])
+        if slices:
+            stale[plant["plantName"]] = slices
+    for name, slices in stale.items():
+        # warn when a slice goes stale, not on every retry after that
+        first = any(info["failures"] == 1 for info in slices.values())
+        _LOGGER.log(
+            logging.WARNING if first else logging.DEBUG,
+            "Keeping the last good data of %s for failed requests: %s",
+            name,
+            ", ".join(
+                f"{stage} ({info['error']}"
+                + (", no data yet)" if info["age"] is None else ")")
+                for stage, info in slices.items()
+            ),
+        )
+    plant_info[STALE_DATA] = stale
+
+
+def _update_idle_plants(plant_info, schedule):
+    """Tell the schedule which plants are idle, based on the last merged data."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    idle = {}
+    for plant in plant_info["plantList"]:
+        reason = _plant_idle_reason(plant, now)
+        storage = plant.get("hasBattery") == 1 or plant.get("type") in (1, 3)
+        schedule.set_idle(plant["plantUid"], reason is not None, storage)
+        if reason is not None:
+            idle[plant["plantName"]] = reason
+    plant_info[IDLE_PLANTS] = idle
+
+
+async def _fetch_esolar_data(
+    websession,
     region,
     username,
     password,
@@ -117,30 +1263,37 @@ def _fetch_esolar_data(
     use_pv_grid_attributes=True,
     *,
     force_login: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+    static_refresh_interval: int = DEFAULT_STATIC_REFRESH_INTERVAL,
+    counter_refresh_cycles: int = DEFAULT_COUNTER_REFRESH_CYCLES,
 ):
     """Fetch SAJ plant data using the current or freshly obtained session."""
-    global WEB_PLANT_DATA
-
-    try:
-        session = esolar_web_autenticate(
-            region, username, password, force_login=force_login
-        )
+    # requests sent, requests answered
+    cycle_requests = [0, 0]
+    _CYCLE_REQUESTS.set(cycle_requests)
+    cycle_metrics = RequestMetrics()
+    _CYCLE_METRICS.set(cycle_metrics)
+    session = await esolar_web_autenticate(
+        websession,
+        region,
+        username,
+        password,
+        force_login=force_login,
+        max_concurrency=max_concurrency,
+    )
+    cache_key = plant_cache_key(region, username, plant_list)
+    # the live lane merges into the same plant data, one of them at a time
+    async with _plant_data_lock(websession, cache_key):
         plant_info = None
-        if (
-            not force_login
-            and WEB_PLANT_DATA is not None
-            and username in WEB_PLANT_DATA
-            and WEB_PLANT_DATA[username] is not None
-            and "plant_list" in WEB_PLANT_DATA[username]
-            and "plant_info" in WEB_PLANT_DATA[username]
-            and WEB_PLANT_DATA[username]["plant_list"] == plant_list
-            and WEB_PLANT_DATA[username]["plant_info"] is not None
-        ):
-            plant_info = WEB_PLANT_DATA[username]["plant_info"]
+        cached = None if force_login else WEB_PLANT_DATA.get(cache_key)
+        if cached:
+            plant_info = cached["plant_info"]
+            schedule = cached["schedule"]
+            schedule.configure(static_refresh_interval * 60, counter_refresh_cycles)
 
         if plant_info is None:
             _LOGGER.debug("We don't have all plant_info, requesting")
-            plant_info = web_get_plant(region, session, plant_list)
+            plant_info = await web_get_plant(region, session, plant_list)
             unavailable = plant_info.get(UNAVAILABLE_PLANTS) or []
             if unavailable:
                 _LOGGER.warning(
@@ -153,9 +1306,16 @@ def _fetch_esolar_data(
                     "No accessible plants configured: "
                     + ", ".join(unavailable or plant_list or [])
                 )
-            WEB_PLANT_DATA = {
-                username: {"plant_list": plant_list, "plant_info": plant_info}
-            }
+            # a fresh plant list has no merged data yet, so every stage is due
+            schedule = RefreshSchedule(static_refresh_interval * 60, counter_refresh_cycles)
+            WEB_PLANT_DATA.put(
+                cache_key,
+                {
+                    "plant_list": plant_list,
+                    "plant_info": plant_info,
+                    "schedule": schedule,
+                },
+            )
         else:
             _LOGGER.debug(
                 "We have plant data for %s/%s, using cached data",
@@ -163,56 +1323,60 @@ def _fetch_esolar_data(
                 plant_list,
             )
 
-        web_get_plant_details(region, session, plant_info)
-        web_get_device_list(region, session, plant_info)
-        web_get_sec_statistics(region, session, plant_info)
-        web_get_plant_statistics(region, session, plant_info)
-        web_get_plant_overview(region, session, plant_info)
-        web_get_device_info(region, session, plant_info)
-        web_get_plant_flow_data(region, session, plant_info)
-        web_get_device_raw_data(region, session, plant_info)
-        web_get_alarm_list(region, session, plant_info, 1)
-        web_get_alarm_list(region, session, plant_info, 3)
-
-        for plant in plant_info["plantList"]:
-            try:
-                if "hasBattery" in plant and plant["hasBattery"] == 1:
-                    break
-                for device in plant["devices"]:
-                    stats = device.get("deviceStatisticsData") or {}
-                    bat_pct = stats.get("batEnergyPercent")
-                    device_bat_pct = device.get("batEnergyPercent")
-                    if (
-                        ("hasBattery" in device and device["hasBattery"] == 1)
-                        or (bat_pct is not None and float(bat_pct) > 0)
-                        or (
-                            device_bat_pct is not None
-                            and int(device_bat_pct) > 0
-                        )
-                    ):
-                        device["hasBattery"] = 1
-                        plant["hasBattery"] = 1
-                        break
-            except Exception as e:
-                _LOGGER.error("We don't have a battery for %s: %s", username, e)
-        web_get_batteries_data(region, session, plant_info)
-        web_get_device_battery_data(region, session, plant_info)
+        _update_idle_plants(plant_info, schedule)
+
+        # plants are independent of each other, so the refresh time follows the slowest plant
+        schedule.start_cycle()
+        answered = cycle_requests[1]
+        runs = await _gather_all(
+            PLANT_PIPELINE.run(
+                region,
+                session,
+                plant,
+                schedule,
+                plant["plantUid"],
+                isolate=_is_isolated_failure,
+                budget=_CYCLE_BUDGET.get(),
+            )
+            for plant in plant_info["plantList"]
+        )
+        _raise_if_nothing_fetched(runs, cycle_requests[1] - answered)
+        _update_stale_data(plant_info, schedule)
+        slowest = max(range(len(runs)), key=lambda i: runs[i].duration)
+        plant_info["cycle"] = {
+            "plant": plant_info["plantList"][slowest].get("plantName"),
+            **runs[slowest].as_dict(),
+            "requests": cycle_requests[0],
+            "failed_requests": sum(len(run.failed) for run in runs),
+            # what every endpoint took, including the auth requests of the cycle
+            "endpoints": cycle_metrics.stats(),
+            # stages left for a later cycle because the budget ran short
+            "shed": {
+                plant["plantName"]: run.shed
+                for plant, run in zip(plant_info["plantList"], runs)
+                if run.shed
+            },
+            # stages left out because a stage they require failed without data
+            "missing": {
+                plant["plantName"]: run.missing
+                for plant, run in zip(plant_info["plantList"], runs)
+                if run.missing
+            },
+        }
+        _LOGGER.debug(
+            "Cycle for %s took %s ms with %s requests, critical path: %s, skipped: %s, shed: %s",
+            username,
+            plant_info["cycle"]["duration_ms"],
+            plant_info["cycle"]["requests"],
+            " -> ".join(plant_info["cycle"]["critical_path"]),
+            ", ".join(plant_info["cycle"]["skipped"]),
+            plant_info["cycle"]["shed"],
+        )
 
         plant_info["status"] = "success"
         plant_info["stamp"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-    except ValueError as errv:
-        raise ValueError(errv) from errv
-
-    return plant_info
+        return plant_info
 
 
 def _login_sign_data():
@@ -303,7 +1467,7 @@ def _parse_api_data(
     return data
 
 
-def _session_from_token_answer(session, username, password, answer):
+async def _session_from_token_answer(session, username, password, answer):
     """Store token data from a login/refresh response and return the session."""
     data = answer.get("data") or {}
     if "token" not in data or "expiresIn" not in data:
@@ -316,8 +1480,11 @@ def _session_from_token_answer(session, username, password, answer):
     authorization_token = token_head + data["token"]
     refresh_token = data.get("refreshToken")
 
-    store_user_data(username, password, authorization_token, expires_at, refresh_token)
+    await _async_store_user_tokens(
+        username, password, authorization_token, expires_at, refresh_token
+    )
     session.headers.update({"Authorization": authorization_token})
+    session.expires = expires_at
     _LOGGER.debug(
         "Using token, expires in %s seconds (refresh token: %s)",
         int(expires_at - time.time()),
@@ -339,7 +1506,7 @@ def _raise_login_error(answer):
     raise ValueError(f"Error message in answer: {err_msg}")
 
 
-def _captcha_required(region, session, username):
+async def _captcha_required(region, session, username):
     """Return True when SAJ requires captcha before password login."""
     try:
         signed = calc_signature(_login_sign_data())
@@ -348,16 +1515,10 @@ def _captcha_required(region, session, username):
             "roleType": 1,
             "loginName": username,
         }
-        response = session.post(
+        answer = await session.post(
             base_url(region) + "/sys/common/ali/getCaptchaInfo",
             data=post_data,
-            timeout=WEB_TIMEOUT,
         )
-        if response.status_code != 200:
-            _LOGGER.debug("Captcha check unavailable, status %s", response.status_code)
-            return False
-
-        answer = response.json()
         if answer.get("errCode") != 0:
             _LOGGER.debug("Captcha check returned: %s", answer.get("errMsg"))
             return False
@@ -369,7 +1530,7 @@ def _captcha_required(region, session, username):
         return False
 
 
-def _refresh_access_token(region, session, username, password, refresh_token):
+async def _refresh_access_token(region, session, username, password, refresh_token):
     """Refresh the bearer token using a stored refresh token."""
     data = {
         "refreshToken": refresh_token,
@@ -380,24 +1541,21 @@ def _refresh_access_token(region, session, username, password, refresh_token):
         "random": generatkey(32),
     }
     signed = calc_signature(data)
-    response = session.post(
+    answer = await session.post(
         base_url(region) + "/sys/refreshToken",
         data=signed,
-        timeout=WEB_TIMEOUT,
     )
-    response.raise_for_status()
-    answer = response.json()
 
     if answer.get("errCode") != 0:
         _raise_login_error(answer)
 
     _LOGGER.debug("Refreshed SAJ access token for %s", username)
-    return _session_from_token_answer(session, username, password, answer)
+    return await _session_from_token_answer(session, username, password, answer)
 
 
-def _perform_login(region, session, username, password):
+async def _perform_login(region, session, username, password):
     """Perform a full SAJ v1 password login."""
-    if _captcha_required(region, session, username):
+    if await _captcha_required(region, session, username):
         raise ValueError(CAPTCHA_REQUIRED_MSG)
 
     signed = calc_signature(_login_sign_data())
@@ -407,76 +1565,214 @@ def _perform_login(region, session, username, password):
         "rememberMe": "false",
         "loginType": 1,
     }
-    response = session.post(
+    answer = await session.post(
         base_url(region) + "/sys/login",
         data=signed | login_data,
-        timeout=WEB_TIMEOUT,
     )
-    response.raise_for_status()
-    answer = response.json()
 
     if answer.get("errCode") != 0:
         _LOGGER.error("Login failed: %s", answer.get("errMsg"))
-        clear_user_tokens(username, password)
+        await async_clear_user_tokens(username, password)
         _raise_login_error(answer)
 
     _LOGGER.debug("Performed SAJ password login for %s", username)
-    return _session_from_token_answer(session, username, password, answer)
+    return await _session_from_token_answer(session, username, password, answer)
 
 
-def esolar_web_autenticate(region, username, password, force_login=False):
+async def esolar_web_autenticate(
+    websession,
+    region,
+    username,
+    password,
+    force_login=False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+):
     """Authenticate the user to the SAJ's WEB Portal."""
     if BASIC_TEST:
         return True
 
-    try:
-        session = requests.Session()
-        stored_data = read_user_data(username, password)
+    if isinstance(websession, ESolarAccount):
+        return await websession.authenticate(region, username, password, force_login)
+    return await _authenticate(
+        ESolarSession(websession, max_concurrency), region, username, password, force_login
+    )
 
-        if (
-            not force_login
-            and "error" not in stored_data
-            and stored_data.get("token")
-        ):
-            authorization_expires = int(stored_data["expires"])
-            dt = datetime.datetime.fromtimestamp(authorization_expires).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-            _LOGGER.debug("Using disk cached token, expires at %s", dt)
-            session.headers.update({"Authorization": stored_data["token"]})
-            return session
 
-        refresh_token = stored_data.get("refresh_token")
-        if (
-            not force_login
-            and "error" not in stored_data
-            and refresh_token
-        ):
-            _LOGGER.debug(
-                "Access token expired, trying refresh token for %s", username
+async def _authenticate(
+    session, region, username, password, force_login=False, *, renew=False
+):
+    """Put a valid token on the session, from disk, a refresh or a login.
+
+    ``renew`` skips a still valid stored token and refreshes it right away.
+    """
+    stored_data = await _async_read_user_tokens(username, password)
+
+    if (
+        not force_login
+        and not renew
+        and "error" not in stored_data
+        and stored_data.get("token")
+    ):
+        authorization_expires = int(stored_data["expires"])
+        dt = datetime.datetime.fromtimestamp(authorization_expires).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        _LOGGER.debug("Using disk cached token, expires at %s", dt)
+        session.headers.update({"Authorization": stored_data["token"]})
+        session.expires = authorization_expires
+        return session
+
+    refresh_token = stored_data.get("refresh_token")
+    if (
+        not force_login
+        and "error" not in stored_data
+        and refresh_token
+    ):
+        _LOGGER.debug(
+            "Access token expired, trying refresh token for %s", username
+        )
+        try:
+            return await _refresh_access_token(
+                region, session, username, password, refresh_token
             )
-            try:
-                return _refresh_access_token(
-                    region, session, username, password, refresh_token
-                )
-            except (ValueError, requests.exceptions.RequestException) as err:
-                _LOGGER.warning("Token refresh failed for %s: %s", username, err)
-                clear_user_tokens(username, password)
+        except (ValueError, aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.warning("Token refresh failed for %s: %s", username, err)
+            await async_clear_user_tokens(username, password)
+
+    if force_login:
+        _LOGGER.debug("Forced re-login for %s", username)
+    else:
+        _LOGGER.debug("No valid token for %s, performing password login", username)
+    return await _perform_login(region, session, username, password)
+
+class TokenStore:
+    """Tokens of every account, kept in memory.
+
+    Reads never touch the disk. Every change calls ``on_change``, so the
+    owner can schedule one coalesced save of ``data`` for a burst of changes.
+    """
+
+    def __init__(self, data: dict | None = None, on_change=None) -> None:
+        """Initialize the store with previously saved records."""
+        self.data: dict[str, dict] = dict(data or {})
+        self.on_change = on_change
+
+    def read(self, username: str, password: str) -> dict:
+        """Return the tokens of a user, like read_user_data."""
+        return _lookup_user_tokens(self.data, username, password)
+
+    def store(
+        self,
+        username: str,
+        password: str,
+        token: str | None,
+        expires: int | None,
+        refresh_token: str | None = None,
+    ) -> None:
+        """Replace the record of a user, leaving the other accounts alone."""
+        self.data[username] = _user_token_record(password, token, expires, refresh_token)
+        if self.on_change is not None:
+            self.on_change()
+
+    def clear(self, username: str, password: str) -> None:
+        """Remove the tokens of a user."""
+        self.store(username, password, None, None, None)
+
+
+def set_token_store(token_store: TokenStore | None) -> None:
+    """Keep tokens in the given store instead of user_data.json."""
+    global TOKEN_STORE
+    TOKEN_STORE = token_store
+
+
+async def _async_read_user_tokens(username: str, password: str) -> dict:
+    """Return the stored tokens of a user."""
+    if TOKEN_STORE is not None:
+        return TOKEN_STORE.read(username, password)
+    return await _async_run_blocking(read_user_data, username, password)
+
+
+async def _async_store_user_tokens(
+    username: str, password: str, token, expires, refresh_token=None
+) -> None:
+    """Store the tokens of a user."""
+    if TOKEN_STORE is not None:
+        TOKEN_STORE.store(username, password, token, expires, refresh_token)
+        return
+    await _async_run_blocking(
+        store_user_data, username, password, token, expires, refresh_token
+    )
+
+
+async def async_clear_user_tokens(username: str, password: str) -> None:
+    """Remove the stored tokens of a user."""
+    if TOKEN_STORE is not None:
+        TOKEN_STORE.clear(username, password)
+        return
+    await _async_run_blocking(clear_user_tokens, username, password)
+
+
+def _user_token_record(password, token, expires, refresh_token=None) -> dict:
+    """Return the stored record of a user's tokens, with the password hashed."""
+    return {
+        "password_hash": hashlib.sha256(password.encode()).hexdigest(),
+        "token": token,
+        "expires": expires,
+        "expires_hrs": (
+            datetime.datetime.fromtimestamp(expires).strftime("%Y-%m-%d %H:%M:%S")
+            if expires
+            else None
+        ),
+        "refresh_token": refresh_token,
+        "last_update": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _lookup_user_tokens(user_data: dict, username: str, password: str) -> dict:
+    """Return the usable tokens of a user from the stored records."""
+    # Ellenőrizzük, hogy a username létezik-e
+    if username not in user_data:
+        return {"error": "Érvénytelen felhasználónév."}
+
+    stored_password_hash = user_data[username]["password_hash"]
+    token = user_data[username]["token"]
+    expires = user_data[username]["expires"]
+    refresh_token = user_data[username]["refresh_token"] if "refresh_token" in user_data[username] else None
+
+    # Jelszó ellenőrzése
+    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    if password_hash != stored_password_hash:
+        return {"error": "Helytelen jelszó."}
+
+    current_time = int(time.time())
+    if token and expires and expires > current_time:
+        return {"token": token, "expires": expires, "refresh_token": refresh_token}
+
+    if refresh_token:
+        return {"refresh_token": refresh_token}
+
+    return {"error": "A token lejárt."}
+
+
+def read_legacy_user_data(filename="user_data.json") -> dict | None:
+    """Return every record of the legacy token file, None if there is none."""
+    file_path = os.path.join(os.path.dirname(__file__), filename)
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "r", encoding="utf-8") as file:
+        try:
+            user_data = json.load(file)
+        except json.JSONDecodeError:
+            return None
+    return user_data if isinstance(user_data, dict) else None
+
+
+def remove_legacy_user_data(filename="user_data.json") -> None:
+    """Delete the legacy token file once its records have been migrated."""
+    file_path = os.path.join(os.path.dirname(__file__), filename)
+    if os.path.exists(file_path):
+        os.remove(file_path)
 
-        if force_login:
-            _LOGGER.debug("Forced re-login for %s", username)
-        else:
-            _LOGGER.debug("No valid token for %s, performing password login", username)
-        return _perform_login(region, session, username, password)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
 
 def clear_user_tokens(username: str, password: str, filename="user_data.json"):
     """Remove cached SAJ tokens for a user."""
@@ -487,9 +1783,6 @@ def store_user_data(username: str, password: str, token: str|None, expires: int|
     """Felhasználói adatokat tárol és frissít egy JSON fájlban, jelszó hash-eléssel."""
     file_path = os.path.join(os.path.dirname(__file__), filename)
 
-    # Jelszó hash-elése
-    password_hash = hashlib.sha256(password.encode()).hexdigest()
-
     # Betöltjük az aktuális adatokat, ha a fájl létezik
     if os.path.exists(file_path):
         with open(file_path, "r", encoding="utf-8") as file:
@@ -501,18 +1794,7 @@ def store_user_data(username: str, password: str, token: str|None, expires: int|
         user_data = {}
 
     # Frissítés vagy új bejegyzés létrehozása
-    user_data[username] = {
-        "password_hash": password_hash,
-        "token": token,
-        "expires": expires,
-        "expires_hrs": (
-            datetime.datetime.fromtimestamp(expires).strftime("%Y-%m-%d %H:%M:%S")
-            if expires
-            else None
-        ),
-        "refresh_token": refresh_token,
-        "last_update": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-    }
+    user_data[username] = _user_token_record(password, token, expires, refresh_token)
 
     # Adatok mentése
     with open(file_path, "w", encoding="utf-8") as file:
@@ -533,30 +1815,9 @@ def read_user_data(username: str, password: str, filename="user_data.json"):
         except json.JSONDecodeError:
             return {"error": "Hibás JSON fájl."}
 
-    # Ellenőrizzük, hogy a username létezik-e
-    if username not in user_data:
-        return {"error": "Érvénytelen felhasználónév."}
-
-    stored_password_hash = user_data[username]["password_hash"]
-    token = user_data[username]["token"]
-    expires = user_data[username]["expires"]
-    refresh_token = user_data[username]["refresh_token"] if "refresh_token" in user_data[username] else None
-
-    # Jelszó ellenőrzése
-    password_hash = hashlib.sha256(password.encode()).hexdigest()
-    if password_hash != stored_password_hash:
-        return {"error": "Helytelen jelszó."}
-
-    current_time = int(time.time())
-    if token and expires and expires > current_time:
-        return {"token": token, "expires": expires, "refresh_token": refresh_token}
-
-    if refresh_token:
-        return {"refresh_token": refresh_token}
-
-    return {"error": "A token lejárt."}
+    return _lookup_user_tokens(user_data, username, password)
 
-def web_get_plant(region, session, requested_plant_list=None):
+async def web_get_plant(region, session, requested_plant_list=None):
     """Retrieve the plantUid from WEB Portal using web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain plants")
@@ -564,845 +1825,949 @@ def web_get_plant(region, session, requested_plant_list=None):
     if BASIC_TEST:
         return web_get_plant_static_h1_r5()
 
-    try:
-        output_plant_list = []
-        data = {
-            "pageNo": 1,
-            "pageSize": 500,
-            'appProjectName': 'elekeeper',
-            'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-            'lang': 'en',
-            'timeStamp': int(time.time() * 1000),
-            'random': generatkey(32),
-            'clientId': 'esolar-monitor-admin',
-        }
-
-        signed = calc_signature(data)
-
-        response = session.get(
-            base_url(region) + "/monitor/plant/getEndUserPlantList",
-            params=signed,
-            timeout=WEB_TIMEOUT,
-        )
+    plants = await session.calls.run(
+        "plant_list",
+        functools.partial(_fetch_plant_list, region, session),
+        ttl=PLANT_LIST_TTL,
+    )
 
-        response.raise_for_status()
+    if requested_plant_list is not None:
+        output_plant_list = []
+        found_names: list[str] = []
+        for plant in plants:
+            if plant["plantName"] in requested_plant_list:
+                # entries sharing the list must not share the merged plant data
+                output_plant_list.append(dict(plant))
+                found_names.append(plant["plantName"])
+        missing = [name for name in requested_plant_list if name not in found_names]
+        result = {"plantList": output_plant_list}
+        if missing:
+            result[UNAVAILABLE_PLANTS] = missing
+        return result
+
+    return {"plantList": [dict(plant) for plant in plants]}
+
+
+async def _fetch_plant_list(region, session):
+    """Retrieve every plant of the account."""
+    data = {
+        "pageNo": 1,
+        "pageSize": 500,
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-        if response.status_code != 200:
-            raise ValueError(f"Get plant error: {response.status_code}")
+    signed = calc_signature(data)
 
-        plant_list = response.json()
-        list_data = _parse_api_data(
-            plant_list,
-            "getEndUserPlantList",
-            auth_critical=True,
+    plant_list = await session.get(
+        base_url(region) + "/monitor/plant/getEndUserPlantList",
+        params=signed,
+    )
+    list_data = _parse_api_data(
+        plant_list,
+        "getEndUserPlantList",
+        auth_critical=True,
+    )
+    if not isinstance(list_data, dict) or "list" not in list_data:
+        raise ValueError(
+            "Unexpected plant list response from SAJ API: missing list data"
         )
-        if not isinstance(list_data, dict) or "list" not in list_data:
-            raise ValueError(
-                "Unexpected plant list response from SAJ API: missing list data"
-            )
+    return list_data["list"]
 
-        if requested_plant_list is not None:
-            found_names: list[str] = []
-            for plant in list_data["list"]:
-                if plant["plantName"] in requested_plant_list:
-                    output_plant_list.append(plant)
-                    found_names.append(plant["plantName"])
-            missing = [name for name in requested_plant_list if name not in found_names]
-            result = {"plantList": output_plant_list}
-            if missing:
-                result[UNAVAILABLE_PLANTS] = missing
-            return result
-
-        return {"plantList": list_data["list"]}
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_plant_details(region, session, plant_info):
+async def web_get_plant_details(region, session, plant_info):
     """Retrieve plantUid from the WEB Portal using web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    try:
-        for plant in plant_info["plantList"]:
-            data = {
-                "plantUid": plant["plantUid"],
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/plant/getOnePlantInfo", #/monitor/site/getPlantDetailInfo
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
+    await _run_plant_stage("details", region, session, plant_info)
 
-            response.raise_for_status()
+async def _fetch_plant_details(region, session, plant):
+    """Retrieve the details of one plant."""
+    data = {
+        "plantUid": plant["plantUid"],
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            if response.status_code != 200:
-                raise ValueError(f"Get plant detail error: {response.status_code}")
+    signed = calc_signature(data)
 
-            plant_detail = response.json()
-            detail_data = _parse_api_data(
-                plant_detail,
-                f"getOnePlantInfo for {plant.get('plantName')}",
-                required=False,
-            )
-            if detail_data is None:
-                continue
-            plant.update(detail_data)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_plant_statistics(region, session, plant_info):
+    plant_detail = await session.get(
+        base_url(region) + "/monitor/plant/getOnePlantInfo", #/monitor/site/getPlantDetailInfo
+        params=signed,
+    )
+    return _parse_api_data(
+        plant_detail,
+        f"getOnePlantInfo for {plant.get('plantName')}",
+        required=False,
+    )
+
+async def web_get_plant_statistics(region, session, plant_info):
     """Retrieve platUid from the WEB Portal using web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain plants")
 
-    try:
-         for plant in plant_info["plantList"]:
-            if plant.get("type") == 2:
-                 continue
-
-            data = {
-                "plantUid": plant["plantUid"],
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/home/getPlantStatisticsData",
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
+    await _run_plant_stage("statistics", region, session, plant_info)
 
-            response.raise_for_status()
+async def _fetch_plant_statistics(region, session, plant):
+    """Retrieve the statistics of one plant."""
+    if plant.get("type") == 2:
+        return None
 
-            if response.status_code != 200:
-                raise ValueError(f"Get plant statistics data error: {response.status_code}")
+    data = {
+        "plantUid": plant["plantUid"],
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            plant_statistics = response.json()
-            stats_data = _parse_api_data(
-                plant_statistics,
-                f"getPlantStatisticsData for {plant.get('plantName')}",
-                required=False,
-            )
-            if stats_data is None:
-                continue
-            if "deviceSnList" in stats_data:
-                del stats_data["deviceSnList"]
-            if "moduleSnList" in stats_data:
-                del stats_data["moduleSnList"]
-            plant.update(stats_data)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_device_list(region, session, plant_info):
+    prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
+
+    signed = calc_signature(data)
+
+    plant_statistics = await session.get(
+        base_url(region) + "/monitor/home/getPlantStatisticsData",
+        params=signed,
+    )
+    stats_data = _parse_api_data(
+        plant_statistics,
+        f"getPlantStatisticsData for {plant.get('plantName')}",
+        required=False,
+    )
+    if stats_data is None:
+        return None
+    if "deviceSnList" in stats_data:
+        del stats_data["deviceSnList"]
+    if "moduleSnList" in stats_data:
+        del stats_data["moduleSnList"]
+    return stats_data
+
+async def web_get_device_list(region, session, plant_info):
     """Retrieve a device list from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    try:
-        for plant in plant_info["plantList"]:
-            data = {
-                "plantUid": plant["plantUid"],
-                "pageSize": 100,
-                "pageNo": 1,
-                "searchOfficeIdArr":"1",
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/device/getDeviceList",
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
+    await _run_plant_stage("device_list", region, session, plant_info)
 
-            response.raise_for_status()
+async def _fetch_device_list(region, session, plant):
+    """Retrieve the device list of one plant."""
+    data = {
+        "plantUid": plant["plantUid"],
+        "pageSize": 100,
+        "pageNo": 1,
+        "searchOfficeIdArr":"1",
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            if response.status_code != 200:
-                raise ValueError(f"Get device {plant['plantName']} deviceList error: {response.status_code}")
+    signed = calc_signature(data)
 
-            answer = response.json()
-            answer_data = _parse_api_data(
-                answer,
-                f"getDeviceList for {plant.get('plantName')}",
-                required=False,
-            )
-            if not answer_data or "list" not in answer_data:
-                continue
+    answer = await session.get(
+        base_url(region) + "/monitor/device/getDeviceList",
+        params=signed,
+    )
+    answer_data = _parse_api_data(
+        answer,
+        f"getDeviceList for {plant.get('plantName')}",
+        required=False,
+    )
+    if not answer_data or "list" not in answer_data:
+        return None
 
-            device_list = answer_data["list"]
+    return answer_data["list"]
 
-            if "deviceSnList" not in plant:
-                plant["deviceSnList"] = []
+def _merge_device_list(plant, device_list):
+    """Replace the devices of a plant with a freshly fetched device list."""
+    # keep what the per-device endpoints merged in, they may not run this cycle
+    previous = {device.get("deviceSn"): device for device in plant.get("devices") or []}
+    for device in device_list:
+        for key, value in previous.get(device.get("deviceSn"), {}).items():
+            device.setdefault(key, value)
 
-            for device in device_list:
-                if "deviceSn" in device and device["deviceSn"] not in plant["deviceSnList"]:
-                    plant["deviceSnList"].append(device["deviceSn"])
+    if "deviceSnList" not in plant:
+        plant["deviceSnList"] = []
 
-            plant.update({"devices": device_list})
+    for device in device_list:
+        if "deviceSn" in device and device["deviceSn"] not in plant["deviceSnList"]:
+            plant["deviceSnList"].append(device["deviceSn"])
 
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+    plant.update({"devices": device_list})
 
-def web_get_device_info(region, session, plant_info):
+async def web_get_device_info(region, session, plant_info):
     """Retrieve device info from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    try:
-        for plant in plant_info["plantList"]:
-            for device in plant["devices"]:
-                data = {
-                    "deviceSn": device["deviceSn"],
-                    'appProjectName': 'elekeeper',
-                    'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                    'lang': 'en',
-                    'timeStamp': int(time.time() * 1000),
-                    'random': generatkey(32),
-                    'clientId': 'esolar-monitor-admin',
-                }
+    await _run_plant_stage("device_info", region, session, plant_info)
 
-                signed = calc_signature(data)
+async def _fetch_device_info(region, session, plant):
+    """Retrieve device info for every device of one plant."""
+    devices = list(plant["devices"])
+    answers = await _gather_all(
+        _fetch_one_device_info(region, session, device) for device in devices
+    )
+    return list(zip(devices, answers))
 
-                response = session.get(
-                    base_url(region) + "/monitor/device/getOneDeviceInfo",
-                    params = signed,
-                    timeout=WEB_TIMEOUT
-                )
+async def _fetch_one_device_info(region, session, device):
+    """Retrieve the info of one device."""
+    data = {
+        "deviceSn": device["deviceSn"],
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-                response.raise_for_status()
+    signed = calc_signature(data)
 
-                if response.status_code != 200:
-                    raise ValueError(f"Get device {device['deviceSn']} detail error: {response.status_code}")
+    device_detail = await session.get(
+        base_url(region) + "/monitor/device/getOneDeviceInfo",
+        params=signed,
+    )
+    return _parse_api_data(
+        device_detail,
+        f"getOneDeviceInfo for {device.get('deviceSn')}",
+        required=False,
+    )
 
-                device_detail = response.json()
-                detail_data = _parse_api_data(
-                    device_detail,
-                    f"getOneDeviceInfo for {device.get('deviceSn')}",
-                    required=False,
+def _merge_device_answers(plant, answers):
+    """Merge per-device answers into their devices."""
+    for device, device_data in answers:
+        if device_data is not None:
+            device.update(device_data)
+
+def _prune(answer, keys):
+    """Return an answer without the keys nothing reads, whole while raw data is kept."""
+    if _KEEP_RAW.get() or not isinstance(answer, dict):
+        return answer
+    return {key: value for key, value in answer.items() if key in keys}
+
+def _merge_device_info(plant, answers):
+    """Merge the device info answers into their devices, pruned."""
+    for device, device_data in answers:
+        if device_data is not None:
+            device_data = _prune(device_data, _DEVICE_ANSWER_KEYS)
+            if "deviceStatisticsData" in device_data:
+                device_data["deviceStatisticsData"] = _prune(
+                    device_data["deviceStatisticsData"], _STATISTICS_ANSWER_KEYS
                 )
-                if detail_data is None:
-                    continue
-                device.update(detail_data)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_device_raw_data(region, session, plant_info):
+            device.update(device_data)
+
+async def web_get_device_raw_data(region, session, plant_info):
     """Retrieve platUid from the WEB Portal using web_authenticate."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain plants raw data")
 
-    try:
-        for plant in plant_info["plantList"]:
-            for device in plant["devices"]:
-                if device.get("type", 0) != 0:
-                    continue
-
-                data = {
-                    'appProjectName': 'elekeeper',
-                    'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                    'lang': 'en',
-                    'timeStamp': int(time.time() * 1000),
-                    'random': generatkey(32),
-                    'clientId': 'esolar-monitor-admin',
-                }
-                now = datetime.datetime.now()
-                plus_one_hour_end = now.replace(minute=59, second=59) + datetime.timedelta(hours=1)
-                yesterday = plus_one_hour_end - datetime.timedelta(days=1)
-                payload = {
-                    "deviceSn": device["deviceSn"],
-                    "pageSize": 10,
-                    "pageNo": 1,
-                    "deviceType": 0,
-                    'timeStr': yesterday.strftime("%Y-%m-%d %H:%M:%S"),
-                    "startTime": yesterday.strftime("%Y-%m-%d %H:%M:%S"),
-                    "endTime": plus_one_hour_end.strftime("%Y-%m-%d %H:%M:%S"),
-                }
+    await _run_plant_stage("raw_data", region, session, plant_info)
 
-                signed = calc_signature(data)
+async def _fetch_device_raw_data(region, session, plant):
+    """Retrieve the latest raw data for every inverter of one plant."""
+    devices = [device for device in plant["devices"] if device.get("type", 0) == 0]
+    answers = await _gather_all(
+        _fetch_one_device_raw_data(region, session, device) for device in devices
+    )
+    return list(zip(devices, answers))
 
-                response = session.post(
-                    base_url(region) + "/monitor/deviceData/findRawdataPageList",
-                    data = payload | signed,
-                    timeout=WEB_TIMEOUT
-                )
+async def _fetch_one_device_raw_data(region, session, device):
+    """Retrieve the latest raw data of one inverter."""
+    if not _capability_allowed(session, "findRawdataPageList", device["deviceSn"]):
+        return None
 
-                response.raise_for_status()
+    data = {
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
+    now = datetime.datetime.now()
+    plus_one_hour_end = now.replace(minute=59, second=59) + datetime.timedelta(hours=1)
+    yesterday = plus_one_hour_end - datetime.timedelta(days=1)
+    payload = {
+        "deviceSn": device["deviceSn"],
+        "pageSize": 10,
+        "pageNo": 1,
+        "deviceType": 0,
+        'timeStr': yesterday.strftime("%Y-%m-%d %H:%M:%S"),
+        "startTime": yesterday.strftime("%Y-%m-%d %H:%M:%S"),
+        "endTime": plus_one_hour_end.strftime("%Y-%m-%d %H:%M:%S"),
+    }
 
-                if response.status_code != 200:
-                    raise ValueError(f"Get device {device['deviceSn']} raw data error: {response.status_code}")
+    signed = calc_signature(data)
 
-                raw = response.json()
-                raw_data_payload = _parse_api_data(
-                    raw,
-                    f"findRawdataPageList for {device.get('deviceSn')}",
-                    required=False,
-                )
-                if (
-                    not isinstance(raw_data_payload, dict)
-                    or "list" not in raw_data_payload
-                    or len(raw_data_payload["list"]) == 0
-                ):
-                    continue
-
-                raw_data = raw_data_payload["list"][0]
-                add_data = {}
-                keys = ["deviceTemp", "deviceTempStr", "backupTotalLoadPowerWatt", "isShowModuleSignal", "moduleSignal", "pVP", "pac"]
-                for key in keys:
-                    if key in raw_data:
-                        add_data[key] = raw_data[key]
-                    else:
-                        add_data[key] = 0
-
-                if "datetime" in raw_data:
-                    add_data['raw_datetime'] = raw_data["datetime"]
-                else:
-                    add_data['raw_datetime'] = ''
-                device.update(add_data)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_plant_overview(region, session, plant_info):
+    raw = await session.post(
+        base_url(region) + "/monitor/deviceData/findRawdataPageList",
+        data=payload | signed,
+    )
+    raw_data_payload = _parse_api_data(
+        raw,
+        f"findRawdataPageList for {device.get('deviceSn')}",
+        required=False,
+    )
+    if (
+        not isinstance(raw_data_payload, dict)
+        or "list" not in raw_data_payload
+        or len(raw_data_payload["list"]) == 0
+    ):
+        return _record_capability(session, "findRawdataPageList", device["deviceSn"], None)
+    _record_capability(session, "findRawdataPageList", device["deviceSn"], raw_data_payload)
+
+    raw_data = raw_data_payload["list"][0]
+    add_data = {}
+    keys = ["deviceTemp", "deviceTempStr", "backupTotalLoadPowerWatt", "isShowModuleSignal", "moduleSignal", "pVP", "pac"]
+    for key in keys:
+        if key in raw_data:
+            add_data[key] = raw_data[key]
+        else:
+            add_data[key] = 0
+
+    if "datetime" in raw_data:
+        add_data['raw_datetime'] = raw_data["datetime"]
+    else:
+        add_data['raw_datetime'] = ''
+    return add_data
+
+async def web_get_plant_overview(region, session, plant_info):
     """Retrieve plant overview from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obain plants")
 
-    try:
-        current_timestamp_sec = time.time()
+    await _run_plant_stage("overview", region, session, plant_info)
+
+async def _fetch_plant_overview(region, session, plant):
+    """Retrieve the grid overview of one plant."""
+    if plant.get("type") == 0 and (plant.get("isInstallEms") == 1 or plant.get("isInstallLoraMeter") == 1):
+        return None
 
-        one_month_later = datetime.datetime.fromtimestamp(current_timestamp_sec) + relativedelta(months=1)
-        timestamp_one_month_later_ms = int(one_month_later.timestamp() * 1000)
+    current_timestamp_sec = time.time()
 
-        for plant in plant_info["plantList"]:
-            if plant.get("type") == 0 and (plant.get("isInstallEms") == 1 or plant.get("isInstallLoraMeter") == 1):
-                continue
+    one_month_later = datetime.datetime.fromtimestamp(current_timestamp_sec) + relativedelta(months=1)
+    timestamp_one_month_later_ms = int(one_month_later.timestamp() * 1000)
 
-            data = {
-                "plantUid": plant["plantUid"],
-                "refresh": timestamp_one_month_later_ms,
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/home/getPlantGridOverviewInfo",
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
+    data = {
+        "plantUid": plant["plantUid"],
+        "refresh": timestamp_one_month_later_ms,
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            response.raise_for_status()
+    prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
 
-            if response.status_code != 200:
-                raise ValueError(f"Get plant {plant["plantName"]} overview data error: {response.status_code}")
+    signed = calc_signature(data)
 
-            overview = response.json()
-            overview_data = _parse_api_data(
-                overview,
-                f"getPlantGridOverviewInfo for {plant.get('plantName')}",
-                required=False,
-            )
-            if overview_data is not None:
-                plant.update(overview_data)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_plant_flow_data(region, session, plant_info):
+    overview = await session.get(
+        base_url(region) + "/monitor/home/getPlantGridOverviewInfo",
+        params=signed,
+    )
+    return _parse_api_data(
+        overview,
+        f"getPlantGridOverviewInfo for {plant.get('plantName')}",
+        required=False,
+    )
+
+async def web_get_plant_flow_data(region, session, plant_info):
     """Retrieve plant flow data from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain plants")
 
-    try:
-        for plant in plant_info["plantList"]:
-            data = {
-                "plantUid": plant["plantUid"],
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/home/getDeviceEneryFlowData",  #typo from SAJ
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
+    await _run_plant_stage("flow", region, session, plant_info)
 
-            response.raise_for_status()
+async def _fetch_plant_flow_data(region, session, plant):
+    """Retrieve the energy flow data of one plant."""
+    data = {
+        "plantUid": plant["plantUid"],
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            if response.status_code != 200:
-                raise ValueError(f"Get plant {plant["plantName"]} energy flow data error: {response.status_code}")
+    prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
 
-            flow = response.json()
-            flow_data = _parse_api_data(
-                flow,
-                f"getDeviceEneryFlowData for {plant.get('plantName')}",
-                required=False,
-            )
-            if flow_data is not None:
-                plant.update(flow_data)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_sec_statistics(region, session, plant_info):
+    signed = calc_signature(data)
+
+    flow = await session.get(
+        base_url(region) + "/monitor/home/getDeviceEneryFlowData",  #typo from SAJ
+        params=signed,
+    )
+    return _parse_api_data(
+        flow,
+        f"getDeviceEneryFlowData for {plant.get('plantName')}",
+        required=False,
+    )
+
+def _merge_plant_answer(plant, plant_data):
+    """Merge a plant level answer into the plant, pruned."""
+    plant.update(_prune(plant_data, _PLANT_ANSWER_KEYS))
+
+async def web_get_sec_statistics(region, session, plant_info):
     """Retrieve SEC/EMS devices from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain sec devices")
 
-    try:
-        for plant in plant_info["plantList"]:
-            if "isInstallMeter" in plant and plant["isInstallMeter"] == 1:
-                data = {
-                    "plantUid": plant["plantUid"],
-                    'appProjectName': 'elekeeper',
-                    'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                    'lang': 'en',
-                    'timeStamp': int(time.time() * 1000),
-                    'random': generatkey(32),
-                    'clientId': 'esolar-monitor-admin',
-                }
+    await _run_plant_stage("sec_modules", region, session, plant_info)
+    await _run_plant_stage("sec_energy", region, session, plant_info)
 
-                signed = calc_signature(data)
+async def _fetch_sec_modules(region, session, plant):
+    """Retrieve the SEC/EMS modules of one plant."""
+    if "isInstallMeter" not in plant or plant["isInstallMeter"] != 1:
+        return None
+    if not _capability_allowed(session, "plantSECModuleList", plant["plantUid"]):
+        return None
 
-                response = session.get(
-                    base_url(region) + "/monitor/sec/plantSECModuleList",
-                    params=signed,
-                    timeout=WEB_TIMEOUT
-                )
+    data = {
+        "plantUid": plant["plantUid"],
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-                response.raise_for_status()
+    signed = calc_signature(data)
 
-                if response.status_code != 200:
-                    raise ValueError(f"Get plant SECModuleList data error: {response.status_code}")
+    answer = await session.get(
+        base_url(region) + "/monitor/sec/plantSECModuleList",
+        params=signed,
+    )
+    return _record_capability(
+        session,
+        "plantSECModuleList",
+        plant["plantUid"],
+        _parse_api_data(
+            answer,
+            f"plantSECModuleList for {plant.get('plantName')}",
+            required=False,
+        ),
+    )
 
-                answer = response.json()
-                module_data = _parse_api_data(
-                    answer,
-                    f"plantSECModuleList for {plant.get('plantName')}",
-                    required=False,
-                )
-                if module_data is not None and len(module_data) > 0:
-                    for module in module_data:
-                        if "moduleSn" in module and module["moduleSn"] is not None:
-                            module_sn = module["moduleSn"]
-                            if "modules" not in plant:
-                                plant["modules"] = []
-                            found = False
-                            for plant_module in plant["modules"]:
-                                if "moduleSn" in plant_module and plant_module["moduleSn"] is not None and \
-                                        plant_module["moduleSn"] == module_sn:
-                                    plant_module.update(module)
-                                    found = True
-                            if not found:
-                                plant["modules"].append(module)
-
-                            if "moduleSnList" not in plant:
-                                plant["moduleSnList"] = {}
-                            if module_sn not in plant["moduleSnList"]:
-                                plant["moduleSnList"].append(module_sn)
-
-                if "moduleSnList" in plant and plant["moduleSnList"] is not None and len(plant["moduleSnList"]) > 0:
-                    for moduleSn in plant["moduleSnList"]:
-                        data = {
-                            "plantUid": plant["plantUid"],
-                            "chartDateType": 5,
-                            "chartDay": datetime.date.today().strftime("%Y-%m-%d"),
-                            'appProjectName': 'elekeeper',
-                            'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                            'lang': 'en',
-                            'timeStamp': int(time.time() * 1000),
-                            'random': generatkey(32),
-                            'clientId': 'esolar-monitor-admin',
-                        }
-
-                        if plant.get("type") == 0 and plant.get("isInstallEms") == 1:
-                            url = "/monitor/plant/chart/getSecSelfUseEnergyData"
-                            prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
-                        elif plant.get("type") == 1 or (plant.get("type") == 0 and plant.get("isInstallMeter") != 0):
-                            url = "/monitor/home/getSecSelfUseEnergyData"
-                            data["moduleSn"] = moduleSn
-                        else:
-                            url = "/monitor/plant/chart/getSelfUseEnergyData"
-                            prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
-
-                        signed = calc_signature(data)
-
-                        response = session.get(
-                            base_url(region) + url,
-                            params = signed,
-                            timeout=WEB_TIMEOUT
-                        )
-
-                        response.raise_for_status()
-
-                        if response.status_code != 200:
-                            raise ValueError(f"Get plant getSecSelfUseEnergyData error: {response.status_code}")
-
-                        answer = response.json()
-                        energy_data = _parse_api_data(
-                            answer,
-                            f"getSecSelfUseEnergyData for {plant.get('plantName')}",
-                            required=False,
-                        )
-                        if energy_data is not None:
-                            if "modules" not in plant:
-                                plant["modules"] = []
-                            found = False
-                            for plant_module in plant["modules"]:
-                                if "moduleSn" in plant_module and plant_module["moduleSn"] is not None and \
-                                        plant_module["moduleSn"] == moduleSn:
-                                    plant_module.update(energy_data)
-                                    found = True
-                            if not found:
-                                plant["modules"].append(energy_data)
-
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_batteries_data(region, session, plant_info):
+def _merge_sec_modules(plant, module_data):
+    """Merge the SEC/EMS module list into the plant."""
+    if len(module_data) > 0:
+        for module in module_data:
+            if "moduleSn" in module and module["moduleSn"] is not None:
+                module_sn = module["moduleSn"]
+                if "modules" not in plant:
+                    plant["modules"] = []
+                found = False
+                for plant_module in plant["modules"]:
+                    if "moduleSn" in plant_module and plant_module["moduleSn"] is not None and \
+                            plant_module["moduleSn"] == module_sn:
+                        plant_module.update(module)
+                        found = True
+                if not found:
+                    plant["modules"].append(module)
+
+                if "moduleSnList" not in plant:
+                    plant["moduleSnList"] = []
+                if module_sn not in plant["moduleSnList"]:
+                    plant["moduleSnList"].append(module_sn)
+
+async def _fetch_sec_energy(region, session, plant):
+    """Retrieve the self-use energy data of every SEC/EMS module of one plant."""
+    if "isInstallMeter" not in plant or plant["isInstallMeter"] != 1:
+        return None
+
+    if "moduleSnList" in plant and plant["moduleSnList"] is not None and len(plant["moduleSnList"]) > 0:
+        module_sn_list = list(plant["moduleSnList"])
+        answers = await _gather_all(
+            _fetch_module_self_use_energy(region, session, plant, moduleSn)
+            for moduleSn in module_sn_list
+        )
+        return list(zip(module_sn_list, answers))
+    return None
+
+async def _fetch_module_self_use_energy(region, session, plant, moduleSn):
+    """Retrieve the self-use energy data of one SEC/EMS module."""
+    data = {
+        "plantUid": plant["plantUid"],
+        "chartDateType": 5,
+        "chartDay": datetime.date.today().strftime("%Y-%m-%d"),
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
+
+    if plant.get("type") == 0 and plant.get("isInstallEms") == 1:
+        url = "/monitor/plant/chart/getSecSelfUseEnergyData"
+        prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
+    elif plant.get("type") == 1 or (plant.get("type") == 0 and plant.get("isInstallMeter") != 0):
+        url = "/monitor/home/getSecSelfUseEnergyData"
+        data["moduleSn"] = moduleSn
+    else:
+        url = "/monitor/plant/chart/getSelfUseEnergyData"
+        prepare_data_for_query(plant, data) #add deviceSn or emsSn if needed
+
+    target = f"{plant['plantUid']}/{moduleSn}"
+    if not _capability_allowed(session, url, target):
+        return None
+
+    signed = calc_signature(data)
+
+    answer = await session.get(
+        base_url(region) + url,
+        params=signed,
+    )
+    return _record_capability(
+        session,
+        url,
+        target,
+        _parse_api_data(
+            answer,
+            f"getSecSelfUseEnergyData for {plant.get('plantName')}",
+            required=False,
+        ),
+    )
+
+def _merge_sec_energy(plant, answers):
+    """Merge the module self-use energy data, in module order."""
+    for moduleSn, energy_data in answers:
+        if energy_data is not None:
+            if "modules" not in plant:
+                plant["modules"] = []
+            found = False
+            for plant_module in plant["modules"]:
+                if "moduleSn" in plant_module and plant_module["moduleSn"] is not None and \
+                        plant_module["moduleSn"] == moduleSn:
+                    plant_module.update(energy_data)
+                    found = True
+            if not found:
+                plant["modules"].append(energy_data)
+
+async def web_get_batteries_data(region, session, plant_info):
     """Retrieve batteries data from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain batteries")
 
-    try:
-        for plant in plant_info["plantList"]:
-            if "hasBattery" not in plant or plant["hasBattery"] != 1:
-                continue
+    await _run_plant_stage("batteries", region, session, plant_info)
 
-            data = {
-                "plantUid": plant["plantUid"],
-                "pageSize": 100,
-                "pageNo": 1,
-                "searchOfficeIdArr":"1",
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/battery/getBatteryList",  #typo from SAJ
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
+async def _fetch_batteries_data(region, session, plant):
+    """Retrieve the battery list of one plant."""
+    if "hasBattery" not in plant or plant["hasBattery"] != 1:
+        return None
+    if not _capability_allowed(session, "getBatteryList", plant["plantUid"]):
+        return None
 
-            response.raise_for_status()
-            if response.status_code != 200:
-                raise ValueError(f"Get plant {plant["plantName"]} battery list data error: {response.status_code}")
+    data = {
+        "plantUid": plant["plantUid"],
+        "pageSize": 100,
+        "pageNo": 1,
+        "searchOfficeIdArr":"1",
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            answer = response.json()
-            battery_data = _parse_api_data(
-                answer,
-                f"getBatteryList for {plant.get('plantName')}",
-                required=False,
-            )
-            if (
-                isinstance(battery_data, dict)
-                and "list" in battery_data
-            ):
-                plant["batteries"] = battery_data["list"]
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_device_battery_data(region, session, plant_info):
+    signed = calc_signature(data)
+
+    answer = await session.get(
+        base_url(region) + "/monitor/battery/getBatteryList",  #typo from SAJ
+        params=signed,
+    )
+    battery_data = _parse_api_data(
+        answer,
+        f"getBatteryList for {plant.get('plantName')}",
+        required=False,
+    )
+    if (
+        isinstance(battery_data, dict)
+        and "list" in battery_data
+    ):
+        battery_data = battery_data["list"]
+    else:
+        battery_data = None
+    return _record_capability(session, "getBatteryList", plant["plantUid"], battery_data)
+
+def _merge_batteries_data(plant, batteries):
+    """Replace the battery list of a plant."""
+    plant["batteries"] = batteries
+
+async def web_get_device_battery_data(region, session, plant_info):
     """Retrieve nuilt in battery data from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain battery data")
 
-    try:
-        for plant in plant_info["plantList"]:
-            for device in plant["devices"]:
-                if device.get("hasBattery",0) == 0 or device.get("type",0) != 2: #only for devices with builtin batteries
-                    continue
-
-                data = {
-                    "deviceSn": device["deviceSn"],
-                    'appProjectName': 'elekeeper',
-                    'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                    'lang': 'en',
-                    'timeStamp': int(time.time() * 1000),
-                    'random': generatkey(32),
-                    'clientId': 'esolar-monitor-admin',
-                }
+    await _run_plant_stage("device_battery", region, session, plant_info)
+
+async def _fetch_device_battery_data(region, session, plant):
+    """Retrieve built in battery data for every device of one plant."""
+    devices = [
+        device
+        for device in plant["devices"]
+        if device.get("hasBattery",0) != 0 and device.get("type",0) == 2 #only for devices with builtin batteries
+    ]
+    answers = await _gather_all(
+        _fetch_one_device_battery_data(region, session, device) for device in devices
+    )
+    return list(zip(devices, answers))
 
-                signed = calc_signature(data)
+async def _fetch_one_device_battery_data(region, session, device):
+    """Retrieve the built in battery data of one device."""
+    if not _capability_allowed(session, "getOneDeviceBatteryInfo", device["deviceSn"]):
+        return None
 
-                response = session.get(
-                    base_url(region) + "/monitor/battery/getOneDeviceBatteryInfo",  #typo from SAJ
-                    params = signed,
-                    timeout=WEB_TIMEOUT
-                )
+    data = {
+        "deviceSn": device["deviceSn"],
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-                response.raise_for_status()
-                if response.status_code != 200:
-                    raise ValueError(f"Get plant {plant["plantName"]} battery list data error: {response.status_code}")
+    signed = calc_signature(data)
 
-                answer = response.json()
-                battery_info = _parse_api_data(
-                    answer,
-                    f"getOneDeviceBatteryInfo for {device.get('deviceSn')}",
-                    required=False,
-                )
-                if battery_info is None:
-                    continue
-                if "baseBatteryBtnBeanList" in battery_info:
-                    del battery_info["baseBatteryBtnBeanList"]
-                if "batteries" in plant and plant["batteries"] is not None:
-                    for battery in plant["batteries"]:
-                        if battery["batSn"] == device["deviceSn"]:
-                            battery.update(battery_info)
-                else:
-                    device.update(battery_info)
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
-
-def web_get_ems_list(region, session, plant_info):
+    answer = await session.get(
+        base_url(region) + "/monitor/battery/getOneDeviceBatteryInfo",  #typo from SAJ
+        params=signed,
+    )
+    battery_info = _record_capability(
+        session,
+        "getOneDeviceBatteryInfo",
+        device["deviceSn"],
+        _parse_api_data(
+            answer,
+            f"getOneDeviceBatteryInfo for {device.get('deviceSn')}",
+            required=False,
+        ),
+    )
+    if battery_info is None:
+        return None
+    if "baseBatteryBtnBeanList" in battery_info:
+        del battery_info["baseBatteryBtnBeanList"]
+    return battery_info
+
+def _merge_device_battery_data(plant, answers):
+    """Merge built in battery data into the batteries, or the device itself."""
+    for device, battery_info in answers:
+        if battery_info is None:
+            continue
+        if "batteries" in plant and plant["batteries"] is not None:
+            for battery in plant["batteries"]:
+                if battery["batSn"] == device["deviceSn"]:
+                    battery.update(battery_info)
+        else:
+            device.update(battery_info)
+
+async def web_get_ems_list(region, session, plant_info):
     """Retrieve a communication moduls list from the WEB Portal."""
     if session is None:
         raise ValueError("Missing session identifier trying to obtain ems")
 
-    try:
-        for plant in plant_info["plantList"]:
-            data = {
-                "plantUid": plant["plantUid"],
-                "pageSize": 100,
-                "pageNo": 1,
-                "usePage": 1,
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-
-            signed = calc_signature(data)
-
-            response = session.get(
-                base_url(region) + "/monitor/plant/ems/getEmsListByPlant",
-                params = signed,
-                timeout=WEB_TIMEOUT
-            )
-
-            response.raise_for_status()
+    await _for_each_plant(_plant_ems_list, region, session, plant_info)
 
-            if response.status_code != 200:
-                raise ValueError(f"Get device {plant['plantName']} deviceList error: {response.status_code}")
+async def _plant_ems_list(region, session, plant):
+    """Retrieve the communication module list of one plant."""
+    data = {
+        "plantUid": plant["plantUid"],
+        "pageSize": 100,
+        "pageNo": 1,
+        "usePage": 1,
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
 
-            answer = response.json()
-            ems_data = _parse_api_data(
-                answer,
-                f"getEmsListByPlant for {plant.get('plantName')}",
-                required=False,
-            )
-            if isinstance(ems_data, dict) and "list" in ems_data:
-                ems_list = ems_data["list"]
-            else:
-                continue
+    signed = calc_signature(data)
 
-            plant.update({"emsModules": ems_list})
+    answer = await session.get(
+        base_url(region) + "/monitor/plant/ems/getEmsListByPlant",
+        params=signed,
+    )
+    ems_data = _parse_api_data(
+        answer,
+        f"getEmsListByPlant for {plant.get('plantName')}",
+        required=False,
+    )
+    if isinstance(ems_data, dict) and "list" in ems_data:
+        ems_list = ems_data["list"]
+    else:
+        return
 
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
+    plant.update({"emsModules": ems_list})
 
-def web_get_alarm_list(region, session, plant_info, state: int = 3):
+async def web_get_alarm_list(region, session, plant_info, state: int = 3):
     """Retrieve a plant alarm list from the WEB Portal"""
 
     if session is None:
         raise ValueError("Missing session identifier trying to obtain alarms list")
 
-    try:
-        for plant in plant_info["plantList"]:
-            plant["todayAlarmNum"] = plant.get("todayAlarmNum") or 0
-            for device in plant.get("devices", []):
-                device["todayAlarmNum"] = device.get("todayAlarmNum") or 0
-
-            data = {
-                'appProjectName': 'elekeeper',
-                'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
-                'lang': 'en',
-                'timeStamp': int(time.time() * 1000),
-                'random': generatkey(32),
-                'clientId': 'esolar-monitor-admin',
-            }
-            now = datetime.datetime.now()
-            start = now - datetime.timedelta(days=3)
-
-            payload = {
-                "pageNo": 1,
-                "pageSize": 10,
-                "alarmCommonState": state,              # 1-pending, 2-?, 3-closed, 4-manual close
-                "orderByIndex": 1,
-                "plantUid": plant["plantUid"],
-                "queryStartDate": start.strftime("%Y-%m-%d"),
-                "queryEndDate": now.strftime("%Y-%m-%d"),
-                "searchOfficeIdArr": 1,
-            }
-
-            signed = calc_signature(data)
-
-            response = session.post(
-                base_url(region) + "/alarm/device/userAlarmPage",
-                data = payload | signed,
-                timeout=WEB_TIMEOUT
-            )
+    async def run(region, session, plant):
+        answer_data = await _fetch_alarm_list(region, session, plant, state)
+        _merge_alarm_list(plant, answer_data, reset=state == 1)
 
-            response.raise_for_status()
+    await _for_each_plant(run, region, session, plant_info)
 
-            if response.status_code != 200:
-                raise ValueError(f"Get device {plant["plantUid"]} alarm list error: {response.status_code}")
+async def _fetch_alarm_list(region, session, plant, state: int = 3):
+    """Retrieve the alarm list of one plant."""
+    data = {
+        'appProjectName': 'elekeeper',
+        'clientDate': datetime.date.today().strftime("%Y-%m-%d"),
+        'lang': 'en',
+        'timeStamp': int(time.time() * 1000),
+        'random': generatkey(32),
+        'clientId': 'esolar-monitor-admin',
+    }
+    now = datetime.datetime.now()
+    start = now - datetime.timedelta(days=3)
+
+    payload = {
+        "pageNo": 1,
+        "pageSize": 10,
+        "alarmCommonState": state,              # 1-pending, 2-?, 3-closed, 4-manual close
+        "orderByIndex": 1,
+        "plantUid": plant["plantUid"],
+        "queryStartDate": start.strftime("%Y-%m-%d"),
+        "queryEndDate": now.strftime("%Y-%m-%d"),
+        "searchOfficeIdArr": 1,
+    }
 
-            answer = response.json()
-            answer_data = _parse_api_data(
-                answer,
-                f"userAlarmPage for {plant.get('plantName')}",
-                required=False,
-            )
-            if answer_data and "list" in answer_data and len(answer_data["list"]) > 0:
-                alarm_list = answer_data["list"]
-                for alarm in alarm_list:
-                    if "alarmStartTime" in alarm and alarm["alarmStartTime"] is not None and is_today(alarm["alarmStartTime"]):
-                        plant["todayAlarmNum"] = (plant.get("todayAlarmNum") or 0) + 1
-                        for device in plant["devices"]:
-                            if device["deviceSn"] == alarm["deviceSn"]:
-                                device["todayAlarmNum"] = (device.get("todayAlarmNum") or 0) + 1
-                                if "alarmList" not in device:
-                                    device["alarmList"] = []
-                                del alarm["deviceSn"]
-                                del alarm["deviceSnType"]
-                                del alarm["plantUid"]
-                                del alarm["plantName"]
-                                del alarm["plantCountry"]
-
-                                device["alarmList"].append(alarm)
-                                break
-
-    except requests.exceptions.HTTPError as errh:
-        raise requests.exceptions.HTTPError(errh)
-    except requests.exceptions.ConnectionError as errc:
-        raise requests.exceptions.ConnectionError(errc)
-    except requests.exceptions.Timeout as errt:
-        raise requests.exceptions.Timeout(errt)
-    except requests.exceptions.RequestException as errr:
-        raise requests.exceptions.RequestException(errr)
\ No newline at end of file
+    signed = calc_signature(data)
+
+    answer = await session.post(
+        base_url(region) + "/alarm/device/userAlarmPage",
+        data=payload | signed,
+    )
+    return _parse_api_data(
+        answer,
+        f"userAlarmPage for {plant.get('plantName')}",
+        required=False,
+    ) or {}
+
+async def _fetch_alarm_lists(region, session, plant):
+    """Retrieve the pending and the closed alarm lists of one plant."""
+    return await _gather_all(
+        _fetch_alarm_list(region, session, plant, state) for state in (1, 3)
+    )
+
+def _merge_alarm_lists(plant, answers):
+    """Recount today's alarms of a plant from its pending and closed lists.
+
+    Both lists are fetched by one stage, so the counters are only reset when
+    both answers are there to be counted again.
+    """
+    pending, closed = answers
+    _merge_alarm_list(plant, pending, reset=True)
+    _merge_alarm_list(plant, closed)
+
+def _merge_alarm_list(plant, answer_data, reset: bool = False):
+    """Count today's alarms of a plant and attach them to their devices."""
+    if reset:
+        # plant and devices outlive a cycle, start counting from scratch
+        plant["todayAlarmNum"] = 0
+        for device in plant.get("devices", []):
+            device["todayAlarmNum"] = 0
+            device["alarmList"] = []
+    plant["todayAlarmNum"] = plant.get("todayAlarmNum") or 0
+    for device in plant.get("devices", []):
+        device["todayAlarmNum"] = device.get("todayAlarmNum") or 0
+
+    if answer_data and "list" in answer_data and len(answer_data["list"]) > 0:
+        alarm_list = answer_data["list"]
+        for alarm in alarm_list:
+            if "alarmStartTime" in alarm and alarm["alarmStartTime"] is not None and is_today(alarm["alarmStartTime"]):
+                plant["todayAlarmNum"] = (plant.get("todayAlarmNum") or 0) + 1
+                for device in plant.get("devices", []):
+                    if device["deviceSn"] == alarm["deviceSn"]:
+                        device["todayAlarmNum"] = (device.get("todayAlarmNum") or 0) + 1
+                        if "alarmList" not in device:
+                            device["alarmList"] = []
+                        del alarm["deviceSn"]
+                        del alarm["deviceSnType"]
+                        del alarm["plantUid"]
+                        del alarm["plantName"]
+                        del alarm["plantCountry"]
+
+                        device["alarmList"].append(alarm)
+                        break
+
+def _detect_plant_battery(plant, _result=None):
+    """Flag the plant and its devices that report a battery."""
+    try:
+        if "hasBattery" in plant and plant["hasBattery"] == 1:
+            return
+        for device in plant["devices"]:
+            stats = device.get("deviceStatisticsData") or {}
+            bat_pct = stats.get("batEnergyPercent")
+            device_bat_pct = device.get("batEnergyPercent")
+            if (
+                ("hasBattery" in device and device["hasBattery"] == 1)
+                or (bat_pct is not None and float(bat_pct) > 0)
+                or (
+                    device_bat_pct is not None
+                    and int(device_bat_pct) > 0
+                )
+            ):
+                device["hasBattery"] = 1
+                plant["hasBattery"] = 1
+                break
+    except Exception as e:
+        _LOGGER.error("We don't have a battery for %s: %s", plant.get("plantName"), e)
+
+async def _run_plant_stage(name, region, session, plant_info):
+    """Run a single pipeline stage (fetch and merge) for every plant."""
+    stage = PLANT_PIPELINE.stage(name)
+
+    async def run(region, session, plant):
+        result = await stage.fetch(region, session, plant)
+        if result is not None:
+            stage.merge(plant, result)
+
+    await _for_each_plant(run, region, session, plant_info)
+
+
+# Per-plant fetch pipeline. ``requires`` lists what a stage reads before it
+# sends its request (query parameters and skip conditions). Merges are
+# committed in list order, which follows the historical call order, so later
+# answers win on overlapping keys exactly as before; only the alarm lists,
+# which touch nothing but the alarm counters, moved to the end. Static stages
+# (plant details, device and module lists) and counter stages (statistics,
+# overview, module energy, alarms) keep their last merged data between their
+# refreshes; everything the live values are read from runs every cycle. While
+# a plant is idle (night or offline) the inverter raw data is not polled, and
+# the power values only for plants with a battery.
+PLANT_PIPELINE = StagePipeline(
+    [
+        Stage(
+            "details",
+            _fetch_plant_details,
+            _merge_plant_answer,
+            provides=("details",),
+            tier=TIER_STATIC,
+            priority=PRIORITY_STATIC,
+        ),
+        Stage(
+            "device_list",
+            _fetch_device_list,
+            _merge_device_list,
+            provides=("devices",),
+            tier=TIER_STATIC,
+            priority=PRIORITY_STATIC,
+        ),
+        Stage(
+            "sec_modules",
+            _fetch_sec_modules,
+            _merge_sec_modules,
+            requires=("details",),
+            provides=("modules",),
+            tier=TIER_STATIC,
+            priority=PRIORITY_STATIC,
+        ),
+        Stage(
+            "sec_energy",
+            _fetch_sec_energy,
+            _merge_sec_energy,
+            requires=("details", "devices", "modules"),
+            provides=("module_energy",),
+            tier=TIER_COUNTER,
+            priority=PRIORITY_COUNTER,
+        ),
+        Stage(
+            "statistics",
+            _fetch_plant_statistics,
+            _merge_plant_answer,
+            requires=("details", "devices", "modules"),
+            provides=("statistics",),
+            tier=TIER_COUNTER,
+            priority=PRIORITY_COUNTER,
+        ),
+        Stage(
+            "overview",
+            _fetch_plant_overview,
+            _merge_plant_answer,
+            requires=("details", "devices", "modules"),
+            provides=("overview",),
+            tier=TIER_COUNTER,
+            priority=PRIORITY_COUNTER,
+        ),
+        Stage(
+            "device_info",
+            _fetch_device_info,
+            _merge_device_info,
+            requires=("devices",),
+            provides=("device_info",),
+            idle=IDLE_STORAGE,
+        ),
+        Stage(
+            "flow",
+            _fetch_plant_flow_data,
+            _merge_plant_answer,
+            requires=("details", "devices", "modules", "device_info"),
+            provides=("flow",),
+            idle=IDLE_STORAGE,
+        ),
+        Stage(
+            "raw_data",
+            _fetch_device_raw_data,
+            _merge_device_answers,
+            requires=("devices",),
+            provides=("raw_data",),
+            idle=IDLE_SKIP,
+        ),
+        Stage(
+            "battery_detection",
+            merge=_detect_plant_battery,
+            requires=("details", "statistics", "overview", "device_info", "flow"),
+            provides=("has_battery",),
+        ),
+        Stage(
+            "batteries",
+            _fetch_batteries_data,
+            _merge_batteries_data,
+            requires=("has_battery",),
+            provides=("batteries",),
+        ),
+        Stage(
+            "device_battery",
+            _fetch_device_battery_data,
+            _merge_device_battery_data,
+            requires=("has_battery",),
+            provides=("device_battery",),
+        ),
+        Stage(
+            "alarms",
+            _fetch_alarm_lists,
+            _merge_alarm_lists,
+            provides=("alarms",),
+            tier=TIER_COUNTER,
+            priority=PRIORITY_ALARM,
+        ),
+    ]
+)
+
+# Stages polled by the live power lane between two full refreshes.
+LIVE_PIPELINE = PLANT_PIPELINE.subset(("device_info", "flow", "raw_data"))
@@ -0,0 +1,596 @@
+"""Normalized records of the plant data the entities read.
+
+The API answers are merged into the plant dicts of the coordinator data as
+they come. The plant index turns them into the records below once per
+refresh: they hold only the fields an entity or the diagnostics read, the
+numbers already parsed, so an entity update is an attribute read instead of
+a dict lookup and a float conversion. The keys the records read are also
+the keys esolar keeps of the large answers, see PLANT_KEYS.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .const import PLANT_RUNNING_STATE_OFFLINE
+from .elekeeper import extract_number
+
+_OFFLINE_ONLINE_VALUES = frozenset({"N", "0", "FALSE"})
+
+
+def number(value: Any) -> float | None:
+    """Return a value as float, None when it is not a number.
+
+    Texts may carry a percent sign or a decimal comma, "--" and "N/A"
+    stand for no value.
+    """
+    if value is None:
+        return None
+    try:
+        if isinstance(value, str):
+            value = value.strip().rstrip("%").replace(",", ".")
+            if not value or value in ("--", "N/A"):
+                return None
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def integer(value: Any) -> int | None:
+    """Return a value as int, None when it is not one."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def reading(value: Any) -> float | None:
+    """Return a battery reading as float, taking the first number of a text."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    found = extract_number(str(value))
+    return None if found is None else float(found)
+
+
+def plant_is_offline(plant: Mapping) -> bool:
+    """Return True when the plant is offline."""
+    state = integer(plant.get("runningState"))
+    if state == PLANT_RUNNING_STATE_OFFLINE:
+        return True
+
+    status = integer(plant.get("deviceStatus"))
+    if status == PLANT_RUNNING_STATE_OFFLINE:
+        return True
+
+    online = plant.get("isOnline")
+    if online is not None and str(online).upper() in _OFFLINE_ONLINE_VALUES:
+        return True
+
+    return False
+
+
+def device_is_offline(device: Mapping) -> bool:
+    """Return True when an inverter/device is offline."""
+    state = integer(device.get("runningState"))
+    if state == PLANT_RUNNING_STATE_OFFLINE:
+        return True
+
+    online = integer(device.get("onLine"))
+    if online == PLANT_RUNNING_STATE_OFFLINE or online == 0:
+        return True
+
+    online_str = integer(device.get("onLineStr"))
+    if online_str == PLANT_RUNNING_STATE_OFFLINE:
+        return True
+
+    return False
+
+
+def plant_has_battery(plant: Mapping) -> bool:
+    """Return True when the plant exposes battery-related data."""
+    if plant.get("hasBattery") == 1:
+        return True
+    if plant.get("type") in (1, 3):
+        return True
+    for device in plant.get("devices") or []:
+        if device.get("hasBattery") == 1:
+            return True
+        stats = device.get("deviceStatisticsData") or {}
+        if stats.get("batEnergyPercent") is not None:
+            return True
+    return bool(plant.get("batteries"))
+
+
+# field name, the API keys it is read from (the first one set wins) and the
+# parser of the value, None keeps it as sent
+Fields = tuple[tuple[str, tuple[str, ...], Callable[[Any], Any] | None], ...]
+
+
+def _fields(*specs: tuple) -> Fields:
+    return tuple(
+        (name, (keys,) if isinstance(keys, str) else keys, parse)
+        for name, keys, parse in specs
+    )
+
+
+def _keys(fields: Fields) -> frozenset[str]:
+    return frozenset(key for _, keys, _ in fields for key in keys)
+
+
+def _read(raw: Mapping, fields: Fields) -> dict[str, Any]:
+    """Return the fields of a record read from its API dict."""
+    values = {}
+    for name, keys, parse in fields:
+        value = None
+        for key in keys:
+            value = raw.get(key)
+            if value is not None:
+                break
+        if value is not None and parse is not None:
+            value = parse(value)
+        values[name] = value
+    return values
+
+
+def _without(raw: Mapping, keys: frozenset[str]) -> dict:
+    """Return a copy of a dict without the given keys."""
+    return {key: value for key, value in raw.items() if key not in keys}
+
+
+class Record:
+    """Base of the records, they turn back into plain dicts for diagnostics."""
+
+    __slots__ = ()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fields of the record, nested records included."""
+        return asdict(self)
+
+
+_PV_STRING_FIELDS = _fields(
+    ("no", "pvNo", None),
+    ("voltage", "pvvolt", number),
+    ("current", "pvcurr", number),
+    ("power", "pvpower", number),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PvString(Record):
+    """One PV string of an inverter."""
+
+    no: Any = None
+    voltage: float | None = None
+    current: float | None = None
+    power: float | None = None
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> PvString:
+        """Read a PV string from the pvList of the inverter statistics."""
+        return cls(**_read(raw, _PV_STRING_FIELDS))
+
+
+_GRID_PHASE_FIELDS = _fields(
+    ("no", "gridNo", None),
+    ("name", "gridName", None),
+    ("voltage", "gridVolt", number),
+    ("current", "gridCurr", number),
+    ("power", "gridPowerwatt", number),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GridPhase(Record):
+    """One grid phase of an inverter."""
+
+    no: Any = None
+    name: str | None = None
+    voltage: float | None = None
+    current: float | None = None
+    power: float | None = None
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> GridPhase:
+        """Read a grid phase from the gridList of the inverter statistics."""
+        return cls(**_read(raw, _GRID_PHASE_FIELDS))
+
+
+_DEVICE_FIELDS = _fields(
+    ("sn", "deviceSn", None),
+    ("type", "type", integer),
+    ("model", "deviceModel", None),
+    ("device_type", "deviceType", None),
+    ("device_pc", "devicePc", None),
+    ("master_mcu_fw", "masterMCUFw", None),
+    ("display_fw", "displayFw", None),
+    ("install_name", "installName", None),
+    ("module_fw", "moduleFw", None),
+    ("module_pc", "modulePc", None),
+    ("module_sn", "moduleSn", None),
+    ("module_signal", "moduleSignal", None),
+    ("temperature", "deviceTemp", number),
+    ("today_equivalent_hours", "todayEquivalentHours", number),
+    ("total_equivalent_hours", "totalEquivalentHours", number),
+    ("today_alarm_num", "todayAlarmNum", integer),
+    ("alarm_list", "alarmList", tuple),
+    ("battery_direction", "batteryDirection", integer),
+    # also in the statistics, which win
+    ("bat_power", "batPower", number),
+    ("backup_load_power", "backupTotalLoadPowerWatt", number),
+    ("usable_bat_capacity", "usableBatCapacity", number),
+    ("battery_work_time", "batteryWorkTime", number),
+    ("user_mode_name", "userModeName", None),
+)
+_STATISTICS_FIELDS = _fields(
+    ("power_now", "powerNow", number),
+    ("total_pv_energy", "totalPvEnergy", number),
+    ("today_pv_energy", "todayPvEnergy", number),
+    ("month_pv_energy", "monthPvEnergy", number),
+    ("bat_energy_percent", "batEnergyPercent", number),
+    ("bat_current", "batCurrent", number),
+    ("bat_power", "batPower", number),
+    ("today_bat_chg_energy", "todayBatChgEnergy", number),
+    ("today_bat_dis_energy", "todayBatDisEnergy", number),
+    ("total_bat_chg_energy", "totalBatChgEnergy", number),
+    ("total_bat_dis_energy", "totalBatDisEnergy", number),
+    ("total_load_power", "totalLoadPowerwatt", number),
+    ("load_power", "totalLoadPowerWatt", number),
+    ("backup_load_power", "backupTotalLoadPowerWatt", number),
+    ("grid_direction", "gridDirection", integer),
+    ("usable_bat_capacity", "usableBatCapacity", number),
+    ("battery_work_time", "batteryWorkTime", number),
+    ("user_mode_name", "userModeName", None),
+    ("data_time", "dataTime", None),
+    ("update_date", "updateDate", None),
+)
+# the cloud spells the capacity three ways
+_CAPACITY_KEYS = ("batCapacity", "batCapcity", "batCapicity")
+
+
+@dataclass(frozen=True, slots=True)
+class Device(Record):
+    """An inverter with its statistics, PV strings and grid phases."""
+
+    sn: str | None = None
+    type: int | None = None
+    model: str | None = None
+    device_type: Any = None
+    device_pc: str | None = None
+    master_mcu_fw: str | None = None
+    display_fw: str | None = None
+    install_name: str | None = None
+    module_fw: str | None = None
+    module_pc: str | None = None
+    module_sn: str | None = None
+    module_signal: Any = None
+    offline: bool = False
+    temperature: float | None = None
+    today_equivalent_hours: float | None = None
+    total_equivalent_hours: float | None = None
+    today_alarm_num: int | None = None
+    alarm_list: tuple[dict, ...] | None = None
+    battery_direction: int | None = None
+    power_now: float | None = None
+    total_pv_energy: float | None = None
+    today_pv_energy: float | None = None
+    month_pv_energy: float | None = None
+    bat_energy_percent: float | None = None
+    bat_capacity: float = 0.0
+    bat_current: float | None = None
+    bat_power: float | None = None
+    today_bat_chg_energy: float | None = None
+    today_bat_dis_energy: float | None = None
+    total_bat_chg_energy: float | None = None
+    total_bat_dis_energy: float | None = None
+    total_load_power: float | None = None
+    load_power: float | None = None
+    backup_load_power: float | None = None
+    grid_direction: int | None = None
+    usable_bat_capacity: float | None = None
+    battery_work_time: float | None = None
+    user_mode_name: str | None = None
+    data_time: str | None = None
+    update_date: str | None = None
+    pv_strings: tuple[PvString, ...] = ()
+    grid_phases: tuple[GridPhase, ...] = ()
+
+    @classmethod
+    def from_raw(
+        cls,
+        raw: Mapping,
+        pv_strings: tuple[PvString, ...] | None = None,
+        grid_phases: tuple[GridPhase, ...] | None = None,
+    ) -> Device:
+        """Read an inverter, reusing its PV strings and grid phases when given."""
+        values = _read(raw, _DEVICE_FIELDS)
+        stats = raw.get("deviceStatisticsData") or {}
+        for name, value in _read(stats, _STATISTICS_FIELDS).items():
+            if value is not None or name not in values:
+                values[name] = value
+        for key in _CAPACITY_KEYS:
+            capacity = number(stats.get(key))
+            if capacity is not None and capacity > 0:
+                values["bat_capacity"] = capacity
+                break
+        if pv_strings is None:
+            pv_strings = tuple(PvString.from_raw(pv) for pv in stats.get("pvList") or [])
+        if grid_phases is None:
+            grid_phases = tuple(GridPhase.from_raw(grid) for grid in stats.get("gridList") or [])
+        return cls(
+            **values,
+            offline=device_is_offline(raw),
+            pv_strings=pv_strings,
+            grid_phases=grid_phases,
+        )
+
+
+_BATTERY_FIELDS = _fields(
+    ("sn", "batSn", None),
+    ("type", "type", integer),
+    ("model", "batModel", None),
+    ("bms_sn", "bmsSn", None),
+    ("bms_software_version", "bmsSoftwareVersion", None),
+    ("bms_hardware_version", "bmsHardwareVersion", None),
+    ("soc", "batSoc", reading),
+    ("soh", "batSoh", reading),
+    ("temperature", "batTemperature", reading),
+    ("temperature_unit", "unitOfTemperature", None),
+    ("power", "batPower", reading),
+    ("current", "batCurrent", reading),
+    ("voltage", "batVoltage", reading),
+    ("today_bat_chg_energy", "todayBatChgEnergy", reading),
+    ("today_bat_dis_energy", "todayBatDisEnergy", reading),
+    ("total_bat_chg_energy", "totalBatChgEnergy", reading),
+    ("total_bat_dis_energy", "totalBatDisEnergy", reading),
+    ("usable_bat_capacity", "usableBatCapacity", number),
+    ("battery_work_time", "batteryWorkTime", number),
+    ("user_mode_name", "userModeName", None),
+)
+# left out of the state attributes of the state of charge sensor
+_BATTERY_HIDDEN_KEYS = frozenset({
+    "deviceSn", "batSn", "bmsHardwareVersion", "bmsSoftwareVersion", "plantName", "plantUid", "batSoc", "batTemperature",
+    "solutioUrl", "todayBatChgEnergy", "todayBatDisEnergy", "totalBatChgEnergy", "totalBatDisEnergy", "showBatSoc", "showBatteryNum",
+    "showGroupNum", "showHeating", "showNewBatteryFlag", "enableBindPlant", "aiSavingSwitch", "EnableShowBatteryClusterRealDataBtn",
+    "EnableShowBatteryRealDataBtn", "EnableShowSingleVoltageBtn", "EnableShowWarranty", "IsHistory", "IsContainCluster", "IsHighVolt",
+})
+
+
+@dataclass(frozen=True, slots=True)
+class Battery(Record):
+    """A battery of a plant, external or built into an inverter (type 2)."""
+
+    sn: str | None = None
+    type: int | None = None
+    model: str | None = None
+    bms_sn: str | None = None
+    bms_software_version: str | None = None
+    bms_hardware_version: str | None = None
+    soc: float | None = None
+    soh: float | None = None
+    temperature: float | None = None
+    temperature_unit: str | None = None
+    power: float | None = None
+    current: float | None = None
+    voltage: float | None = None
+    today_bat_chg_energy: float | None = None
+    today_bat_dis_energy: float | None = None
+    total_bat_chg_energy: float | None = None
+    total_bat_dis_energy: float | None = None
+    usable_bat_capacity: float | None = None
+    battery_work_time: float | None = None
+    user_mode_name: str | None = None
+    # the rest of the answer, shown as state attributes
+    attributes: Mapping[str, Any] | None = None
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> Battery:
+        """Read a battery of the battery list."""
+        return cls(**_read(raw, _BATTERY_FIELDS), attributes=_without(raw, _BATTERY_HIDDEN_KEYS))
+
+
+_MODULE_FIELDS = _fields(
+    ("sn", "moduleSn", None),
+    ("model", "moduleModel", None),
+    ("fw", "moduleFw", None),
+    ("grid_power", "gridPower", number),
+)
+# left out of the state attributes of the meter power sensor
+_MODULE_HIDDEN_KEYS = frozenset({
+    "deviceSnList", "moduleFw", "moduleModel", "moduleSn", "plantName", "plantUid",
+})
+
+
+@dataclass(frozen=True, slots=True)
+class Module(Record):
+    """A SEC meter module of a plant."""
+
+    sn: str | None = None
+    model: str | None = None
+    fw: str | None = None
+    grid_power: float | None = None
+    # the rest of the answer, shown as state attributes
+    attributes: Mapping[str, Any] | None = None
+
+    @classmethod
+    def from_raw(cls, raw: Mapping) -> Module:
+        """Read a SEC meter module of the module list."""
+        return cls(**_read(raw, _MODULE_FIELDS), attributes=_without(raw, _MODULE_HIDDEN_KEYS))
+
+
+# plant energy counters of the plants with a meter, battery plants add the
+# battery counters
+PLANT_METER_ENERGY_SOURCES = (
+    "todayBuyEnergy", "todayLoadEnergy", "todaySellEnergy",
+    "totalBuyEnergy", "totalLoadEnergy", "totalSellEnergy",
+    "yearBuyEnergy", "yearLoadEnergy", "yearSellEnergy",
+    "monthBuyEnergy", "monthLoadEnergy", "monthSellEnergy",
+)
+PLANT_BATTERY_ENERGY_SOURCES = (
+    "todayBuyEnergy", "todayChargeEnergy", "todayDisChargeEnergy", "todayLoadEnergy", "todaySellEnergy",
+    "totalBuyEnergy", "totalChargeEnergy", "totalDisChargeEnergy", "totalLoadEnergy", "totalSellEnergy",
+    "yearBuyEnergy", "yearBatChgEnergy", "yearBatDischgEnergy", "yearLoadEnergy", "yearSellEnergy",
+    "monthBuyEnergy", "monthBatChgEnergy", "monthBatDischgEnergy", "monthLoadEnergy", "monthSellEnergy",
+)
+_ENERGY_SOURCES = tuple(dict.fromkeys(PLANT_BATTERY_ENERGY_SOURCES + PLANT_METER_ENERGY_SOURCES))
+
+_PLANT_FIELDS = _fields(
+    ("uid", "plantUid", None),
+    ("name", "plantName", None),
+    ("type", "type", integer),
+    ("running_state", "runningState", integer),
+    ("device_status", "deviceStatus", integer),
+    ("is_online", "isOnline", None),
+    ("time_zone", "timeZone", None),
+    ("data_time", "dataTime", None),
+    ("update_date", "updateDate", None),
+    ("today_alarm_num", "todayAlarmNum", integer),
+    ("today_equivalent_hours", "todayEquivalentHours", number),
+    ("plant_no", "plantNo", None),
+    ("plant_id", "plantId", None),
+    ("owner_name", "ownerName", None),
+    ("owner_email", "ownerEmail", None),
+    ("latitude", "latitude", None),
+    ("longitude", "longitude", None),
+    ("plant_logo", "plantLogo", None),
+    ("full_address", "fullAddress", None),
+    ("create_date", "createDate", None),
+    ("system_power", "systemPower", None),
+    ("total_reduce_co2", "totalReduceCo2", None),
+    ("total_coal", "totalCoal", None),
+    ("total_plant_tree_num", "totalPlantTreeNum", None),
+    ("year_reduce_co2", "yearReduceCo2", None),
+    ("year_coal", "yearCoal", None),
+    ("year_plant_tree_num", "yearPlantTreeNum", None),
+    ("today_reduce_co2", "todayReduceCo2", number),
+    ("today_plant_tree_num", "todayPlantTreeNum", number),
+    ("total_pv_energy", "totalPvEnergy", number),
+    ("total_energy", "totalEnergy", number),
+    ("today_pv_energy", "todayPvEnergy", number),
+    ("month_pv_energy", "monthPvEnergy", number),
+    ("year_pv_energy", "yearPvEnergy", number),
+    ("peak_power", "peakPower", number),
+    ("total_income", "totalIncome", None),
+    ("income_total", "incomeTotal", None),
+    ("income_today", "incomeToday", None),
+    ("yesterday_income", "yesterdayIncome", None),
+    ("income_month", "incomeMonth", None),
+    ("month_income", "monthIncome", None),
+    ("income_last_month", "incomeLastMonth", None),
+    ("pv_power", ("totalPvPower", "nowPower", "powerNow"), number),
+    ("solar_power", "solarPower", None),
+    ("sys_grid_power", "sysGridPowerwatt", number),
+    ("total_load_power", "totalLoadPowerwatt", number),
+    ("bat_power", "batPower", number),
+    ("self_use_rate", ("selfUseRate", "selfUsePercent"), number),
+    ("usable_bat_capacity", "usableBatCapacity", number),
+    ("battery_work_time", "batteryWorkTime", number),
+    ("user_mode_name", "userModeName", None),
+    ("grid_direction", "gridDirection", integer),
+    ("battery_direction", "batteryDirection", integer),
+    ("output_direction", "outPutDirection", integer),
+    ("pv_direction", "pvDirection", integer),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Plant(Record):
+    """A plant with its inverters and batteries."""
+
+    uid: str | None = None
+    name: str | None = None
+    type: int | None = None
+    offline: bool = False
+    has_battery: bool = False
+    running_state: int | None = None
+    device_status: int | None = None
+    is_online: Any = None
+    time_zone: str | None = None
+    data_time: str | None = None
+    update_date: str | None = None
+    today_alarm_num: int | None = None
+    today_equivalent_hours: float | None = None
+    plant_no: Any = None
+    plant_id: Any = None
+    owner_name: str | None = None
+    owner_email: str | None = None
+    latitude: Any = None
+    longitude: Any = None
+    plant_logo: str | None = None
+    full_address: str | None = None
+    create_date: str | None = None
+    system_power: Any = None
+    total_reduce_co2: Any = None
+    total_coal: Any = None
+    total_plant_tree_num: Any = None
+    year_reduce_co2: Any = None
+    year_coal: Any = None
+    year_plant_tree_num: Any = None
+    today_reduce_co2: float | None = None
+    today_plant_tree_num: float | None = None
+    total_pv_energy: float | None = None
+    total_energy: float | None = None
+    today_pv_energy: float | None = None
+    month_pv_energy: float | None = None
+    year_pv_energy: float | None = None
+    peak_power: float | None = None
+    total_income: Any = None
+    income_total: Any = None
+    income_today: Any = None
+    yesterday_income: Any = None
+    income_month: Any = None
+    month_income: Any = None
+    income_last_month: Any = None
+    pv_power: float | None = None
+    solar_power: Any = None
+    sys_grid_power: float | None = None
+    total_load_power: float | None = None
+    bat_power: float | None = None
+    self_use_rate: float | None = None
+    usable_bat_capacity: float | None = None
+    battery_work_time: float | None = None
+    user_mode_name: str | None = None
+    grid_direction: int | None = None
+    battery_direction: int | None = None
+    output_direction: int | None = None
+    pv_direction: int | None = None
+    # the meter and battery energy counters by their API key
+    energies: Mapping[str, float | None] | None = None
+    devices: tuple[Device, ...] = ()
+    batteries: tuple[Battery, ...] = ()
+
+    @classmethod
+    def from_raw(
+        cls,
+        raw: Mapping,
+        devices: tuple[Device, ...] | None = None,
+        batteries: tuple[Battery, ...] | None = None,
+    ) -> Plant:
+        """Read a plant, reusing its inverter and battery records when given."""
+        if devices is None:
+            devices = tuple(Device.from_raw(device) for device in raw.get("devices") or [])
+        if batteries is None:
+            batteries = tuple(Battery.from_raw(battery) for battery in raw.get("batteries") or [])
+        return cls(
+            **_read(raw, _PLANT_FIELDS),
+            offline=plant_is_offline(raw),
+            has_battery=plant_has_battery(raw),
+            energies={source: number(raw.get(source)) for source in _ENERGY_SOURCES},
+            devices=devices,
+            batteries=batteries,
+        )
+
+
+# the API keys the records read, child collections and the keys of the
+# offline and battery checks included
+PLANT_KEYS = _keys(_PLANT_FIELDS) | frozenset(_ENERGY_SOURCES) | frozenset({
+    "hasBattery", "devices", "batteries", "modules",
+})
+DEVICE_KEYS = _keys(_DEVICE_FIELDS) | frozenset({
+    "hasBattery", "runningState", "onLine", "onLineStr", "deviceStatisticsData",
+})
+STATISTICS_KEYS = _keys(_STATISTICS_FIELDS) | frozenset(_CAPACITY_KEYS) | frozenset({
+    "pvList", "gridList",
+})
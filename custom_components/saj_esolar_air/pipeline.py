@@ -0,0 +1,436 @@
+"""Dependency-graph scheduler for the per-plant SAJ fetch stages."""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field, replace
+import time
+from typing import Any
+
+TIER_STATIC = "static"
+TIER_COUNTER = "counter"
+TIER_LIVE = "live"
+
+IDLE_POLL = "poll"
+IDLE_STORAGE = "storage"
+IDLE_SKIP = "skip"
+
+# lower runs first when the cycle budget gets tight, live values are never shed
+PRIORITY_LIVE = 0
+PRIORITY_COUNTER = 1
+PRIORITY_ALARM = 2
+PRIORITY_STATIC = 3
+# share of the cycle budget that has to be left per priority step to start a stage
+SHED_STEP = 0.15
+
+# priority of the stage whose fetch runs in the current task, when it may be shed
+_STAGE_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "saj_stage_priority", default=PRIORITY_LIVE
+)
+
+
+class BudgetExhausted(Exception):
+    """Raised by check_budget when the current stage has to be shed."""
+
+
+def describe_failure(error: BaseException) -> str:
+    """Return a short description of a failed fetch, without the request URL."""
+    status = getattr(error, "status", None)
+    if status is not None:
+        return f"{type(error).__name__} {status}"
+    return f"{type(error).__name__}: {error}"[:120]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of the per-plant fetch pipeline.
+
+    ``fetch(region, session, plant)`` talks to the API and must not modify the
+    plant; ``merge(plant, result)`` folds the result into the plant, a fetch
+    returning None has nothing to merge but still counts as a refresh. A stage's
+    fetch starts as soon as every stage providing one of its ``requires`` has
+    merged, while merges are committed in declaration order so the merged
+    payload does not depend on which request came back first. The ``tier``
+    tells a RefreshSchedule how often the stage has to run, ``idle`` whether
+    it still runs while the plant is idle (night or offline): always, only
+    for plants with a battery, or not at all. When a cycle runs short of time
+    the stages of the highest ``priority`` values are shed first.
+    """
+
+    name: str
+    fetch: Callable[..., Awaitable[Any]] | None = None
+    merge: Callable[[dict, Any], None] | None = None
+    requires: tuple[str, ...] = ()
+    provides: tuple[str, ...] = ()
+    tier: str = TIER_LIVE
+    idle: str = IDLE_POLL
+    priority: int = PRIORITY_LIVE
+
+
+class CycleBudget:
+    """Time one refresh cycle may take, so it ends before the next one is due.
+
+    A stage of priority ``p`` only starts while more than ``p * SHED_STEP`` of
+    the budget is left, which keeps the rest of it for the stages that matter
+    most. Requests use the time left as their timeout.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        """Start the budget now."""
+        self.seconds = seconds
+        self.deadline = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Return the seconds left of the budget."""
+        return max(0.0, self.deadline - time.monotonic())
+
+    def allows(self, priority: int) -> bool:
+        """Return True when a stage of the priority may still start."""
+        return priority <= PRIORITY_LIVE or (
+            self.remaining() > self.seconds * priority * SHED_STEP
+        )
+
+
+def check_budget(budget: CycleBudget | None) -> None:
+    """Raise BudgetExhausted when the fetching stage has no time left.
+
+    Called right before a request goes out, so requests that queued up for a
+    connection are shed too, not only stages that had yet to start.
+    """
+    if budget is not None and not budget.allows(_STAGE_PRIORITY.get()):
+        raise BudgetExhausted
+
+
+class RefreshSchedule:
+    """Remember when each stage last refreshed each plant.
+
+    Live stages run every cycle, counter stages every ``counter_cycles``
+    cycles and static stages once per ``static_seconds``. Stages of idle
+    plants are held back according to their ``idle`` setting. Failed fetches
+    are remembered until the stage refreshes again, so the data they left
+    stale can be reported with its age, or as missing when there is none.
+    """
+
+    def __init__(self, static_seconds: float, counter_cycles: int) -> None:
+        """Initialize the schedule."""
+        self.static_seconds = static_seconds
+        self.counter_cycles = counter_cycles
+        self.cycle = 0
+        self._refreshed: dict[tuple[str, str], tuple[int, float]] = {}
+        # idle plants, mapped to whether they store energy
+        self._idle: dict[str, bool] = {}
+        # failing stages, mapped to the number of failures in a row and the last error
+        self._failures: dict[tuple[str, str], tuple[int, str]] = {}
+
+    def configure(self, static_seconds: float, counter_cycles: int) -> None:
+        """Apply changed tier settings, keeping what was already refreshed."""
+        self.static_seconds = static_seconds
+        self.counter_cycles = counter_cycles
+
+    def set_idle(self, key: str, idle: bool, storage: bool = False) -> None:
+        """Mark a plant idle (night or offline) or active again."""
+        if idle:
+            self._idle[key] = storage
+        else:
+            self._idle.pop(key, None)
+
+    def start_cycle(self) -> None:
+        """Advance to the next refresh cycle."""
+        self.cycle += 1
+
+    def is_due(self, stage: Stage, key: str) -> bool:
+        """Return True when the stage has to run for the given plant."""
+        last = self._refreshed.get((stage.name, key))
+        if last is None:
+            # never refreshed, run it so the entities get their first values
+            return True
+        if stage.idle != IDLE_POLL and key in self._idle:
+            if stage.idle == IDLE_SKIP or not self._idle[key]:
+                return False
+        if stage.tier == TIER_LIVE:
+            return True
+        cycle, stamp = last
+        if stage.tier == TIER_COUNTER:
+            return self.cycle - cycle >= self.counter_cycles
+        return time.monotonic() - stamp >= self.static_seconds
+
+    def mark_refreshed(self, stage: Stage, key: str) -> None:
+        """Record a successful refresh of a stage for a plant, empty or not."""
+        self._refreshed[(stage.name, key)] = (self.cycle, time.monotonic())
+        self._failures.pop((stage.name, key), None)
+
+    def has_data(self, stage: Stage, key: str) -> bool:
+        """Return True when the stage refreshed the plant before."""
+        return (stage.name, key) in self._refreshed
+
+    def mark_failed(self, stage: Stage, key: str, error: BaseException) -> None:
+        """Record a failed fetch of a stage, its earlier data (if any) is kept."""
+        count, _ = self._failures.get((stage.name, key), (0, None))
+        self._failures[(stage.name, key)] = (count + 1, describe_failure(error))
+
+    def stale(self, key: str) -> dict[str, dict[str, Any]]:
+        """Return the stages of a plant that serve data of a failed refresh.
+
+        The age is None for stages that never refreshed, their data is missing.
+        """
+        now = time.monotonic()
+        return {
+            name: {
+                "age": (
+                    round(now - self._refreshed[(name, plant)][1])
+                    if (name, plant) in self._refreshed
+                    else None
+                ),
+                "failures": count,
+                "error": error,
+            }
+            for (name, plant), (count, error) in self._failures.items()
+            if plant == key
+        }
+
+
+@dataclass
+class StageTiming:
+    """Timing of one stage in one pipeline run (monotonic seconds)."""
+
+    started: float = 0.0
+    fetched: float = 0.0
+    committed: float = 0.0
+    waited_on: str | None = None
+
+
+@dataclass
+class PipelineRun:
+    """Result of running the pipeline for one plant."""
+
+    started: float
+    finished: float = 0.0
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    critical_path: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    shed: list[str] = field(default_factory=list)
+    failed: dict[str, BaseException] = field(default_factory=dict)
+    missing: list[str] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Return the wall time of the run in seconds."""
+        return self.finished - self.started
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON friendly summary of the run."""
+        return {
+            "duration_ms": round(self.duration * 1000),
+            "critical_path": self.critical_path,
+            "stages_ms": {
+                name: round((timing.fetched - timing.started) * 1000)
+                for name, timing in self.timings.items()
+                if name not in self.skipped
+                and name not in self.shed
+                and name not in self.failed
+                and name not in self.missing
+            },
+            "skipped": self.skipped,
+            "shed": self.shed,
+            "failed": {name: describe_failure(err) for name, err in self.failed.items()},
+            "missing": self.missing,
+        }
+
+
+class _PipelineAborted(Exception):
+    """Raised inside stages that were waiting on a stage that failed."""
+
+
+class StagePipeline:
+    """Run a list of stages per plant, as soon as their inputs are available."""
+
+    def __init__(self, stages: Sequence[Stage]) -> None:
+        """Validate the stage graph and resolve the dependencies."""
+        self.stages = tuple(stages)
+        providers: dict[str, str] = {}
+        self.dependencies: dict[str, tuple[str, ...]] = {}
+        for stage in self.stages:
+            if stage.name in self.dependencies:
+                raise ValueError(f"Duplicate pipeline stage {stage.name}")
+            deps: list[str] = []
+            for key in stage.requires:
+                if key not in providers:
+                    raise ValueError(
+                        f"Stage {stage.name} requires {key}, "
+                        "which no earlier stage provides"
+                    )
+                if providers[key] not in deps:
+                    deps.append(providers[key])
+            self.dependencies[stage.name] = tuple(deps)
+            for key in stage.provides:
+                providers[key] = stage.name
+        self._index = {stage.name: index for index, stage in enumerate(self.stages)}
+
+    def stage(self, name: str) -> Stage:
+        """Return a stage by name."""
+        return self.stages[self._index[name]]
+
+    def subset(self, names: Sequence[str]) -> StagePipeline:
+        """Return a pipeline of some stages only, in their original order.
+
+        Inputs provided by stages left out are expected to be merged into the
+        plant already, by an earlier run of the full pipeline.
+        """
+        provided = {
+            key
+            for stage in self.stages
+            if stage.name in names
+            for key in stage.provides
+        }
+        return StagePipeline(
+            [
+                replace(
+                    stage,
+                    requires=tuple(key for key in stage.requires if key in provided),
+                )
+                for stage in self.stages
+                if stage.name in names
+            ]
+        )
+
+    async def run(
+        self,
+        region,
+        session,
+        plant: dict,
+        schedule: RefreshSchedule | None = None,
+        key: str | None = None,
+        isolate: Callable[[BaseException], bool] | None = None,
+        budget: CycleBudget | None = None,
+    ) -> PipelineRun:
+        """Run every due stage for one plant and record the critical path.
+
+        Stages that are not due keep the data merged in an earlier cycle and
+        count as committed right away. A fetch failing with an error accepted
+        by ``isolate`` does the same: the failure is recorded and the stages
+        after it go on with the stale data. When the failed stage has no
+        earlier data, the stages requiring it are not run either and are
+        listed as missing, the other stages still refresh. Any other failure
+        aborts the run. Stages the ``budget`` has no time left for are shed:
+        they keep their data like stages that are not due and stay due for
+        the next cycle.
+        """
+        run = PipelineRun(started=time.monotonic())
+        if schedule is not None:
+            run.skipped = [
+                stage.name for stage in self.stages if not schedule.is_due(stage, key)
+            ]
+        committed = {stage.name: asyncio.Event() for stage in self.stages}
+        failed = False
+        # stages without any data for the stages requiring them
+        unavailable: set[str] = set()
+
+        async def wait_for(name: str) -> None:
+            await committed[name].wait()
+            if failed:
+                raise _PipelineAborted
+
+        async def run_stage(index: int, stage: Stage) -> None:
+            nonlocal failed
+            timing = run.timings[stage.name] = StageTiming()
+            try:
+                deps = self.dependencies[stage.name]
+                for dep in deps:
+                    await wait_for(dep)
+                if deps:
+                    timing.waited_on = max(
+                        deps, key=lambda name: run.timings[name].committed
+                    )
+                timing.started = time.monotonic()
+                skipped = stage.name in run.skipped
+                if not skipped and unavailable.intersection(deps):
+                    run.missing.append(stage.name)
+                    skipped = True
+                    if not schedule.has_data(stage, key):
+                        unavailable.add(stage.name)
+                sheddable = (
+                    budget is not None
+                    and schedule is not None
+                    and schedule.has_data(stage, key)
+                )
+                if sheddable and not skipped and stage.fetch is not None:
+                    # every stage runs in a task of its own, so this stays local
+                    _STAGE_PRIORITY.set(stage.priority)
+                    if not budget.allows(stage.priority):
+                        run.shed.append(stage.name)
+                        skipped = True
+                result = None
+                if stage.fetch is not None and not skipped:
+                    try:
+                        result = await stage.fetch(region, session, plant)
+                    except BudgetExhausted:
+                        run.shed.append(stage.name)
+                        skipped = True
+                    except Exception as err:
+                        if isolate is None or schedule is None or not isolate(err):
+                            raise
+                        run.failed[stage.name] = err
+                        schedule.mark_failed(stage, key, err)
+                        if not schedule.has_data(stage, key):
+                            unavailable.add(stage.name)
+                        skipped = True
+                timing.fetched = time.monotonic()
+                if index > 0:
+                    await wait_for(self.stages[index - 1].name)
+                if not skipped:
+                    if stage.merge is not None and (
+                        stage.fetch is None or result is not None
+                    ):
+                        stage.merge(plant, result)
+                    if schedule is not None:
+                        # an empty answer is a refresh too, the stage waits for its tier
+                        schedule.mark_refreshed(stage, key)
+                timing.committed = time.monotonic()
+            except BaseException:
+                # wake everything still waiting, they will abort
+                failed = True
+                for event in committed.values():
+                    event.set()
+                raise
+            committed[stage.name].set()
+
+        results = await asyncio.gather(
+            *(run_stage(index, stage) for index, stage in enumerate(self.stages)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(
+                result, _PipelineAborted
+            ):
+                raise result
+
+        run.finished = time.monotonic()
+        run.critical_path = self._critical_path(run)
+        return run
+
+    def _critical_path(self, run: PipelineRun) -> list[str]:
+        """Walk back from the last commit along the edges that kept stages waiting."""
+        path: list[str] = []
+        index = len(self.stages) - 1
+        while index >= 0:
+            stage = self.stages[index]
+            timing = run.timings[stage.name]
+            previous = self.stages[index - 1].name if index > 0 else None
+            if previous is not None and run.timings[previous].committed > timing.fetched:
+                # the fetch was done early, the merge waited for the previous stage
+                index -= 1
+                continue
+            if (
+                stage.fetch is not None
+                and stage.name not in run.skipped
+                and stage.name not in run.shed
+                and stage.name not in run.failed
+                and stage.name not in run.missing
+            ):
+                path.append(stage.name)
+            if timing.waited_on is None:
+                break
+            index = self._index[timing.waited_on]
+        path.reverse()
+        return path
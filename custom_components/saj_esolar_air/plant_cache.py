@@ -0,0 +1,104 @@
+"""Bounded cache of the plant data fetched per account and plant selection."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+import time
+from typing import Any
+
+PLANT_CACHE_MAX_ENTRIES = 16
+PLANT_CACHE_TTL = 24 * 60 * 60
+
+
+def plant_cache_key(
+    region: str | None, username: str, plant_list: Iterable[str] | None = None
+) -> tuple:
+    """Return the cache key of one account and monitored plant set."""
+    return (
+        region,
+        username,
+        frozenset(plant_list) if plant_list is not None else None,
+    )
+
+
+class PlantDataCache:
+    """LRU cache of plant data with a time to live.
+
+    Entries are keyed by (region, username, monitored plant set), so several
+    accounts, and several entries of one account, keep their own plant data
+    instead of evicting each other. An expired entry is dropped on lookup,
+    which makes the next refresh fetch the plant list again.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PLANT_CACHE_MAX_ENTRIES,
+        ttl: float = PLANT_CACHE_TTL,
+    ) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        """Return True when a live entry is cached, without touching counters."""
+        entry = self._entries.get(key)
+        return entry is not None and time.monotonic() - entry[0] < self.ttl
+
+    def get(self, key: tuple) -> Any | None:
+        """Return the cached value and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Cache a value, evicting the least recently used entries when full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, username: str, region: str | None = None) -> int:
+        """Drop every entry of an account and return how many were dropped."""
+        keys = [
+            key
+            for key in self._entries
+            if key[1] == username and (region is None or key[0] == region)
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return the size and the hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -16,7 +16,13 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import ESolarCoordinator
 from .const import DOMAIN, MANUFACTURER, PLANT_MODEL, PLANT_RUNNING_STATE_OFFLINE
-from .sensor_helpers import offline_blocks_live_sensor
+from .model import Plant, plant_has_battery
+from .plant_index import ANY
+from .sensor_helpers import (
+    offline_blocks_live_sensor,
+    publish_state,
+    subscribe_live_updates,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,68 +58,38 @@ INVERTER_STATUS_KEYS = {
 }
 
 
-def plant_has_battery(plant: dict) -> bool:
-    """Return True when the plant exposes battery-related data."""
-    if plant.get("hasBattery") == 1:
-        return True
-    if plant.get("type") in (1, 3):
-        return True
-    for device in plant.get("devices") or []:
-        if device.get("hasBattery") == 1:
-            return True
-        stats = device.get("deviceStatisticsData") or {}
-        if stats.get("batEnergyPercent") is not None:
-            return True
-    return bool(plant.get("batteries"))
-
-
-def _float_value(value: Any) -> float | None:
-    if value is None:
-        return None
-    try:
-        if isinstance(value, str):
-            value = value.strip().rstrip("%").replace(",", ".")
-            if not value or value in ("--", "N/A"):
-                return None
-        return float(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def _first_device(plant: dict) -> dict:
-    devices = plant.get("devices") or []
-    return devices[0] if devices else {}
-
-
-def _battery_info(plant: dict) -> dict:
-    device = _first_device(plant)
-    stats = device.get("deviceStatisticsData") or {}
-    merged = dict(stats)
-    for key in (
-        "usableBatCapacity",
-        "batteryWorkTime",
-        "userModeName",
-        "batCapacity",
-        "batCapcity",
-        "batPower",
-        "batCurrent",
-        "batVoltage",
-        "todayBatChgEnergy",
-        "todayBatDisEnergy",
-    ):
-        if key in device and device[key] is not None:
-            merged.setdefault(key, device[key])
-    if plant.get("batteries"):
-        bat = plant["batteries"][0]
-        for key in bat:
-            merged.setdefault(key, bat[key])
-    return merged
+def _battery_value(plant: Plant, field: str, skip_empty: bool = False) -> Any:
+    """Return a battery field of the first inverter, else the first battery, else the plant.
+
+    A 0 is a value like any other, ``skip_empty`` also passes over empty ones.
+    """
+    sources = (
+        plant.devices[0] if plant.devices else None,
+        plant.batteries[0] if plant.batteries else None,
+        plant,
+    )
+    for source in sources:
+        value = getattr(source, field, None)
+        if value is None or (skip_empty and not value):
+            continue
+        return value
+    return None
+
+
+def _battery_power(plant: Plant) -> float | None:
+    """Return the battery power of the plant, else of its first inverter or battery."""
+    if plant.bat_power is not None:
+        return plant.bat_power
+    if plant.devices and plant.devices[0].bat_power is not None:
+        return plant.devices[0].bat_power
+    return plant.batteries[0].power if plant.batteries else None
 
 
 class ESolarPlantDashboardSensor(CoordinatorEntity[ESolarCoordinator], SensorEntity):
     """Base class for translated plant dashboard sensors."""
 
     _attr_has_entity_name = True
+    _live_power = False
 
     def __init__(
         self,
@@ -122,27 +98,38 @@ class ESolarPlantDashboardSensor(CoordinatorEntity[ESolarCoordinator], SensorEnt
         plant_uid: str,
         translation_key: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=(
+                (plant_uid,),
+                (plant_uid, "devices", ANY),
+                (plant_uid, "devices", ANY, "deviceStatisticsData"),
+                (plant_uid, "batteries", ANY),
+            ),
+        )
         self._plant_name = plant_name
         self._plant_uid = plant_uid
         self._attr_translation_key = translation_key
         self._attr_unique_id = f"plant_{plant_uid}_{translation_key}"
 
-    def _plant_list(self) -> list[dict]:
-        if not self.coordinator.data:
-            return []
-        return self.coordinator.data.get("plantList") or []
+    def _plant(self) -> Plant | None:
+        return self.coordinator.index.plant(self._plant_uid, self._plant_name)
 
-    def _offline_blocks_live_sensor(self, plant: dict) -> bool:
+    def _offline_blocks_live_sensor(self, plant: Plant) -> bool:
         return offline_blocks_live_sensor(self, plant)
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._live_power:
+            subscribe_live_updates(self, self.coordinator)
+
     async def async_update(self) -> None:
         self.process_data()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         self.process_data()
-        self.async_write_ha_state()
+        publish_state(self, self.coordinator)
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -161,6 +148,8 @@ class ESolarPlantDashboardSensor(CoordinatorEntity[ESolarCoordinator], SensorEnt
 class ESolarPlantGridPowerSensor(ESolarPlantDashboardSensor):
     """Signed grid power (positive import, negative export)."""
 
+    _live_power = True
+
     def __init__(self, coordinator, plant_name, plant_uid) -> None:
         super().__init__(coordinator, plant_name, plant_uid, "plant_grid_power")
         self._attr_device_class = SensorDeviceClass.POWER
@@ -170,26 +159,26 @@ class ESolarPlantGridPowerSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            power = _float_value(plant.get("sysGridPowerwatt"))
-            if power is None:
-                self._attr_available = False
-                return
-            direction = plant.get("gridDirection")
-            if direction is not None and int(direction) == 1:
-                power = -abs(power)
-            self._attr_available = True
-            self._attr_native_value = power
+        plant = self._plant()
+        if plant is None:
+            return
+        if self._offline_blocks_live_sensor(plant):
             return
+        power = plant.sys_grid_power
+        if power is None:
+            self._attr_available = False
+            return
+        if plant.grid_direction == 1:
+            power = -abs(power)
+        self._attr_available = True
+        self._attr_native_value = power
 
 
 class ESolarPlantGridPowerAbsoluteSensor(ESolarPlantDashboardSensor):
     """Absolute grid power."""
 
+    _live_power = True
+
     def __init__(self, coordinator, plant_name, plant_uid) -> None:
         super().__init__(coordinator, plant_name, plant_uid, "plant_grid_power_absolute")
         self._attr_device_class = SensorDeviceClass.POWER
@@ -199,23 +188,24 @@ class ESolarPlantGridPowerAbsoluteSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            power = _float_value(plant.get("sysGridPowerwatt"))
-            if power is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = abs(power)
+        plant = self._plant()
+        if plant is None:
             return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        power = plant.sys_grid_power
+        if power is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = abs(power)
 
 
 class ESolarPlantBatteryPowerSensor(ESolarPlantDashboardSensor):
     """Signed battery power (positive discharge, negative charge)."""
 
+    _live_power = True
+
     def __init__(self, coordinator, plant_name, plant_uid) -> None:
         super().__init__(coordinator, plant_name, plant_uid, "plant_battery_power")
         self._attr_device_class = SensorDeviceClass.POWER
@@ -225,30 +215,29 @@ class ESolarPlantBatteryPowerSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if not plant_has_battery(plant):
-                self._attr_available = False
-                return
-            if self._offline_blocks_live_sensor(plant):
-                return
-            info = _battery_info(plant)
-            power = _float_value(plant.get("batPower", info.get("batPower")))
-            if power is None:
-                self._attr_available = False
-                return
-            direction = plant.get("batteryDirection")
-            if direction is not None and int(direction) == -1:
-                power = -abs(power)
-            self._attr_available = True
-            self._attr_native_value = power
+        plant = self._plant()
+        if plant is None:
+            return
+        if not plant.has_battery:
+            self._attr_available = False
+            return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        power = _battery_power(plant)
+        if power is None:
+            self._attr_available = False
             return
+        if plant.battery_direction == -1:
+            power = -abs(power)
+        self._attr_available = True
+        self._attr_native_value = power
 
 
 class ESolarPlantBatteryPowerAbsoluteSensor(ESolarPlantDashboardSensor):
     """Absolute battery power."""
 
+    _live_power = True
+
     def __init__(self, coordinator, plant_name, plant_uid) -> None:
         super().__init__(
             coordinator, plant_name, plant_uid, "plant_battery_power_absolute"
@@ -260,27 +249,27 @@ class ESolarPlantBatteryPowerAbsoluteSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if not plant_has_battery(plant):
-                self._attr_available = False
-                return
-            if self._offline_blocks_live_sensor(plant):
-                return
-            info = _battery_info(plant)
-            power = _float_value(plant.get("batPower", info.get("batPower")))
-            if power is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = abs(power)
+        plant = self._plant()
+        if plant is None:
+            return
+        if not plant.has_battery:
+            self._attr_available = False
             return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        power = _battery_power(plant)
+        if power is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = abs(power)
 
 
 class ESolarPlantPvPowerSensor(ESolarPlantDashboardSensor):
     """Current PV power."""
 
+    _live_power = True
+
     def __init__(self, coordinator, plant_name, plant_uid) -> None:
         super().__init__(coordinator, plant_name, plant_uid, "plant_pv_power")
         self._attr_device_class = SensorDeviceClass.POWER
@@ -290,27 +279,26 @@ class ESolarPlantPvPowerSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            power = _float_value(
-                plant.get("totalPvPower", plant.get("nowPower", plant.get("powerNow")))
-            )
-            if power is None and plant.get("devices"):
-                power = _float_value(_first_device(plant).get("powerNow"))
-            if power is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = power
+        plant = self._plant()
+        if plant is None:
+            return
+        if self._offline_blocks_live_sensor(plant):
             return
+        power = plant.pv_power
+        if power is None and plant.devices:
+            power = plant.devices[0].power_now
+        if power is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = power
 
 
 class ESolarPlantLoadPowerSensor(ESolarPlantDashboardSensor):
     """Current load power."""
 
+    _live_power = True
+
     def __init__(self, coordinator, plant_name, plant_uid) -> None:
         super().__init__(coordinator, plant_name, plant_uid, "plant_load_power")
         self._attr_device_class = SensorDeviceClass.POWER
@@ -320,21 +308,19 @@ class ESolarPlantLoadPowerSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            power = _float_value(plant.get("totalLoadPowerwatt"))
-            if power is None:
-                stats = _first_device(plant).get("deviceStatisticsData") or {}
-                power = _float_value(stats.get("totalLoadPowerWatt"))
-            if power is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = power
+        plant = self._plant()
+        if plant is None:
+            return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        power = plant.total_load_power
+        if power is None and plant.devices:
+            power = plant.devices[0].load_power
+        if power is None:
+            self._attr_available = False
             return
+        self._attr_available = True
+        self._attr_native_value = power
 
 
 class ESolarPlantSelfUseRateSensor(ESolarPlantDashboardSensor):
@@ -348,18 +334,15 @@ class ESolarPlantSelfUseRateSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            rate = _float_value(plant.get("selfUseRate"))
-            if rate is None:
-                rate = _float_value(plant.get("selfUsePercent"))
-            if rate is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = rate
+        plant = self._plant()
+        if plant is None:
+            return
+        rate = plant.self_use_rate
+        if rate is None:
+            self._attr_available = False
             return
+        self._attr_available = True
+        self._attr_native_value = rate
 
 
 class ESolarPlantUsableBatteryCapacitySensor(ESolarPlantDashboardSensor):
@@ -376,23 +359,18 @@ class ESolarPlantUsableBatteryCapacitySensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if not plant_has_battery(plant):
-                self._attr_available = False
-                return
-            info = _battery_info(plant)
-            capacity = _float_value(
-                info.get("usableBatCapacity")
-                or plant.get("usableBatCapacity")
-            )
-            if capacity is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = capacity
+        plant = self._plant()
+        if plant is None:
+            return
+        if not plant.has_battery:
+            self._attr_available = False
             return
+        capacity = _battery_value(plant, "usable_bat_capacity")
+        if capacity is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = capacity
 
 
 class ESolarPlantBatteryRemainingTimeSensor(ESolarPlantDashboardSensor):
@@ -408,22 +386,18 @@ class ESolarPlantBatteryRemainingTimeSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if not plant_has_battery(plant):
-                self._attr_available = False
-                return
-            info = _battery_info(plant)
-            minutes = _float_value(
-                info.get("batteryWorkTime") or plant.get("batteryWorkTime")
-            )
-            if minutes is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = round(minutes / 60, 1)
+        plant = self._plant()
+        if plant is None:
+            return
+        if not plant.has_battery:
+            self._attr_available = False
             return
+        minutes = _battery_value(plant, "battery_work_time")
+        if minutes is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = round(minutes / 60, 1)
 
 
 class ESolarPlantOperatingModeSensor(ESolarPlantDashboardSensor):
@@ -435,20 +409,18 @@ class ESolarPlantOperatingModeSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if not plant_has_battery(plant):
-                self._attr_available = False
-                return
-            info = _battery_info(plant)
-            mode = info.get("userModeName") or plant.get("userModeName")
-            if not mode:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = mode
+        plant = self._plant()
+        if plant is None:
+            return
+        if not plant.has_battery:
+            self._attr_available = False
+            return
+        mode = _battery_value(plant, "user_mode_name", skip_empty=True)
+        if not mode:
+            self._attr_available = False
             return
+        self._attr_available = True
+        self._attr_native_value = mode
 
 
 class ESolarPlantDeviceOnlineSensor(ESolarPlantDashboardSensor):
@@ -460,20 +432,19 @@ class ESolarPlantDeviceOnlineSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            state = plant.get("runningState")
-            if state is None:
-                online = str(plant.get("isOnline", "")).upper() in ("Y", "1", "TRUE")
-                self._attr_available = True
-                self._attr_native_value = "online" if online else "offline"
-                return
+        plant = self._plant()
+        if plant is None:
+            return
+        state = plant.running_state
+        if state is None:
+            online = str(plant.is_online or "").upper() in ("Y", "1", "TRUE")
             self._attr_available = True
-            self._attr_native_value = (
-                "offline" if int(state) == PLANT_RUNNING_STATE_OFFLINE else "online"
-            )
+            self._attr_native_value = "online" if online else "offline"
             return
+        self._attr_available = True
+        self._attr_native_value = (
+            "offline" if state == PLANT_RUNNING_STATE_OFFLINE else "online"
+        )
 
 
 class ESolarPlantDirectionSensor(ESolarPlantDashboardSensor):
@@ -496,23 +467,17 @@ class ESolarPlantDirectionSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            value = plant.get(self._plant_field)
-            if value is None:
-                self._attr_available = False
-                return
-            try:
-                key = self._mapping.get(int(value), "unknown")
-            except (TypeError, ValueError):
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = key
+        plant = self._plant()
+        if plant is None:
             return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        value = getattr(plant, self._plant_field)
+        if value is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = self._mapping.get(value, "unknown")
 
 
 class ESolarPlantDailyEnvironmentalSensor(ESolarPlantDashboardSensor):
@@ -539,16 +504,15 @@ class ESolarPlantDailyEnvironmentalSensor(ESolarPlantDashboardSensor):
         self._attr_native_value = None
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            value = _float_value(plant.get(self._plant_field))
-            if value is None:
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = value
+        plant = self._plant()
+        if plant is None:
             return
+        value = getattr(plant, self._plant_field)
+        if value is None:
+            self._attr_available = False
+            return
+        self._attr_available = True
+        self._attr_native_value = value
 
 
 class ESolarPlantInverterStatusSensor(ESolarPlantDashboardSensor):
@@ -561,37 +525,29 @@ class ESolarPlantInverterStatusSensor(ESolarPlantDashboardSensor):
         self._attr_extra_state_attributes: dict[str, Any] = {}
 
     def process_data(self) -> None:
-        for plant in self._plant_list():
-            if plant["plantName"] != self._plant_name:
-                continue
-            status = plant.get("deviceStatus")
-            if status is None:
-                running = plant.get("runningState")
-                if running is not None:
-                    status = running
-                else:
-                    self._attr_available = False
-                    return
-            try:
-                status_int = int(status)
-            except (TypeError, ValueError):
-                self._attr_available = False
-                return
-            self._attr_available = True
-            self._attr_native_value = INVERTER_STATUS_KEYS.get(status_int, "unknown")
-            self._attr_extra_state_attributes = {}
-            if status_int == 2 or status_int == 3:
-                for device in plant.get("devices") or []:
-                    alarms = device.get("alarmList") or []
-                    if alarms:
-                        alarm = alarms[0]
-                        self._attr_extra_state_attributes = {
-                            "alarm_name": alarm.get("alarmName"),
-                            "alarm_level": alarm.get("alarmLevelName"),
-                            "alarm_start_time": alarm.get("alarmStartTime"),
-                        }
-                        break
+        plant = self._plant()
+        if plant is None:
+            return
+        status_int = plant.device_status
+        if status_int is None:
+            status_int = plant.running_state
+        if status_int is None:
+            self._attr_available = False
             return
+        self._attr_available = True
+        self._attr_native_value = INVERTER_STATUS_KEYS.get(status_int, "unknown")
+        self._attr_extra_state_attributes = {}
+        if status_int == 2 or status_int == 3:
+            for device in plant.devices:
+                alarms = device.alarm_list or ()
+                if alarms:
+                    alarm = alarms[0]
+                    self._attr_extra_state_attributes = {
+                        "alarm_name": alarm.get("alarmName"),
+                        "alarm_level": alarm.get("alarmLevelName"),
+                        "alarm_start_time": alarm.get("alarmStartTime"),
+                    }
+                    break
 
 
 def create_plant_dashboard_sensors(
@@ -614,7 +570,7 @@ def create_plant_dashboard_sensors(
             plant_name,
             plant_uid,
             "plant_pv_direction",
-            "pvDirection",
+            "pv_direction",
             GRID_DIRECTION_KEYS,
             ICON_SOLAR,
         ),
@@ -623,7 +579,7 @@ def create_plant_dashboard_sensors(
             plant_name,
             plant_uid,
             "plant_grid_direction",
-            "gridDirection",
+            "grid_direction",
             GRID_DIRECTION_KEYS,
             ICON_GRID,
         ),
@@ -632,7 +588,7 @@ def create_plant_dashboard_sensors(
             plant_name,
             plant_uid,
             "plant_output_direction",
-            "outPutDirection",
+            "output_direction",
             GRID_DIRECTION_KEYS,
             ICON_HOME,
         ),
@@ -641,7 +597,7 @@ def create_plant_dashboard_sensors(
             plant_name,
             plant_uid,
             "plant_daily_trees",
-            "todayPlantTreeNum",
+            "today_plant_tree_num",
             None,
             ICON_TREE,
         ),
@@ -650,7 +606,7 @@ def create_plant_dashboard_sensors(
             plant_name,
             plant_uid,
             "plant_daily_co2",
-            "todayReduceCo2",
+            "today_reduce_co2",
             "t",
             ICON_CO2,
         ),
@@ -675,7 +631,7 @@ def create_plant_dashboard_sensors(
                     plant_name,
                     plant_uid,
                     "plant_battery_direction",
-                    "batteryDirection",
+                    "battery_direction",
                     BATTERY_DIRECTION_KEYS,
                     ICON_BATTERY,
                 ),
@@ -0,0 +1,304 @@
+"""Per cycle lookup index of the plant data entities read from."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from itertools import product
+from types import MappingProxyType
+from typing import Any
+
+from .model import Battery, Device, GridPhase, Module, Plant, PvString
+
+# stands for every serial number at its place in a subscribed path
+ANY = None
+
+# the child collections fingerprinted as nodes of their own
+_PLANT_CHILDREN = frozenset({"devices", "batteries", "modules", "emsModules"})
+_DEVICE_CHILDREN = frozenset({"deviceStatisticsData"})
+_STATISTICS_CHILDREN = frozenset({"pvList", "gridList"})
+# where the serial or number of a node sits in its path
+_KEY_POSITIONS = (2, 4)
+
+
+def freeze(value: Any) -> Any:
+    """Return a comparable copy of a value, nested dicts and lists included."""
+    if isinstance(value, dict):
+        return tuple((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _fingerprint(value: Any, children: frozenset = frozenset()) -> int:
+    """Return the hash of a node, without its child collections."""
+    if isinstance(value, dict):
+        value = {key: item for key, item in value.items() if key not in children}
+    frozen = freeze(value)
+    try:
+        return hash(frozen)
+    except TypeError:
+        return hash(repr(frozen))
+
+
+def changed_paths(
+    previous: Mapping[tuple, int] | None, current: Mapping[tuple, int]
+) -> set[tuple] | None:
+    """Return the paths whose fingerprint changed, None without a previous one."""
+    if previous is None:
+        return None
+    changed = {path for path, value in current.items() if previous.get(path) != value}
+    changed.update(previous.keys() - current.keys())
+    return changed
+
+
+def _statistics(device: dict) -> dict:
+    """Return the statistics block of a device, empty when not fetched."""
+    return device.get("deviceStatisticsData") or {}
+
+
+class PlantIndex:
+    """Immutable lookup tables over the plant list of one refresh cycle.
+
+    The coordinator builds the index once per refresh, so an entity finds
+    its plant, inverter, string, battery or meter with one dict lookup
+    instead of scanning the plant list and the device lists of its plant.
+    The tables hold the records of the model module, read from the dicts of
+    the coordinator data, the EMS modules excepted. The live refresh
+    rebuilds the index too, as it may replace the PV and grid lists of an
+    inverter. Entries whose key is missing from the data are not indexed.
+
+    It also fingerprints every node of the data by its path: (plantUid,),
+    (plantUid, "devices", deviceSn), (plantUid, "devices", deviceSn,
+    "deviceStatisticsData"), (plantUid, "devices", deviceSn, "pvList", pvNo),
+    the "gridList" phases alike, (plantUid, "batteries", batSn),
+    (plantUid, "modules", moduleSn), (plantUid, "emsModules", emsModuleSn)
+    and (key,) for the other top level keys. A node covers its own fields,
+    not the child collections fingerprinted as nodes of their own. Built
+    with the index of the previous refresh, the records of the nodes whose
+    fingerprints did not change are taken over instead of read again.
+    """
+
+    __slots__ = (
+        "plants",
+        "plants_by_name",
+        "devices",
+        "pv_strings",
+        "grid_phases",
+        "batteries",
+        "modules",
+        "ems_modules",
+        "fingerprints",
+        "_records",
+    )
+
+    def __init__(
+        self, data: Mapping[str, Any] | None, previous: PlantIndex | None = None
+    ) -> None:
+        """Index the plant list of the coordinator data."""
+        plants: dict[str, Plant] = {}
+        plants_by_name: dict[str, Plant] = {}
+        devices: dict[str, Device] = {}
+        pv_strings: dict[tuple[str, Any], PvString] = {}
+        grid_phases: dict[tuple[str, Any], GridPhase] = {}
+        batteries: dict[str, Battery] = {}
+        modules: dict[str, Module] = {}
+        ems_modules: dict[str, dict] = {}
+        fingerprints: dict[tuple, int] = {}
+        # record of each path, with the nodes and fingerprints it was read from
+        records: dict[tuple, tuple[tuple, Any]] = {}
+        previous_records = previous._records if previous is not None else {}
+
+        def read(path: tuple, paths: Iterable[tuple], build: Callable[[], Any]) -> Any:
+            """Return the record of a path, the previous one when its nodes did not change."""
+            source = tuple((node, fingerprints[node]) for node in paths)
+            known = previous_records.get(path)
+            record = known[1] if known is not None and known[0] == source else build()
+            records[path] = (source, record)
+            return record
+
+        for key, value in (data or {}).items():
+            if key != "plantList":
+                fingerprints[(key,)] = _fingerprint(value)
+
+        for plant in (data or {}).get("plantList") or []:
+            uid = plant.get("plantUid")
+            # the nodes the plant record is read from, None when one has no key
+            plant_paths: list[tuple] | None = [(uid,)] if uid is not None else None
+            if uid is not None:
+                fingerprints[(uid,)] = _fingerprint(plant, _PLANT_CHILDREN)
+            device_records = []
+            for device in plant.get("devices") or []:
+                device_sn = device.get("deviceSn")
+                if device_sn is None:
+                    device_records.append(Device.from_raw(device))
+                    plant_paths = None
+                    continue
+                statistics = _statistics(device)
+                device_path = (uid, "devices", device_sn)
+                device_paths = [device_path, (*device_path, "deviceStatisticsData")]
+                fingerprints[device_path] = _fingerprint(device, _DEVICE_CHILDREN)
+                fingerprints[device_paths[1]] = _fingerprint(
+                    statistics, _STATISTICS_CHILDREN
+                )
+                for pv in statistics.get("pvList") or []:
+                    path = (*device_path, "pvList", pv.get("pvNo"))
+                    device_paths.append(path)
+                    fingerprints[path] = _fingerprint(pv)
+                for grid in statistics.get("gridList") or []:
+                    path = (*device_path, "gridList", grid.get("gridNo"))
+                    device_paths.append(path)
+                    fingerprints[path] = _fingerprint(grid)
+                record = read(device_path, device_paths, lambda: Device.from_raw(device))
+                device_records.append(record)
+                devices[device_sn] = record
+                for pv_string in record.pv_strings:
+                    pv_strings.setdefault((device_sn, pv_string.no), pv_string)
+                for grid_phase in record.grid_phases:
+                    grid_phases.setdefault((device_sn, grid_phase.no), grid_phase)
+                if plant_paths is not None:
+                    plant_paths.extend(device_paths)
+            battery_records = []
+            for battery in plant.get("batteries") or []:
+                bat_sn = battery.get("batSn")
+                if bat_sn is None:
+                    battery_records.append(Battery.from_raw(battery))
+                    plant_paths = None
+                    continue
+                path = (uid, "batteries", bat_sn)
+                fingerprints[path] = _fingerprint(battery)
+                record = read(path, (path,), lambda: Battery.from_raw(battery))
+                battery_records.append(record)
+                batteries[bat_sn] = record
+                if plant_paths is not None:
+                    plant_paths.append(path)
+            for module in plant.get("modules") or []:
+                module_sn = module.get("moduleSn")
+                if module_sn is not None:
+                    path = (uid, "modules", module_sn)
+                    fingerprints[path] = _fingerprint(module)
+                    record = read(path, (path,), lambda: Module.from_raw(module))
+                    modules[module_sn] = record
+            for ems in plant.get("emsModules") or []:
+                if ems.get("emsModuleSn") is not None:
+                    ems_modules[ems["emsModuleSn"]] = ems
+                    fingerprints[(uid, "emsModules", ems["emsModuleSn"])] = _fingerprint(ems)
+
+            def build_plant() -> Plant:
+                return Plant.from_raw(plant, tuple(device_records), tuple(battery_records))
+
+            if plant_paths is not None:
+                record = read((uid,), plant_paths, build_plant)
+            else:
+                record = build_plant()
+            if uid is not None:
+                plants[uid] = record
+            if record.name is not None:
+                plants_by_name.setdefault(record.name, record)
+
+        self.plants: Mapping[str, Plant] = MappingProxyType(plants)
+        self.plants_by_name: Mapping[str, Plant] = MappingProxyType(plants_by_name)
+        self.devices: Mapping[str, Device] = MappingProxyType(devices)
+        self.pv_strings: Mapping[tuple[str, Any], PvString] = MappingProxyType(pv_strings)
+        self.grid_phases: Mapping[tuple[str, Any], GridPhase] = MappingProxyType(grid_phases)
+        self.batteries: Mapping[str, Battery] = MappingProxyType(batteries)
+        self.modules: Mapping[str, Module] = MappingProxyType(modules)
+        self.ems_modules: Mapping[str, dict] = MappingProxyType(ems_modules)
+        self.fingerprints: Mapping[tuple, int] = MappingProxyType(fingerprints)
+        self._records: Mapping[tuple, tuple[tuple, Any]] = MappingProxyType(records)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Allow each table to be set once, while the index is built."""
+        if hasattr(self, name):
+            raise AttributeError(f"PlantIndex.{name} is read only")
+        object.__setattr__(self, name, value)
+
+    def plant(self, plant_uid: str | None, plant_name: str | None = None) -> Plant | None:
+        """Return a plant by uid, falling back to its name."""
+        plant = self.plants.get(plant_uid) if plant_uid is not None else None
+        if plant is None and plant_name is not None:
+            plant = self.plants_by_name.get(plant_name)
+        return plant
+
+    def device(self, device_sn: str | None) -> Device | None:
+        """Return an inverter by serial number."""
+        return self.devices.get(device_sn) if device_sn is not None else None
+
+    def pv_string(self, device_sn: str | None, pv_no: Any) -> PvString | None:
+        """Return one PV string of an inverter."""
+        return self.pv_strings.get((device_sn, pv_no))
+
+    def grid_phase(self, device_sn: str | None, grid_no: Any) -> GridPhase | None:
+        """Return one grid phase of an inverter."""
+        return self.grid_phases.get((device_sn, grid_no))
+
+    def battery(self, bat_sn: str | None) -> Battery | None:
+        """Return a battery by serial number."""
+        return self.batteries.get(bat_sn) if bat_sn is not None else None
+
+    def module(self, module_sn: str | None) -> Module | None:
+        """Return a SEC meter module by serial number."""
+        return self.modules.get(module_sn) if module_sn is not None else None
+
+    def ems_module(self, ems_sn: str | None) -> dict | None:
+        """Return an EMS module by serial number."""
+        return self.ems_modules.get(ems_sn) if ems_sn is not None else None
+
+
+EMPTY_INDEX = PlantIndex(None)
+
+
+def _path_variants(path: tuple) -> Iterable[tuple]:
+    """Yield a path and its forms with ANY in place of serial numbers."""
+    positions = [position for position in _KEY_POSITIONS if position < len(path)]
+    for wildcards in product((False, True), repeat=len(positions)):
+        variant = list(path)
+        for position, wildcard in zip(positions, wildcards):
+            if wildcard:
+                variant[position] = ANY
+        yield tuple(variant)
+
+
+class PathListeners:
+    """Coordinator listeners keyed by the data paths they read.
+
+    A listener subscribed without paths is notified of every change. A
+    subscribed path may hold ANY in place of a serial number or string
+    number, (plantUid, "devices", ANY) then follows every inverter of the
+    plant.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._by_path: dict[tuple, dict[Callable[[], None], None]] = {}
+        self._always: dict[Callable[[], None], None] = {}
+
+    def add(
+        self, paths: Iterable[tuple] | None, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Subscribe a listener to its paths and return its unsubscribe."""
+        if paths is None:
+            self._always[update_callback] = None
+            return lambda: self._always.pop(update_callback, None)
+
+        paths = tuple(paths)
+        for path in paths:
+            self._by_path.setdefault(path, {})[update_callback] = None
+
+        def remove() -> None:
+            for path in paths:
+                listeners = self._by_path.get(path)
+                if listeners is not None:
+                    listeners.pop(update_callback, None)
+                    if not listeners:
+                        del self._by_path[path]
+
+        return remove
+
+    def listeners(self, changed: Iterable[tuple]) -> list[Callable[[], None]]:
+        """Return the listeners to notify of the changed paths, once each."""
+        found = dict(self._always)
+        for path in changed:
+            for variant in _path_variants(path):
+                listeners = self._by_path.get(variant)
+                if listeners:
+                    found.update(listeners)
+        return list(found)
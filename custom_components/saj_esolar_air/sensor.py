@@ -15,11 +15,9 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
-    UnitOfEnergy,
     UnitOfPower,
-    UnitOfElectricPotential,
-    UnitOfElectricCurrent,
-    UnitOfTemperature,
+    UnitOfInformation,
+    UnitOfTime,
     EntityCategory,
 )
 from homeassistant.core import HomeAssistant, callback
@@ -78,6 +76,7 @@ from .const import (
     B_EXPORT,
     B_IMPORT,
     P_TODAY_ALARM_NUM, ALARM_LIST,
+    P_STALE_DATA, STALE_DATA, P_ENDPOINTS,
     P_GRID_AC1,
     P_GRID_AC2,
     P_GRID_AC3, I_TODAY, I_YESTERDAY, I_MONTH, I_LAST_MONTH, I_TOTAL, EH_TODAY, EH_TOTAL, I_PC,
@@ -88,32 +87,62 @@ from .const import (
     PLANT_RUNNING_STATE_OFFLINE,
 )
 
-ICON_POWER = "mdi:solar-power"
-ICON_PANEL = "mdi:solar-panel"
-ICON_LIGHTNING = "mdi:lightning-bolt"
-ICON_LIGHTNING_CIRCLE = "mdi:lightning-bolt-circle"
-ICON_SOCKET = "mdi:power-socket-de"
-ICON_TRIANGLE = "mdi:flash-triangle-outline"
-ICON_METER = "mdi:meter-electric-outline"
-ICON_GRID = "mdi:transmission-tower"
-ICON_GRID_EXPORT = "mdi:transmission-tower-export"
-ICON_GRID_IMPORT = "mdi:transmission-tower-import"
-ICON_THERMOMETER = "mdi:thermometer"
-ICON_UPDATE = "mdi:update"
-ICON_ALARM = "mdi:alarm-light"
-ICON_CURRENT_DC = "mdi:current-dc"
-ICON_CURRENT_AC = "mdi:current-ac"
-
-from .sensor_helpers import offline_blocks_live_sensor
-
-_LIVE_BATTERY_PROPS = frozenset({
-    "batSoc", "batTemperature", "batPower", "batCurrent", "batVoltage",
-})
+from .sensor_descriptions import (
+    BATTERY_PROPS,
+    BATTERY_SENSORS,
+    BUILTIN_BATTERY_PROPS,
+    EXTERNAL_BATTERY_PROPS,
+    GRID_PHASE_SENSORS,
+    ICON_ALARM,
+    ICON_DOWNLOAD,
+    ICON_PANEL,
+    ICON_POWER,
+    ICON_REQUEST_ERRORS,
+    ICON_REQUESTS,
+    ICON_TIMER,
+    ICON_UPDATE,
+    INVERTER_ENERGY_TOTAL,
+    INVERTER_GRID_POWER,
+    INVERTER_POWER,
+    INVERTER_SENSORS,
+    INVERTER_TEMPERATURE,
+    METER_GRID_POWER,
+    NODE_GRID,
+    NODE_PV,
+    PLANT_BATTERY_ENERGY_SOURCES,
+    PLANT_ENERGY_SENSORS,
+    PLANT_METER_ENERGY_SOURCES,
+    PLANT_SENSORS,
+    PV_STRING_SENSORS,
+    ESolarSensorEntityDescription,
+    phase_letter,
+)
+
+# refresh cycle metric: name, unit, device class, icon
+CYCLE_METRICS = {
+    "duration_ms": ("Refresh duration", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION, ICON_TIMER),
+    "requests": ("Refresh requests", None, None, ICON_REQUESTS),
+    "errors": ("Refresh request errors", None, None, ICON_REQUEST_ERRORS),
+    "bytes": ("Refresh data received", UnitOfInformation.BYTES, SensorDeviceClass.DATA_SIZE, ICON_DOWNLOAD),
+    "request_time_ms": ("Refresh request time", UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION, ICON_TIMER),
+}
+
+from .model import Battery, Device, GridPhase, Module, Plant, PvString, Record
+from .plant_index import ANY
+from .sensor_helpers import (
+    offline_blocks_live_sensor,
+    publish_state,
+    subscribe_live_updates,
+)
 
 
 def is_float_and_not_int(num):
     return isinstance(num, float) and not isinstance(num, int)
 
+
+def _watt_hours(kilo_watt_hours: float | None) -> float | None:
+    return None if kilo_watt_hours is None else kilo_watt_hours * 1000
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -151,30 +180,23 @@ async def async_setup_entry(
             #  3 - AC Coupling - Plant with PV inverter with builtin battery (device type: 2, AC Coupling Inverter)
             
             _LOGGER.debug(
-                "Setting up ESolarSensorPlantTotalEnergy sensor for %s",
+                "Setting up ESolarPlantSensor sensors for %s",
                 plant["plantName"],
             )
-            plant_entities.append(
-                ESolarSensorPlantTotalEnergy( coordinator, plant["plantName"], plant["plantUid"] )
-            )
-            plant_entities.append(
-                ESolarSensorPlantTodayEnergy( coordinator, plant["plantName"], plant["plantUid"] )
-            )
-            plant_entities.append(
-                ESolarSensorPlantMonthEnergy( coordinator, plant["plantName"], plant["plantUid"] )
-            )
-            plant_entities.append(
-                ESolarSensorPlantYearEnergy( coordinator, plant["plantName"], plant["plantUid"] )
-            )
-            plant_entities.append(
-                ESolarSensorPlantPeakPower( coordinator, plant["plantName"], plant["plantUid"] )
-            )
+            for description in PLANT_SENSORS:
+                plant_entities.append(
+                    ESolarPlantSensor(coordinator, plant["plantName"], plant["plantUid"], description)
+                )
             plant_entities.append(
                 ESolarSensorPlantLastUploadTime( coordinator, plant["plantName"], plant["plantUid"] )
             )
             plant_entities.append(
                 ESolarSensorPlantTodayEquivalentHours( coordinator, plant["plantName"], plant["plantUid"] )
             )
+            for metric in CYCLE_METRICS:
+                plant_entities.append(
+                    ESolarSensorPlantCycleMetric(coordinator, plant["plantName"], plant["plantUid"], metric)
+                )
 
 
             plant_entities.extend(
@@ -183,12 +205,8 @@ async def async_setup_entry(
                 )
             )
 
-            if plant["type"] in [1,3] and (("hasBattery" in plant and plant["hasBattery"] == 1) or "hasBattery" not in plant):
-                sources = ["todayBuyEnergy", "todayChargeEnergy", "todayDisChargeEnergy", "todayLoadEnergy", "todaySellEnergy",
-                           "totalBuyEnergy", "totalChargeEnergy", "totalDisChargeEnergy", "totalLoadEnergy", "totalSellEnergy",
-                           "yearBuyEnergy", "yearBatChgEnergy", "yearBatDischgEnergy", "yearLoadEnergy", "yearSellEnergy",
-                           "monthBuyEnergy", "monthBatChgEnergy", "monthBatDischgEnergy", "monthLoadEnergy", "monthSellEnergy",
-                           ]
+            if plant.get("type") in [1,3] and (("hasBattery" in plant and plant["hasBattery"] == 1) or "hasBattery" not in plant):
+                sources = PLANT_BATTERY_ENERGY_SOURCES
 
                 _LOGGER.debug(
                     "Setting up ESolarSensorPlantBatterySoC sensor for %s",
@@ -200,80 +218,59 @@ async def async_setup_entry(
                     )
                 )
 
-            elif plant["type"] in [0,1] and "isInstallMeter" in plant and plant["isInstallMeter"] == 1:
-                sources = ["todayBuyEnergy", "todayLoadEnergy", "todaySellEnergy",
-                           "totalBuyEnergy", "totalLoadEnergy", "totalSellEnergy",
-                           "yearBuyEnergy", "yearLoadEnergy", "yearSellEnergy",
-                           "monthBuyEnergy", "monthLoadEnergy", "monthSellEnergy",
-                           ]
+            elif plant.get("type") in [0,1] and "isInstallMeter" in plant and plant["isInstallMeter"] == 1:
+                sources = PLANT_METER_ENERGY_SOURCES
             else:
                 # Their value is the same as *PvEnergy if we don't have meter
                 # sources = ["todaySellEnergy", "totalSellEnergy", "yearSellEnergy", "monthSellEnergy"]
-                sources = []
+                sources = ()
 
 
             for source in sources:
                 if source in plant and plant[source] is not None and is_float_and_not_int(plant[source]):
                     _LOGGER.debug(
-                        "Setting up ESolarSensorPlantEnergy-%s sensors for %s",
+                        "Setting up ESolarPlantSensor-%s sensors for %s",
                         source,
                         plant["plantName"],
                     )
                     plant_entities.append(
-                        ESolarSensorPlantEnergy(
-                            coordinator, plant["plantName"], plant["plantUid"], source
+                        ESolarPlantSensor(
+                            coordinator, plant["plantName"], plant["plantUid"], PLANT_ENERGY_SENSORS[source]
                         )
                     )
 
 
             if use_inverter_sensors:
-                for device in plant["deviceSnList"]:
+                for device in plant.get("deviceSnList") or []:
                     _LOGGER.debug(
-                        "Setting up ESolarInverterEnergyTotal sensor for %s and device %s",
+                        "Setting up ESolarDeviceSensor sensors for %s and device %s",
                         plant["plantName"],
                         device,
                     )
                     device_entities.append(
-                        ESolarInverterEnergyTotal( coordinator, plant["plantName"], plant["plantUid"], device)
-                    )
-                    _LOGGER.debug(
-                        "Setting up ESolarInverterPower sensor for %s and device %s",
-                        plant["plantName"],
-                        device,
+                        ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device, INVERTER_ENERGY_TOTAL)
                     )
                     device_entities.append(
-                        ESolarInverterPower( coordinator, plant["plantName"], plant["plantUid"], device, use_pv_grid_attributes)
-                    )
-                    _LOGGER.debug(
-                        "Setting up ESolarInverter other sensors for %s and device %s",
-                        plant["plantName"],
-                        device,
+                        ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device, INVERTER_POWER)
                     )
 
-                    for kit in plant["devices"]:
+                    for kit in plant.get("devices") or []:
                         if kit["deviceSn"] == device:
-                            if "pvList" in kit["deviceStatisticsData"]:
+                            if "pvList" in (kit.get("deviceStatisticsData") or {}):
                                 for pv in kit["deviceStatisticsData"]["pvList"]:
-                                    device_entities.append(
-                                        ESolarInverterPV( coordinator, plant["plantName"], plant["plantUid"], device, pv['pvNo'])
-                                    )
-                                    device_entities.append(
-                                        ESolarInverterPC(coordinator, plant["plantName"], plant["plantUid"], device, pv['pvNo'])
-                                    )
-                                    device_entities.append(
-                                        ESolarInverterPW(coordinator, plant["plantName"], plant["plantUid"], device, pv['pvNo'])
-                                    )
+                                    for description in PV_STRING_SENSORS:
+                                        device_entities.append(
+                                            ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device, description, pv['pvNo'])
+                                        )
                             if kit.get("deviceTemp", 0) != 0 or kit.get("type", 0) == 0:
                                 device_entities.append(
-                                    ESolarInverterTemperature(coordinator, plant["plantName"], plant["plantUid"], device)
+                                    ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device, INVERTER_TEMPERATURE)
                                 )
 
-                    device_entities.append(
-                        ESolarInverterEnergyToday(coordinator, plant["plantName"], plant["plantUid"], device)
-                    )
-                    device_entities.append(
-                        ESolarInverterEnergyMonth(coordinator, plant["plantName"], plant["plantUid"], device)
-                    )
+                    for description in INVERTER_SENSORS:
+                        device_entities.append(
+                            ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device, description)
+                        )
                     device_entities.append(
                         ESolarSensorInverterTodayAlarmNum(coordinator, plant["plantName"], plant["plantUid"], device)
                     )
@@ -281,9 +278,9 @@ async def async_setup_entry(
                         ESolarSensorInverterPeakPower( coordinator, plant["plantName"], plant["plantUid"], device)
                     )
 
-            if use_inverter_sensors and plant["type"] in [1,3] :
-                for device_sn in plant["deviceSnList"]:
-                    for device in plant["devices"]:
+            if use_inverter_sensors and plant.get("type") in [1,3] :
+                for device_sn in plant.get("deviceSnList") or []:
+                    for device in plant.get("devices") or []:
                         if device["deviceSn"] == device_sn:
                             if ("hasBattery" in device and device["hasBattery"] == 1) or "hasBattery" not in device:
                                 _LOGGER.debug(
@@ -301,97 +298,51 @@ async def async_setup_entry(
                                 )
 
             if use_pv_grid_attributes: # in all types
-                for device_sn in plant["deviceSnList"]:
-                    for device in plant["devices"]:
+                for device_sn in plant.get("deviceSnList") or []:
+                    for device in plant.get("devices") or []:
                         if device["deviceSn"] == device_sn:
-                            if "gridList" in device["deviceStatisticsData"]:
+                            if "gridList" in (device.get("deviceStatisticsData") or {}):
                                 for grid in device["deviceStatisticsData"]["gridList"]:
-                                    device_entities.append(
-                                        ESolarInverterGV(coordinator, plant["plantName"], plant["plantUid"], device_sn, grid["gridNo"])
-                                    )
-                                    device_entities.append(
-                                        ESolarInverterGC(coordinator, plant["plantName"], plant["plantUid"], device_sn, grid["gridNo"])
-                                    )
+                                    for description in GRID_PHASE_SENSORS:
+                                        device_entities.append(
+                                            ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device_sn, description, grid["gridNo"])
+                                        )
                             device_entities.append(
-                                ESolarInverterGridPowerWatt(coordinator, plant["plantName"], plant["plantUid"], device_sn)
+                                ESolarDeviceSensor(coordinator, plant["plantName"], plant["plantUid"], device_sn, INVERTER_GRID_POWER)
                             )
 
             if "modules" in plant and plant["modules"] is not None:
                 for module in plant["modules"]:
                     if "moduleSn" in module and module["moduleSn"] is not None:
                         _LOGGER.debug(
-                            "Setting up ESolarSensorMeterPower-power for %s and module %s",
+                            "Setting up ESolarMeterSensor-power for %s and module %s",
                             plant["plantName"],
                             module["moduleSn"],
                         )
                         meter_entities.append(
-                            ESolarSensorMeterPower( coordinator, plant["plantName"], plant["plantUid"], module["moduleSn"])
+                            ESolarMeterSensor(coordinator, plant["plantName"], plant["plantUid"], module["moduleSn"], METER_GRID_POWER)
                         )
 
             if "batteries" in plant and plant["batteries"] is not None:
                 for battery_index, battery in enumerate(plant["batteries"]):
                     if "batSn" in battery and battery["batSn"] is not None:
-                        bat_label = battery_index + 1
                         _LOGGER.debug(
-                            "Setting up ESolarSensorBatteryEntities for %s and battery %s",
+                            "Setting up ESolarBatterySensors for %s and battery %s",
                             plant["plantName"],
                             battery["batSn"],
                         )
-                        bat_entities.append(
-                            ESolarSensorBatteryEntity(
-                                coordinator,
-                                plant["plantName"],
-                                plant["plantUid"],
-                                battery["batSn"],
-                                "batSoc",
-                                1,
-                                battery_index=bat_label,
-                            )
-                        )
-                        bat_entities.append(
-                            ESolarSensorBatteryEntity(
-                                coordinator,
-                                plant["plantName"],
-                                plant["plantUid"],
-                                battery["batSn"],
-                                "batTemperature",
-                                battery_index=bat_label,
-                            )
+                        props = BATTERY_PROPS + (
+                            BUILTIN_BATTERY_PROPS if battery.get("type", 1) == 2 else EXTERNAL_BATTERY_PROPS
                         )
-                        if battery.get("type", 1) == 2:
-                            _LOGGER.debug(
-                                "Setting up ESolarSensorBatteryEntities for %s and builtin battery %s",
-                                plant["plantName"],
-                                battery["batSn"],
-                            )
-                            for prop in (
-                                "batVoltage",
-                                "batCurrent",
-                                "batPower",
-                                "todayBatChgEnergy",
-                                "todayBatDisEnergy",
-                                "totalBatChgEnergy",
-                                "totalBatDisEnergy",
-                            ):
-                                bat_entities.append(
-                                    ESolarSensorBatteryEntity(
-                                        coordinator,
-                                        plant["plantName"],
-                                        plant["plantUid"],
-                                        battery["batSn"],
-                                        prop,
-                                        battery_index=bat_label,
-                                    )
-                                )
-                        else:
+                        for prop in props:
                             bat_entities.append(
-                                ESolarSensorBatteryEntity(
+                                ESolarBatterySensor(
                                     coordinator,
                                     plant["plantName"],
                                     plant["plantUid"],
                                     battery["batSn"],
-                                    "batSoh",
-                                    battery_index=bat_label,
+                                    BATTERY_SENSORS[prop],
+                                    battery_index=battery_index + 1,
                                 )
                             )
 
@@ -406,7 +357,7 @@ class ESolarPlant(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=((plant_uid,),))
         self._coordinator = coordinator
         self._plant_name = plant_name
         self._plant_uid = plant_uid
@@ -416,8 +367,8 @@ class ESolarPlant(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def _offline_blocks_live_sensor(
         self,
-        plant: dict,
-        device: dict | None = None,
+        plant: Plant,
+        device: Device | None = None,
         *,
         report_zero: bool = False,
     ) -> bool:
@@ -426,6 +377,10 @@ class ESolarPlant(CoordinatorEntity[ESolarCoordinator], SensorEntity):
             self, plant, device, report_zero=report_zero
         )
 
+    def _plant(self) -> Plant | None:
+        """Return the plant of the sensor from the coordinator index."""
+        return self._coordinator.index.plant(self._plant_uid, self._plant_name)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device_info of the device."""
@@ -434,12 +389,12 @@ class ESolarPlant(CoordinatorEntity[ESolarCoordinator], SensorEntity):
         plant_owner = None
         plant_owner_email = None
 
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                plant_no = plant["plantNo"]
-                plant_id = plant["plantId"]
-                plant_owner = plant["ownerName"]
-                plant_owner_email = plant["ownerEmail"]
+        plant = self._plant()
+        if plant is not None:
+            plant_no = plant.plant_no
+            plant_id = plant.plant_id
+            plant_owner = plant.owner_name
+            plant_owner_email = plant.owner_email
 
         device_info = DeviceInfo(
             manufacturer=MANUFACTURER,
@@ -457,7 +412,7 @@ class ESolarPlant(CoordinatorEntity[ESolarCoordinator], SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.process_data()
-        self.async_write_ha_state()
+        publish_state(self, self._coordinator)
 
     @property
     def native_value(self):
@@ -470,7 +425,14 @@ class ESolarDevice(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, inverter_sn = None) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=(
+                (plant_uid,),
+                (plant_uid, "devices", inverter_sn),
+                (plant_uid, "devices", inverter_sn, "deviceStatisticsData"),
+            ),
+        )
         self._coordinator = coordinator
         self._plant_name = plant_name
         self._plant_uid = plant_uid
@@ -484,8 +446,8 @@ class ESolarDevice(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def _offline_blocks_live_sensor(
         self,
-        plant: dict,
-        device: dict | None = None,
+        plant: Plant,
+        device: Device | None = None,
         *,
         report_zero: bool = False,
     ) -> bool:
@@ -494,20 +456,25 @@ class ESolarDevice(CoordinatorEntity[ESolarCoordinator], SensorEntity):
             self, plant, device, report_zero=report_zero
         )
 
+    def _plant(self) -> Plant | None:
+        """Return the plant of the sensor from the coordinator index."""
+        return self._coordinator.index.plant(self._plant_uid, self._plant_name)
+
+    def _device(self) -> Device | None:
+        """Return the inverter of the sensor from the coordinator index."""
+        return self._coordinator.index.device(self._inverter_sn)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device_info of the device."""
 
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if "devices" in plant and plant["devices"] is not None:
-                    for device in plant["devices"]:
-                        if device["deviceSn"] == self._inverter_sn:
-                            self._device_model = device["deviceModel"] or None
-                            self._hw_version = device["masterMCUFw"] or None
-                            self._sw_version = device["displayFw"] or None
-                            #self._device_name = f"Inverter {device["aliases"]}" or f"Inverter {device["deviceSn"]}" or None
-                            self._device_pc = device["devicePc"] or None
+        device = self._device()
+        if device is not None:
+            self._device_model = device.model or None
+            self._hw_version = device.master_mcu_fw or None
+            self._sw_version = device.display_fw or None
+            #self._device_name = f"Inverter {device["aliases"]}" or f"Inverter {device["deviceSn"]}" or None
+            self._device_pc = device.device_pc or None
 
         device_info = DeviceInfo(
             manufacturer=MANUFACTURER,
@@ -531,7 +498,7 @@ class ESolarDevice(CoordinatorEntity[ESolarCoordinator], SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.process_data()
-        self.async_write_ha_state()
+        publish_state(self, self._coordinator)
 
     @property
     def native_value(self):
@@ -544,7 +511,9 @@ class ESolarMeter(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, module_sn = None) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, context=((plant_uid,), (plant_uid, "modules", module_sn))
+        )
 
         self._coordinator = coordinator
         self._plant_name = plant_name
@@ -557,8 +526,8 @@ class ESolarMeter(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def _offline_blocks_live_sensor(
         self,
-        plant: dict,
-        device: dict | None = None,
+        plant: Plant,
+        device: Device | None = None,
         *,
         report_zero: bool = False,
     ) -> bool:
@@ -567,18 +536,22 @@ class ESolarMeter(CoordinatorEntity[ESolarCoordinator], SensorEntity):
             self, plant, device, report_zero=report_zero
         )
 
+    def _plant(self) -> Plant | None:
+        """Return the plant of the sensor from the coordinator index."""
+        return self._coordinator.index.plant(self._plant_uid, self._plant_name)
+
+    def _module(self) -> Module | None:
+        """Return the meter module of the sensor from the coordinator index."""
+        return self._coordinator.index.module(self._module_sn)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device_info of the device."""
 
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if "modules" in plant and plant["modules"] is not None:
-                    for module in plant["modules"]:
-                        if module["moduleSn"] == self._module_sn:
-                            self._device_model = module["moduleModel"] or None
-                            self._sw_version = module["moduleFw"] or None
-                            break
+        module = self._module()
+        if module is not None:
+            self._device_model = module.model or None
+            self._sw_version = module.fw or None
 
         device_info = DeviceInfo(
             manufacturer=MANUFACTURER,
@@ -602,7 +575,7 @@ class ESolarMeter(CoordinatorEntity[ESolarCoordinator], SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.process_data()
-        self.async_write_ha_state()
+        publish_state(self, self._coordinator)
 
     @property
     def native_value(self):
@@ -615,7 +588,9 @@ class ESolarBattery(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, bat_sn = None, battery_index: int = 1) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, context=((plant_uid,), (plant_uid, "batteries", bat_sn))
+        )
 
         self._coordinator = coordinator
         self._plant_name = plant_name
@@ -630,8 +605,8 @@ class ESolarBattery(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def _offline_blocks_live_sensor(
         self,
-        plant: dict,
-        device: dict | None = None,
+        plant: Plant,
+        device: Device | None = None,
         *,
         report_zero: bool = False,
     ) -> bool:
@@ -640,21 +615,25 @@ class ESolarBattery(CoordinatorEntity[ESolarCoordinator], SensorEntity):
             self, plant, device, report_zero=report_zero
         )
 
+    def _plant(self) -> Plant | None:
+        """Return the plant of the sensor from the coordinator index."""
+        return self._coordinator.index.plant(self._plant_uid, self._plant_name)
+
+    def _battery(self) -> Battery | None:
+        """Return the battery of the sensor from the coordinator index."""
+        return self._coordinator.index.battery(self._bat_sn)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device_info of the device."""
 
         bms_sn = None
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if "batteries" in plant and plant["batteries"] is not None:
-                    for battery in plant["batteries"]:
-                        if battery["batSn"] == self._bat_sn:
-                            self._device_model = battery["batModel"] or None
-                            self._sw_version = battery["bmsSoftwareVersion"] or None
-                            self._hw_version = battery["bmsHardwareVersion"] or None
-                            bms_sn = battery["bmsSn"] or None
-                            break
+        battery = self._battery()
+        if battery is not None:
+            self._device_model = battery.model or None
+            self._sw_version = battery.bms_software_version or None
+            self._hw_version = battery.bms_hardware_version or None
+            bms_sn = battery.bms_sn or None
 
         device_info = DeviceInfo(
             manufacturer=MANUFACTURER,
@@ -679,7 +658,7 @@ class ESolarBattery(CoordinatorEntity[ESolarCoordinator], SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.process_data()
-        self.async_write_ha_state()
+        publish_state(self, self._coordinator)
 
     @property
     def native_value(self):
@@ -692,7 +671,7 @@ class ESolarEMS(CoordinatorEntity[ESolarCoordinator], SensorEntity):
 
     def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, ems_sn = None) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=((plant_uid, "emsModules", ems_sn),))
 
         self._coordinator = coordinator
         self._plant_name = plant_name
@@ -705,21 +684,25 @@ class ESolarEMS(CoordinatorEntity[ESolarCoordinator], SensorEntity):
         self._hw_version: None | str = None
         self._pc: None | str = None
 
+    def _plant(self) -> Plant | None:
+        """Return the plant of the sensor from the coordinator index."""
+        return self._coordinator.index.plant(self._plant_uid, self._plant_name)
+
+    def _ems(self) -> dict | None:
+        """Return the EMS module of the sensor from the coordinator index."""
+        return self._coordinator.index.ems_module(self._ems_sn)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device_info of the device."""
 
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if "emsModules" in plant and plant["emsModules"] is not None:
-                    for ems in plant["emsModules"]:
-                        if ems["emsModuleSn"] == self._ems_sn:
-                            self._device_name = ems["emsModuleName"] if ems["emsModuleName"] is not None and ems["emsModuleName"] != '--' else f"EMS {ems['emsModuleSn']}" or None
-                            self._device_model = ems["emsModel"] or None
-                            self._sw_version = ems["firmwareVersion"] or None
-                            self._hw_version = ems["hardwareVersion"] or None
-                            self._pc = ems["emsModulePc"] or None
-                            break
+        ems = self._ems()
+        if ems is not None:
+            self._device_name = ems["emsModuleName"] if ems["emsModuleName"] is not None and ems["emsModuleName"] != '--' else f"EMS {ems['emsModuleSn']}" or None
+            self._device_model = ems["emsModel"] or None
+            self._sw_version = ems["firmwareVersion"] or None
+            self._hw_version = ems["hardwareVersion"] or None
+            self._pc = ems["emsModulePc"] or None
 
         device_info = DeviceInfo(
             manufacturer=MANUFACTURER,
@@ -744,7 +727,7 @@ class ESolarEMS(CoordinatorEntity[ESolarCoordinator], SensorEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.process_data()
-        self.async_write_ha_state()
+        publish_state(self, self._coordinator)
 
     @property
     def native_value(self):
@@ -752,251 +735,230 @@ class ESolarEMS(CoordinatorEntity[ESolarCoordinator], SensorEntity):
         return self._attr_native_value
 
 
-class ESolarSensorPlant(ESolarPlant):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, use_pv_grid_attributes) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._use_pv_grid_attributes = use_pv_grid_attributes
-        self._last_updated: datetime.datetime | None = None
+class ESolarDescribedSensor:
+    """Sensor reading one value of one index node, as its description says.
+
+    One class serves every table driven sensor: the description names the
+    record, the value getter and the offline handling, so an update is one
+    index lookup and one getter call on an already parsed record. The concrete classes
+    below only add the device the sensor belongs to.
+    """
+
+    entity_description: ESolarSensorEntityDescription
+    _key = None
+
+    def _describe(self, description: ESolarSensorEntityDescription, serial=None, key=None) -> None:
+        """Set up the sensor of a description."""
+        self.entity_description = description
+        self._key = key
+        fields = {
+            "plant": self._plant_name,
+            "uid": self._plant_uid,
+            "sn": serial,
+            "key": key,
+            "letter": phase_letter(key),
+        }
+        self._attr_unique_id = description.unique_id_format.format(**fields)
+        self._attr_name = description.name_format.format(**fields)
         self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_{plant_uid}"
-
-        self._attr_icon = ICON_PANEL
-        self._attr_name = f"Plant {self._plant_name} Status"
         self._attr_native_value = None
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = {}
 
-        self._attr_extra_state_attributes = {
-            P_UID: None,
-            P_CO2: None,
-            P_COAL: None,
-            P_TREES: None,
-            P_YCO2: None,
-            P_YCOAL: None,
-            P_YTREES: None,
-            P_LATITUDE: None,
-            P_LONGITUDE: None,
-            P_PIC: None,
-            P_ADR: None,
-            P_FIRST_ONLINE: None,
-            P_OWNER_NAME: None,
-            P_OWNER_EMAIL: None,
-            P_NO: None,
-            P_ID: None,
-            S_POWER: None,
-        }
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                # if self._use_pv_grid_attributes:
-                #     self._attr_extra_state_attributes['Original data'] = plant
-
-                self._attr_extra_state_attributes[P_UID] = plant["plantUid"]
-                self._attr_extra_state_attributes[P_CO2] = plant["totalReduceCo2"]
-                self._attr_extra_state_attributes[P_COAL] = plant["totalCoal"]
-                self._attr_extra_state_attributes[P_TREES] = plant["totalPlantTreeNum"]
-                self._attr_extra_state_attributes[P_YCO2] = plant["yearReduceCo2"]
-                self._attr_extra_state_attributes[P_YCOAL] = plant["yearCoal"]
-                self._attr_extra_state_attributes[P_YTREES] = plant["yearPlantTreeNum"]
-                self._attr_extra_state_attributes[P_LATITUDE] = plant["latitude"]
-                self._attr_extra_state_attributes[P_LONGITUDE] = plant["longitude"]
-                self._attr_extra_state_attributes[P_PIC] = plant["plantLogo"]
-                self._attr_extra_state_attributes[P_ADR] = plant["fullAddress"]
-                self._attr_extra_state_attributes[P_FIRST_ONLINE] = plant["createDate"]
-                self._attr_extra_state_attributes[P_NO] = plant["plantNo"]
-                self._attr_extra_state_attributes[P_ID] = plant["plantId"]
-                self._attr_extra_state_attributes[P_OWNER_NAME] = plant['ownerName']
-                self._attr_extra_state_attributes[P_OWNER_EMAIL] = plant['ownerEmail']
-                self._attr_extra_state_attributes[S_POWER] = plant['systemPower']
-
-                # Setup state
-                if plant["runningState"] == 1:
-                    self._attr_native_value = "Normal"
-                elif plant["runningState"] == 2:
-                    self._attr_native_value = "Alarm"
-                elif plant["runningState"] == 3:
-                    self._attr_native_value = "Offline"
-                else:
-                    self._attr_native_value = None
-
-
-class ESolarSensorPlantTotalEnergy(ESolarPlant):
-    """Representation of an eSolar sensor for the plant."""
+    def _node(self) -> Record | None:
+        """Return the index record the description reads."""
+        return self._plant()
 
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
+    def _set_unavailable(self) -> None:
         self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_{plant_uid}"
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Energy Total "
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_native_value = None
-        self._attr_extra_state_attributes = {
-            I_TOTAL: None,
-        }
 
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[I_TOTAL] = plant["totalIncome"] if ("totalIncome" in plant and plant["totalIncome"] is not None and plant["totalIncome"] != '--' and float(plant["totalIncome"]) > 0.0 ) else plant["incomeTotal"]
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the live power updates too, when described so."""
+        await super().async_added_to_hass()
+        if self.entity_description.live_updates:
+            subscribe_live_updates(self, self._coordinator)
 
-                # Setup state
-                if float(plant["totalPvEnergy"]) > 0.0:
-                    self._attr_native_value = float(plant["totalPvEnergy"])
-                elif  float(plant["totalEnergy"]) > 0.0:
-                    self._attr_native_value = float(plant["totalEnergy"])
-                else:
-                    self._attr_available = False
+    def process_data(self):
+        description = self.entity_description
+        plant = self._plant()
+        if plant is None:
+            return
+        if description.live and self._offline_blocks_live_sensor(
+            plant, report_zero=description.strict
+        ):
+            return
+        if description.strict:
+            device = self._device()
+            if device is None:
+                self._set_unavailable()
+                return
+            if self._offline_blocks_live_sensor(plant, device, report_zero=True):
+                return
+        node = self._node()
+        if node is None:
+            if description.strict:
+                self._set_unavailable()
+            return
+        value = description.value_fn(node)
+        if value is not None:
+            self._attr_available = True
+            self._attr_native_value = value
+        elif description.strict or description.unavailable_without_value:
+            self._set_unavailable()
+        if description.unit_fn is not None:
+            unit = description.unit_fn(node)
+            if unit is not None:
+                self._attr_native_unit_of_measurement = unit
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(node)
 
 
-class ESolarSensorPlantTodayEnergy(ESolarPlant):
-    """Representation of a Saj eSolar sensor for the plant."""
+class ESolarPlantSensor(ESolarDescribedSensor, ESolarPlant):
+    """Described sensor of a plant."""
 
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, description: ESolarSensorEntityDescription) -> None:
         """Initialize the sensor."""
         super().__init__(
             coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
         )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_{plant_uid}_today"
-
-        self._attr_icon = ICON_METER
-        self._attr_name = f"Plant {self._plant_name} Energy Today "
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_native_value = None
-
-        self._attr_extra_state_attributes = {
-            I_TODAY: None,
-            I_YESTERDAY: None,
-        }
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
+        self._describe(description)
 
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[I_TODAY] = plant["todayIncome"] if ("todayIcome" in plant and plant["todayIncome"] is not None and float(plant["todayIncome"]) > 0) else plant["incomeToday"]
-                self._attr_extra_state_attributes[I_YESTERDAY] = plant["yesterdayIncome"]
-                # Setup state
-                self._attr_native_value = float(plant["todayPvEnergy"])
 
+class ESolarDeviceSensor(ESolarDescribedSensor, ESolarDevice):
+    """Described sensor of an inverter, its PV strings or its grid phases."""
 
-class ESolarSensorPlantMonthEnergy(ESolarPlant):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, inverter_sn, description: ESolarSensorEntityDescription, key=None) -> None:
         """Initialize the sensor."""
         super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
+            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
         )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_{plant_uid}_month"
-
-        self._attr_icon = ICON_METER
-        self._attr_name = f"Plant {self._plant_name} Energy Month"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_native_value = None
-
-        self._attr_extra_state_attributes = {
-            I_MONTH: None,
-            I_LAST_MONTH: None,
-        }
+        if description.node == NODE_PV:
+            self.coordinator_context = (*self.coordinator_context, (plant_uid, "devices", inverter_sn, "pvList", key))
+        elif description.node == NODE_GRID:
+            self.coordinator_context = (*self.coordinator_context, (plant_uid, "devices", inverter_sn, "gridList", key))
+        elif description is INVERTER_GRID_POWER:
+            self.coordinator_context = (*self.coordinator_context, (plant_uid, "devices", inverter_sn, "gridList", ANY))
+        self._describe(description, inverter_sn, key)
+
+    def _node(self) -> Device | PvString | GridPhase | None:
+        node = self.entity_description.node
+        if node == NODE_PV:
+            return self._coordinator.index.pv_string(self._inverter_sn, self._key)
+        if node == NODE_GRID:
+            return self._coordinator.index.grid_phase(self._inverter_sn, self._key)
+        return self._device()
+
+
+class ESolarMeterSensor(ESolarDescribedSensor, ESolarMeter):
+    """Described sensor of a SEC meter module."""
+
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, module_sn, description: ESolarSensorEntityDescription) -> None:
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, module_sn=module_sn
+        )
+        self._describe(description, module_sn)
 
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[I_MONTH] = plant["incomeMonth"] if ("incomeMonth" in plant and plant["incomeMonth"] is not None and float(plant["incomeMonth"]) > 0) else plant["monthIncome"]
-                self._attr_extra_state_attributes[I_LAST_MONTH] = plant["incomeLastMonth"]
-                # Setup state
-                self._attr_native_value = float(plant["monthPvEnergy"])
+    def _node(self) -> Module | None:
+        return self._module()
 
 
-class ESolarSensorPlantYearEnergy(ESolarPlant):
-    """Representation of an eSolar sensor for the plant."""
+class ESolarBatterySensor(ESolarDescribedSensor, ESolarBattery):
+    """Described sensor of a battery."""
 
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, bat_sn, description: ESolarSensorEntityDescription, battery_index: int = 1) -> None:
         """Initialize the sensor."""
         super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
+            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, bat_sn=bat_sn, battery_index=battery_index
         )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_{plant_uid}_year"
-
-        self._attr_icon = ICON_METER
-        self._attr_name = f"Plant {self._plant_name} Energy Year"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_native_value = None
+        self._describe(description, bat_sn)
 
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                # Setup state
-                self._attr_native_value = float(plant["yearPvEnergy"])
+    def _node(self) -> Battery | None:
+        return self._battery()
 
 
-class ESolarSensorPlantPeakPower(ESolarPlant):
+class ESolarSensorPlant(ESolarPlant):
     """Representation of an eSolar sensor for the plant."""
 
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, use_pv_grid_attributes) -> None:
         """Initialize the sensor."""
         super().__init__(
             coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
         )
+        self.coordinator_context = (*self.coordinator_context, (STALE_DATA,))
+        self._use_pv_grid_attributes = use_pv_grid_attributes
         self._last_updated: datetime.datetime | None = None
         self._attr_available = False
 
-        self._attr_unique_id = f"plantUid_peakpower_{plant_uid}"
+        self._attr_unique_id = f"plantUid_{plant_uid}"
 
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} Peak Power"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_icon = ICON_PANEL
+        self._attr_name = f"Plant {self._plant_name} Status"
         self._attr_native_value = None
 
+        self._attr_extra_state_attributes = {
+            P_UID: None,
+            P_CO2: None,
+            P_COAL: None,
+            P_TREES: None,
+            P_YCO2: None,
+            P_YCOAL: None,
+            P_YTREES: None,
+            P_LATITUDE: None,
+            P_LONGITUDE: None,
+            P_PIC: None,
+            P_ADR: None,
+            P_FIRST_ONLINE: None,
+            P_OWNER_NAME: None,
+            P_OWNER_EMAIL: None,
+            P_NO: None,
+            P_ID: None,
+            S_POWER: None,
+            P_STALE_DATA: {},
+        }
+
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                # Setup state
-                self._attr_native_value = float(plant.get("peakPower",0))
+        plant = self._plant()
+        if plant is None:
+            return
+        # Setup static attributes
+        self._attr_available = True
+        # if self._use_pv_grid_attributes:
+        #     self._attr_extra_state_attributes['Original data'] = plant
+
+        self._attr_extra_state_attributes[P_UID] = plant.uid
+        self._attr_extra_state_attributes[P_CO2] = plant.total_reduce_co2
+        self._attr_extra_state_attributes[P_COAL] = plant.total_coal
+        self._attr_extra_state_attributes[P_TREES] = plant.total_plant_tree_num
+        self._attr_extra_state_attributes[P_YCO2] = plant.year_reduce_co2
+        self._attr_extra_state_attributes[P_YCOAL] = plant.year_coal
+        self._attr_extra_state_attributes[P_YTREES] = plant.year_plant_tree_num
+        self._attr_extra_state_attributes[P_LATITUDE] = plant.latitude
+        self._attr_extra_state_attributes[P_LONGITUDE] = plant.longitude
+        self._attr_extra_state_attributes[P_PIC] = plant.plant_logo
+        self._attr_extra_state_attributes[P_ADR] = plant.full_address
+        self._attr_extra_state_attributes[P_FIRST_ONLINE] = plant.create_date
+        self._attr_extra_state_attributes[P_NO] = plant.plant_no
+        self._attr_extra_state_attributes[P_ID] = plant.plant_id
+        self._attr_extra_state_attributes[P_OWNER_NAME] = plant.owner_name
+        self._attr_extra_state_attributes[P_OWNER_EMAIL] = plant.owner_email
+        self._attr_extra_state_attributes[S_POWER] = plant.system_power
+        # data slices kept from before a failed request, with their age
+        stale = (self._coordinator.data.get(STALE_DATA) or {}).get(self._plant_name) or {}
+        self._attr_extra_state_attributes[P_STALE_DATA] = {
+            stage: info["age"] for stage, info in stale.items()
+        }
+
+        # Setup state
+        if plant.running_state == 1:
+            self._attr_native_value = "Normal"
+        elif plant.running_state == 2:
+            self._attr_native_value = "Alarm"
+        elif plant.running_state == 3:
+            self._attr_native_value = "Offline"
+        else:
+            self._attr_native_value = None
 
 
 class ESolarSensorPlantLastUploadTime(ESolarPlant):
@@ -1007,6 +969,11 @@ class ESolarSensorPlantLastUploadTime(ESolarPlant):
         super().__init__(
             coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
         )
+        self.coordinator_context = (
+            *self.coordinator_context,
+            (plant_uid, "devices", ANY),
+            (plant_uid, "devices", ANY, "deviceStatisticsData"),
+        )
         self._last_updated: datetime.datetime | None = None
         self._attr_available = False
 
@@ -1018,23 +985,23 @@ class ESolarSensorPlantLastUploadTime(ESolarPlant):
         self._attr_native_value = None
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                # Setup state
-                timezone = None
-                if "timeZone" in plant and plant["timeZone"] is not None:
-                    timezone = plant["timeZone"]
-
-                if "dataTime" in plant and plant["dataTime"] is not None:
-                    self._attr_native_value = extract_date(plant["dataTime"], timezone)
-                elif self._attr_native_value is None and "updateDate" in plant and plant["updateDate"] is not None:
-                    self._attr_native_value = extract_date(plant["updateDate"], timezone)
-                elif self._attr_native_value is None and "dataTime" in plant["devices"][0] and plant["devices"][0]["deviceStatisticsData"]["dataTime"] is not None:
-                    self._attr_native_value = extract_date(plant["devices"][0]["deviceStatisticsData"]["dataTime"], timezone)
-                elif self._attr_native_value is None and "updateDate" in plant["devices"][0] and plant["devices"][0]["deviceStatisticsData"]["updateDate"] is not None:
-                    self._attr_native_value = extract_date(plant["devices"][0]["deviceStatisticsData"]["updateDate"], timezone)
+        plant = self._plant()
+        if plant is None:
+            return
+        # Setup static attributes
+        self._attr_available = True
+        # Setup state
+        timezone = plant.time_zone
+        first = plant.devices[0] if plant.devices else None
+
+        if plant.data_time is not None:
+            self._attr_native_value = extract_date(plant.data_time, timezone)
+        elif self._attr_native_value is None and plant.update_date is not None:
+            self._attr_native_value = extract_date(plant.update_date, timezone)
+        elif self._attr_native_value is None and first is not None and first.data_time is not None:
+            self._attr_native_value = extract_date(first.data_time, timezone)
+        elif self._attr_native_value is None and first is not None and first.update_date is not None:
+            self._attr_native_value = extract_date(first.update_date, timezone)
 
 
 class ESolarSensorPlantTodayEquivalentHours(ESolarPlant):
@@ -1045,6 +1012,7 @@ class ESolarSensorPlantTodayEquivalentHours(ESolarPlant):
         super().__init__(
             coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
         )
+        self.coordinator_context = (*self.coordinator_context, (plant_uid, "devices", ANY))
         self._last_updated: datetime.datetime | None = None
         self._attr_available = False
 
@@ -1058,19 +1026,20 @@ class ESolarSensorPlantTodayEquivalentHours(ESolarPlant):
         self._attr_native_value = None
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                # Setup state
-                if "todayEquivalentHours" in plant and plant["todayEquivalentHours"] is not None and float(plant["todayEquivalentHours"]) > 0.0:
-                    self._attr_native_value = float(plant["todayEquivalentHours"])
-                else:
-                    total_hours = 0.0
-                    for device in plant["devices"]:
-                        if "todayEquivalentHours" in device and device["todayEquivalentHours"] is not None and float(device["todayEquivalentHours"]) > 0.0:
-                            total_hours += float(device["todayEquivalentHours"])
-                    self._attr_native_value = total_hours
+        plant = self._plant()
+        if plant is None:
+            return
+        # Setup static attributes
+        self._attr_available = True
+        # Setup state
+        if plant.today_equivalent_hours is not None and plant.today_equivalent_hours > 0.0:
+            self._attr_native_value = plant.today_equivalent_hours
+        else:
+            total_hours = 0.0
+            for device in plant.devices:
+                if device.today_equivalent_hours is not None and device.today_equivalent_hours > 0.0:
+                    total_hours += device.today_equivalent_hours
+            self._attr_native_value = total_hours
 
 
 class ESolarSensorInverterPeakPower(ESolarDevice):
@@ -1095,25 +1064,24 @@ class ESolarSensorInverterPeakPower(ESolarDevice):
         self._previous_value = None
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                # Setup state
-                if self._last_updated is not None and self._last_updated.date() == datetime.now().date():
-                    peak_power = self._attr_native_value or self.coordinator.hass.states.get(self._attr_unique_id) or float(0.0)
-                else:
-                    peak_power = float(0.0)
-                for kit in plant["devices"]:
-                    if (kit['deviceSn'] == self._inverter_sn
-                            and kit['deviceStatisticsData'] is not None
-                            and kit['deviceStatisticsData']['powerNow'] is not None):
-                        peak_power = max(peak_power, float(kit['deviceStatisticsData']['powerNow']))
-                        if self._attr_native_value != float(peak_power):
-                            self._last_updated = datetime.now()
-                            self._attr_native_value = float(peak_power)
+        plant = self._plant()
+        if plant is None:
+            return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        # Setup static attributes
+        self._attr_available = True
+        # Setup state
+        if self._last_updated is not None and self._last_updated.date() == datetime.now().date():
+            peak_power = self._attr_native_value or self.coordinator.hass.states.get(self._attr_unique_id) or float(0.0)
+        else:
+            peak_power = float(0.0)
+        kit = self._device()
+        if kit is not None and kit.power_now is not None:
+            peak_power = max(peak_power, kit.power_now)
+            if self._attr_native_value != float(peak_power):
+                self._last_updated = datetime.now()
+                self._attr_native_value = float(peak_power)
 
 
 class ESolarSensorInverterTodayAlarmNum(ESolarDevice):
@@ -1142,141 +1110,139 @@ class ESolarSensorInverterTodayAlarmNum(ESolarDevice):
         }
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                self._attr_extra_state_attributes[P_TODAY_ALARM_NUM] = plant["todayAlarmNum"] if "todayAlarmNum" in plant else 0
-
-                if "devices" not in plant or plant["devices"] is None:
-                    continue
-                for kit in plant["devices"]:
-                    if kit["deviceSn"] == self._inverter_sn:
-                        # Setup state
-                        self._attr_native_value = kit["todayAlarmNum"] if "todayAlarmNum" in kit else 0
-                        self._attr_extra_state_attributes[ALARM_LIST] = kit["alarmList"] if "alarmList" in kit else []
-
-
-class ESolarInverterEnergyTotal(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self, coordinator: ESolarCoordinator, plant_name, plant_uid, inverter_sn
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
+        plant = self._plant()
+        if plant is None:
+            return
+        # Setup static attributes
+        self._attr_available = True
+        self._attr_extra_state_attributes[P_TODAY_ALARM_NUM] = plant.today_alarm_num or 0
+
+        kit = self._device()
+        if kit is not None:
+            # Setup state
+            self._attr_native_value = kit.today_alarm_num or 0
+            self._attr_extra_state_attributes[ALARM_LIST] = kit.alarm_list or []
 
-        self._attr_unique_id = f"inverter_{inverter_sn}_energy_total"
-        self._inverter_sn = inverter_sn
 
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} Energy Total"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
-        self._attr_native_value = None
-        self._attr_extra_state_attributes = {
-            EH_TODAY: None,
-            EH_TOTAL: None,
-            MODULE_SIGN: None,
-        }
+class ESolarSensorPlantCycleMetric(ESolarPlant):
+    """Diagnostic sensor for what the last refresh cycle of the account cost."""
 
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                if "devices" in plant and plant["devices"] is not None:
-                    for kit in plant["devices"]:
-                        if kit["deviceSn"] != self._inverter_sn:
-                            continue
-                        self._attr_available = True
-                        self._attr_extra_state_attributes[EH_TODAY] = kit["todayEquivalentHours"] if (
-                                    "todayEquivalentHours" in kit and kit["todayEquivalentHours"] is not None and float(
-                                kit["todayEquivalentHours"]) > 0) else None
-                        self._attr_extra_state_attributes[EH_TOTAL] = kit["totalEquivalentHours"] if (
-                                    "totalEquivalentHours" in kit and kit["totalEquivalentHours"] is not None and float(
-                                kit["totalEquivalentHours"]) > 0) else None
-                        self._attr_extra_state_attributes[MODULE_SIGN] = kit["moduleSignal"] if (
-                                "moduleSignal" in kit and kit["moduleSignal"] is not None) else None
-                        # Setup state
-                        self._attr_native_value = float(kit["deviceStatisticsData"]["totalPvEnergy"])
-
-
-class ESolarInverterEnergyToday(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({P_ENDPOINTS})
 
-    def __init__(
-        self, coordinator: ESolarCoordinator, plant_name, plant_uid, inverter_sn
-    ) -> None:
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, metric) -> None:
         """Initialize the sensor."""
         super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
+            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
         )
-        self._last_updated: datetime.datetime | None = None
+        # the cycle block is all it reads
+        self.coordinator_context = (("cycle",),)
         self._attr_available = False
 
-        self._attr_unique_id = f"inverter_{inverter_sn}_today"
-        self._inverter_sn = inverter_sn
+        self._attr_unique_id = f"plantUid_{plant_uid}_cycle_{metric}"
 
-        self._attr_icon = ICON_METER
-        self._attr_name = f"Inverter {inverter_sn} Energy Today"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        name, unit, device_class, icon = CYCLE_METRICS[metric]
+        self._metric = metric
+        self._attr_icon = icon
+        self._attr_name = f"Plant {self._plant_name} {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
         self._attr_native_value = None
+        if metric == "requests":
+            self._attr_extra_state_attributes = {P_ENDPOINTS: {}}
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if "devices" in plant and plant["devices"] is not None:
-                for kit in plant["devices"]:
-                    if kit["deviceSn"] != self._inverter_sn:
-                        continue
-                    # Setup state
-                    self._attr_native_value = float(kit["deviceStatisticsData"]["todayPvEnergy"])
+        cycle = self._coordinator.data.get("cycle")
+        if not cycle:
+            self._attr_available = False
+            return
+        # the cycle covers every plant of the account
+        endpoints = cycle.get("endpoints") or {}
+        value = cycle.get(self._metric) if self._metric == "duration_ms" else endpoints.get(self._metric)
+        self._attr_available = value is not None
+        self._attr_native_value = value
+        if self._metric == "requests":
+            self._attr_extra_state_attributes[P_ENDPOINTS] = {
+                endpoint: (
+                    f"{metrics['requests']} requests, {metrics['errors']} errors, "
+                    f"p50 {metrics['p50_ms']} ms, p95 {metrics['p95_ms']} ms, max {metrics['max_ms']} ms"
+                )
+                for endpoint, metrics in (endpoints.get("endpoints") or {}).items()
+            }
 
 
-class ESolarInverterEnergyMonth(ESolarDevice):
+class ESolarSensorPlantBatterySoC(ESolarPlant):
     """Representation of an eSolar sensor for the plant."""
 
-    def __init__(
-        self, coordinator: ESolarCoordinator, plant_name, plant_uid, inverter_sn
-    ) -> None:
+    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
         """Initialize the sensor."""
         super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
+            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
         )
+        self.coordinator_context = (*self.coordinator_context, (plant_uid, "devices", ANY, "deviceStatisticsData"))
         self._last_updated: datetime.datetime | None = None
         self._attr_available = False
 
-        self._attr_unique_id = f"inverter_{inverter_sn}_month"
-        self._inverter_sn = inverter_sn
+        self._attr_unique_id = f"plantUid_energy_battery_soc_{plant_uid}"
 
-        self._attr_icon = ICON_METER
-        self._attr_name = f"Inverter {inverter_sn} Energy Month"
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_name = f"Plant {self._plant_name} State Of Charge"
+        self._attr_native_unit_of_measurement = PERCENTAGE
+        self._attr_device_class = SensorDeviceClass.BATTERY
+        self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_native_value = None
+        self._attr_extra_state_attributes = {
+            P_NAME: None,
+            P_UID: None,
+            B_GRID_DIRECT: None,
+            B_DIRECTION: None
+        }
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if "devices" in plant and plant["devices"] is not None:
-                for kit in plant["devices"]:
-                    if kit["deviceSn"] != self._inverter_sn:
-                        continue
-                    # Setup state
-                    self._attr_native_value = float(kit["deviceStatisticsData"]["monthPvEnergy"])
+        installed = float(0)
+        available = float(0)
+        plant = self._plant()
+        if plant is None:
+            return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        # Setup static attributes
+        self._attr_available = True
+        self._attr_extra_state_attributes[P_NAME] = plant.name
+        self._attr_extra_state_attributes[P_UID] = plant.uid
+
+        # Setup state
+        has_soc = False
+        for kit in plant.devices:
+            installed += kit.bat_capacity
+            if kit.bat_energy_percent is not None:
+                has_soc = True
+                available += kit.bat_capacity * kit.bat_energy_percent
+
+        if installed > 0 and has_soc:
+            self._attr_native_value = float(available / installed)
+        elif installed > 0:
+            self._attr_available = False
+
+        if plant.grid_direction == 1:
+            self._attr_extra_state_attributes[B_GRID_DIRECT] = B_EXPORT
+        elif plant.grid_direction == -1:
+            self._attr_extra_state_attributes[B_GRID_DIRECT] = B_IMPORT
+        else:
+            self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
+
+        if plant.battery_direction == 0:
+            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_STB
+        elif plant.battery_direction == 1:
+            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_DIS
+        elif plant.battery_direction == -1:
+            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_CH
+        else:
+            self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
 
 
-class ESolarInverterPower(ESolarDevice):
+class ESolarInverterBatterySoC(ESolarDevice):
     """Representation of an eSolar sensor for the plant."""
 
     def __init__(
@@ -1285,559 +1251,19 @@ class ESolarInverterPower(ESolarDevice):
         plant_name,
         plant_uid,
         inverter_sn,
-        use_pv_grid_attributes,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(
             coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
         )
-        self.use_pv_grid_attributes = use_pv_grid_attributes
+        self.coordinator_context = (
+            *self.coordinator_context,
+            (plant_uid, "devices", ANY),
+            (plant_uid, "devices", ANY, "gridList", ANY),
+        )
         self._last_updated: datetime.datetime | None = None
         self._attr_available = False
-        self._attr_unique_id = f"PW_{inverter_sn}"
-
-        self._inverter_sn = inverter_sn
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} Power"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_value = None
-
-        self._attr_extra_state_attributes = {
-            P_DPC: None,
-            P_DEVICE_TYPE: None,
-            P_DISPLAY_FW: None,
-            P_INSTALL_NAME: None,
-            P_MASTER_MCU_FW: None,
-            P_MODULE_FW: None,
-            P_MODULE_PC: None,
-            P_MODULE_SN: None,
-        }
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                if "devices" in plant and plant["devices"] is not None:
-                    for kit in plant["devices"]:
-                        if kit["deviceSn"] != self._inverter_sn:
-                            continue
-                        # Setup state
-                        self._attr_native_value = float(kit["deviceStatisticsData"]["powerNow"])
-                        self._attr_extra_state_attributes[P_DPC] = kit['devicePc']
-                        self._attr_extra_state_attributes[P_DEVICE_TYPE] = kit['deviceType']
-                        self._attr_extra_state_attributes[P_DISPLAY_FW] = kit['displayFw']
-                        self._attr_extra_state_attributes[P_INSTALL_NAME] = kit['installName']
-                        self._attr_extra_state_attributes[P_MASTER_MCU_FW] = kit['masterMCUFw']
-                        self._attr_extra_state_attributes[P_MODULE_FW] = kit['moduleFw']
-                        self._attr_extra_state_attributes[P_MODULE_PC] = kit['modulePc']
-                        self._attr_extra_state_attributes[P_MODULE_SN] = kit['moduleSn']
-
-
-class ESolarInverterPV(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-        pv_string
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"PV{pv_string}_{inverter_sn}"
-
-        self._pv_string = pv_string
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} PV{pv_string}"
-        self._attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
-        self._attr_device_class = SensorDeviceClass.VOLTAGE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant, report_zero=True):
-                return
-            if "devices" not in plant or plant["devices"] is None:
-                self._attr_available = False
-                self._attr_native_value = None
-                return
-            for kit in plant["devices"]:
-                if kit["deviceSn"] != self._inverter_sn:
-                    continue
-                if self._offline_blocks_live_sensor(plant, kit, report_zero=True):
-                    return
-                self._attr_available = True
-                pv_list = (kit.get("deviceStatisticsData") or {}).get("pvList") or []
-                for s in pv_list:
-                    if s["pvNo"] == self._pv_string:
-                        self._attr_native_value = float(s["pvvolt"])
-                        return
-                self._attr_available = False
-                self._attr_native_value = None
-                return
-
-
-class ESolarInverterPC(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-        pv_string
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"PC{pv_string}_{inverter_sn}"
-
-        self._pv_string = pv_string
-
-        self._attr_icon = ICON_CURRENT_DC
-        self._attr_name = f"Inverter {inverter_sn} PC{pv_string}"
-        self._attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
-        self._attr_device_class = SensorDeviceClass.CURRENT
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                if "devices" in plant and plant["devices"] is not None:
-                    for kit in plant["devices"]:
-                        if kit["deviceSn"] != self._inverter_sn:
-                            continue
-                        for s in kit["deviceStatisticsData"]["pvList"]:
-                            if s["pvNo"] == self._pv_string:
-                                self._attr_native_value = float(s["pvcurr"])
-
-
-class ESolarInverterPW(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-        pv_string
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"PW{pv_string}_{inverter_sn}"
-
-        self._pv_string = pv_string
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} string {pv_string} power"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                if "devices" in plant and plant["devices"] is not None:
-                    for kit in plant["devices"]:
-                        if kit["deviceSn"] != self._inverter_sn:
-                            continue
-                        for s in kit["deviceStatisticsData"]["pvList"]:
-                            if s["pvNo"] == self._pv_string:
-                                pv_power = float(s["pvpower"])
-                                pv_power_calc = float(s["pvcurr"]) * float(s["pvvolt"])
-                                self._attr_native_value = pv_power if pv_power != 0 else pv_power_calc
-
-
-class ESolarInverterGridPowerWatt(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"Grid_Power_watt_{inverter_sn}"
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Inverter {inverter_sn} grid power"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-        self._attr_extra_state_attributes = {
-            P_GRID_AC1: None,
-            P_GRID_AC2: None,
-            P_GRID_AC3: None
-        }
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                if "devices" in plant and plant["devices"] is not None:
-                    for kit in plant["devices"]:
-                        if kit["deviceSn"] != self._inverter_sn:
-                            continue
-                        grid_power_watt = 0
-                        for s in kit["deviceStatisticsData"]["gridList"]:
-                            if s['gridPowerwatt'] is not None:
-                                grid_power_watt += float(s['gridPowerwatt'])
-                                if "gridName" in s and s["gridName"] is not None:
-                                    if s["gridName"] in [P_GRID_AC1, P_GRID_AC2, P_GRID_AC3]:
-                                        self._attr_extra_state_attributes[ s["gridName"] ] = s['gridPowerwatt']
-                        self._attr_native_value = grid_power_watt
-
-
-class ESolarInverterGV(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-        phase
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        letters = ["r", "s", "t"]
-        letter= ''
-        if 1 <= phase <= 3:
-            letter= letters[phase-1]
-
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"GV{phase}{letter}_{inverter_sn}"
-
-        self._phase = phase
-        self._attr_icon = ICON_GRID_IMPORT
-        self._attr_name = f"Inverter {inverter_sn} GV{phase}{letter}"
-        self._attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
-        self._attr_device_class = SensorDeviceClass.VOLTAGE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant, report_zero=True):
-                return
-            if "devices" not in plant or plant["devices"] is None:
-                self._attr_available = False
-                self._attr_native_value = None
-                return
-            for kit in plant["devices"]:
-                if kit["deviceSn"] != self._inverter_sn:
-                    continue
-                if self._offline_blocks_live_sensor(plant, kit, report_zero=True):
-                    return
-                self._attr_available = True
-                grid_list = (kit.get("deviceStatisticsData") or {}).get("gridList") or []
-                for s in grid_list:
-                    if s["gridNo"] == self._phase:
-                        self._attr_native_value = float(s["gridVolt"])
-                        return
-                self._attr_available = False
-                self._attr_native_value = None
-                return
-
-
-class ESolarInverterGC(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-        phase
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        letters = ["r", "s", "t"]
-        letter = ''
-        if 1 <= phase <= 3:
-            letter = letters[phase - 1]
-
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"GC{phase}{letter}_{inverter_sn}" #typo :( correct: GC1r_
-
-        self._phase = phase
-        self._attr_icon = ICON_CURRENT_AC
-        self._attr_name = f"Inverter {inverter_sn} GC{phase}{letter}"
-        self._attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
-        self._attr_device_class = SensorDeviceClass.CURRENT
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                if self._offline_blocks_live_sensor(plant):
-                    return
-                # Setup static attributes
-                self._attr_available = True
-                if "devices" in plant and plant["devices"] is not None:
-                    for kit in plant["devices"]:
-                        if kit["deviceSn"] != self._inverter_sn:
-                            continue
-                        for s in kit["deviceStatisticsData"]["gridList"]:
-                            if s["gridNo"] == self._phase:
-                                self._attr_native_value = float(s["gridCurr"])
-
-
-class ESolarInverterTemperature(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._attr_native_value = None
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"Temp_{inverter_sn}"
-
-        self._attr_icon = ICON_THERMOMETER
-        self._attr_name = f"Inverter {inverter_sn} Temperature"
-        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-        self._attr_device_class = SensorDeviceClass.TEMPERATURE
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant, report_zero=True):
-                return
-            if "devices" not in plant or plant["devices"] is None:
-                self._attr_available = False
-                self._attr_native_value = None
-                return
-            for kit in plant["devices"]:
-                if kit["deviceSn"] != self._inverter_sn:
-                    continue
-                if self._offline_blocks_live_sensor(plant, kit, report_zero=True):
-                    return
-                if "deviceTemp" not in kit:
-                    self._attr_available = False
-                    self._attr_native_value = None
-                    return
-                temp = float(kit["deviceTemp"])
-                if -200 < temp < 200:
-                    self._attr_available = True
-                    self._attr_native_value = temp
-                    return
-                self._attr_available = False
-                self._attr_native_value = None
-                return
-
-
-class ESolarSensorPlantEnergy(ESolarPlant):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, source) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_{plant_uid}_{source}"
-
-        self._source = source
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Plant {self._plant_name} "+split_camel_case(source)
-        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self._attr_device_class = SensorDeviceClass.ENERGY
-        self._attr_state_class = SensorStateClass.TOTAL
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] == self._plant_name:
-                # Setup static attributes
-                self._attr_available = True
-                # Setup state
-                if self._source in plant and plant[self._source] is not None:
-                    self._attr_native_value = float(plant[self._source])
-
-
-class ESolarSensorPlantBatterySoC(ESolarPlant):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-
-        self._attr_unique_id = f"plantUid_energy_battery_soc_{plant_uid}"
-
-        self._attr_name = f"Plant {self._plant_name} State Of Charge"
-        self._attr_native_unit_of_measurement = PERCENTAGE
-        self._attr_device_class = SensorDeviceClass.BATTERY
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_value = None
-        self._attr_extra_state_attributes = {
-            P_NAME: None,
-            P_UID: None,
-            B_GRID_DIRECT: None,
-            B_DIRECTION: None
-        }
-
-    def process_data(self):
-        installed = float(0)
-        available = float(0)
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            # Setup static attributes
-            self._attr_available = True
-            self._attr_extra_state_attributes[P_NAME] = plant["plantName"]
-            self._attr_extra_state_attributes[P_UID] = plant["plantUid"]
-
-            # Setup state
-            has_soc = False
-            for kit in plant["devices"]:
-                if "deviceStatisticsData" not in kit:
-                    continue
-
-                stats = kit["deviceStatisticsData"]
-                bat_capacity = 0.0
-                if stats.get("batCapacity") is not None and float(stats["batCapacity"]) > 0:
-                    bat_capacity = float(stats["batCapacity"])
-                elif stats.get("batCapcity") is not None and float(stats["batCapcity"]) > 0:
-                    bat_capacity = float(stats["batCapcity"])
-                elif stats.get("batCapicity") is not None and float(stats["batCapicity"]) > 0:
-                    bat_capacity = float(stats["batCapicity"])
-
-                installed += bat_capacity
-                bat_pct = stats.get("batEnergyPercent")
-                if bat_pct is not None:
-                    has_soc = True
-                    available += bat_capacity * float(bat_pct)
-
-            if installed > 0 and has_soc:
-                self._attr_native_value = float(available / installed)
-            elif installed > 0:
-                self._attr_available = False
-
-            if "gridDirection" in plant and plant["gridDirection"] is not None:
-                if plant["gridDirection"] == 1:
-                    self._attr_extra_state_attributes[B_GRID_DIRECT] = B_EXPORT
-                elif plant["gridDirection"] == -1:
-                    self._attr_extra_state_attributes[B_GRID_DIRECT] = B_IMPORT
-                else:
-                    self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
-            else:
-                self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
-
-            if "batteryDirection" in plant and plant["batteryDirection"] is not None:
-                if plant["batteryDirection"] == 0:
-                    self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_STB
-                elif plant["batteryDirection"] == 1:
-                    self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_DIS
-                elif plant["batteryDirection"] == -1:
-                    self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_CH
-                else:
-                    self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
-            else:
-                self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
-
-
-class ESolarInverterBatterySoC(ESolarDevice):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(
-        self,
-        coordinator: ESolarCoordinator,
-        plant_name,
-        plant_uid,
-        inverter_sn,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, inverter_sn=inverter_sn
-        )
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"Battery_SOC_{inverter_sn}"
+        self._attr_unique_id = f"Battery_SOC_{inverter_sn}"
 
         self._attr_native_value = None
         self._attr_name = f"Inverter {inverter_sn} Battery State Of Charge"
@@ -1871,265 +1297,83 @@ class ESolarInverterBatterySoC(ESolarDevice):
         }
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
+        plant = self._plant()
+        if plant is None:
+            return
+        if self._offline_blocks_live_sensor(plant):
+            return
+        # Setup static attributes
+        self._attr_available = True
+        self._attr_extra_state_attributes[P_NAME] = plant.name
+        self._attr_extra_state_attributes[P_UID] = plant.uid
+        kit = self._device()
+        if kit is not None:
+            if kit.bat_energy_percent is None:
+                self._attr_available = False
                 return
-            # Setup static attributes
-            self._attr_available = True
-            self._attr_extra_state_attributes[P_NAME] = plant["plantName"]
-            self._attr_extra_state_attributes[P_UID] = plant["plantUid"]
-            if "devices" not in plant or plant["devices"] is None:
-                continue
-            for kit in plant["devices"]:
-                if kit["deviceSn"] == self._inverter_sn:
-                    stats = kit["deviceStatisticsData"]
-                    bat_pct = stats.get("batEnergyPercent")
-                    if bat_pct is None:
-                        self._attr_available = False
-                        return
-                    self._attr_native_value = float(bat_pct)
-
-                    self._attr_extra_state_attributes[I_MODEL] = kit["deviceType"]
-                    self._attr_extra_state_attributes[I_SN] = kit["deviceSn"]
-                    self._attr_extra_state_attributes[B_CAPACITY] = kit["deviceStatisticsData"]["batCapcity"]
-                    self._attr_extra_state_attributes[B_CURRENT] = kit["deviceStatisticsData"]["batCurrent"]
-                    self._attr_extra_state_attributes[B_POWER] = kit["deviceStatisticsData"]["batPower"]
-                    self._attr_extra_state_attributes[B_T_LOAD] = kit["deviceStatisticsData"]["totalLoadPowerwatt"]
-                    self._attr_extra_state_attributes[B_TODAY_CHARGE_E] = float(
-                        kit["deviceStatisticsData"]["todayBatChgEnergy"]) * 1000
-                    self._attr_extra_state_attributes[B_TODAY_DISCHARGE_E] = float(
-                        kit["deviceStatisticsData"]["todayBatDisEnergy"]) * 1000
-                    self._attr_extra_state_attributes[B_TOTAL_CHARGE_E] = float(
-                        kit["deviceStatisticsData"]["totalBatChgEnergy"]) * 1000
-                    self._attr_extra_state_attributes[B_TOTAL_DISCHARGE_E] = float(
-                        kit["deviceStatisticsData"]["totalBatDisEnergy"]) * 1000
-                    # self._attr_extra_state_attributes[B_H_LOAD] = plant["homeLoadPower"] # ???
-                    if "backupTotalLoadPowerWatt" in kit["deviceStatisticsData"] and kit["deviceStatisticsData"]["backupTotalLoadPowerWatt"] is not None:
-                        self._attr_extra_state_attributes[B_B_LOAD] = kit["deviceStatisticsData"]["backupTotalLoadPowerWatt"]
-                    elif "backupTotalLoadPowerWatt" in kit and kit["backupTotalLoadPowerWatt"] is not None:
-                        self._attr_extra_state_attributes[B_B_LOAD] = kit["backupTotalLoadPowerWatt"]
-                    else:
-                        self._attr_extra_state_attributes[B_B_LOAD] = None
-
-                    if "batteryDirection" in kit and kit["batteryDirection"] is not None:
-                        if kit["batteryDirection"] == 0:
-                            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_STB
-                        elif kit["batteryDirection"] == 1:
-                            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_DIS
-                        elif kit["batteryDirection"] == -1:
-                            self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_CH
-                        else:
-                            self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
-                    else:
-                        self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
-
-                    if "gridDirection" in kit["deviceStatisticsData"] and kit["deviceStatisticsData"]["gridDirection"] is not None:
-                        if kit["deviceStatisticsData"]["gridDirection"] == 1:
-                            self._attr_extra_state_attributes[B_GRID_DIRECT] = B_EXPORT
-                        elif kit["deviceStatisticsData"]["gridDirection"] == -1:
-                            self._attr_extra_state_attributes[B_GRID_DIRECT] = B_IMPORT
-                        elif kit["deviceStatisticsData"]["gridDirection"] == 0:
-                            self._attr_extra_state_attributes[B_GRID_DIRECT] = B_DIR_STB
-                        else:
-                            self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
-                    else:
-                        self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
-
-            grid_power_watt = 0.0
-            if "sysGridPowerwatt" in plant and plant["sysGridPowerwatt"] is not None:
-                grid_power_watt = float(plant["sysGridPowerwatt"])
-            if grid_power_watt == 0.0 and "devices" in plant and plant["devices"] is not None:
-                for kit in plant["devices"]:
-                    if "gridList" in kit and kit["gridList"] is not None:
-                        for grid in kit["gridList"]:
-                            if grid['gridPowerwatt'] is not None:
-                                grid_power_watt += float(grid['gridPowerwatt'])
-            self._attr_extra_state_attributes[G_POWER] = grid_power_watt
-
-            # ???
-            # self._attr_extra_state_attributes[IO_POWER] = kit[
-            #     "storeDevicePower"
-            # ]["inputOutputPower"]
-
-            if "outPutDirection" in plant and plant["outPutDirection"] is not None:
-                if plant["outPutDirection"] == 1:
-                    self._attr_extra_state_attributes[IO_DIRECTION] = B_EXPORT
-                elif plant["outPutDirection"] == -1:
-                    self._attr_extra_state_attributes[IO_DIRECTION] = B_IMPORT
-                else:
-                    self._attr_extra_state_attributes[IO_DIRECTION] = P_UNKNOWN
+            self._attr_native_value = kit.bat_energy_percent
+
+            self._attr_extra_state_attributes[I_MODEL] = kit.device_type
+            self._attr_extra_state_attributes[I_SN] = kit.sn
+            self._attr_extra_state_attributes[B_CAPACITY] = kit.bat_capacity
+            self._attr_extra_state_attributes[B_CURRENT] = kit.bat_current
+            self._attr_extra_state_attributes[B_POWER] = kit.bat_power
+            self._attr_extra_state_attributes[B_T_LOAD] = kit.total_load_power
+            self._attr_extra_state_attributes[B_TODAY_CHARGE_E] = _watt_hours(kit.today_bat_chg_energy)
+            self._attr_extra_state_attributes[B_TODAY_DISCHARGE_E] = _watt_hours(kit.today_bat_dis_energy)
+            self._attr_extra_state_attributes[B_TOTAL_CHARGE_E] = _watt_hours(kit.total_bat_chg_energy)
+            self._attr_extra_state_attributes[B_TOTAL_DISCHARGE_E] = _watt_hours(kit.total_bat_dis_energy)
+            # self._attr_extra_state_attributes[B_H_LOAD] = plant["homeLoadPower"] # ???
+            self._attr_extra_state_attributes[B_B_LOAD] = kit.backup_load_power
+
+            if kit.battery_direction == 0:
+                self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_STB
+            elif kit.battery_direction == 1:
+                self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_DIS
+            elif kit.battery_direction == -1:
+                self._attr_extra_state_attributes[B_DIRECTION] = B_DIR_CH
             else:
-                self._attr_extra_state_attributes[IO_DIRECTION] = P_UNKNOWN
-
-            self._attr_extra_state_attributes[PV_POWER] = plant["totalPvPower"]
+                self._attr_extra_state_attributes[B_DIRECTION] = P_UNKNOWN
 
-            if "pvDirection" in plant and plant["pvDirection"] is not None:
-                if plant["pvDirection"] == 1:
-                    self._attr_extra_state_attributes[PV_DIRECTION] = B_EXPORT
-                elif plant["pvDirection"] == -1:
-                    self._attr_extra_state_attributes[PV_DIRECTION] = B_IMPORT
-                else:
-                    self._attr_extra_state_attributes[PV_DIRECTION] = P_UNKNOWN
+            if kit.grid_direction == 1:
+                self._attr_extra_state_attributes[B_GRID_DIRECT] = B_EXPORT
+            elif kit.grid_direction == -1:
+                self._attr_extra_state_attributes[B_GRID_DIRECT] = B_IMPORT
+            elif kit.grid_direction == 0:
+                self._attr_extra_state_attributes[B_GRID_DIRECT] = B_DIR_STB
             else:
-                self._attr_extra_state_attributes[PV_DIRECTION] = P_UNKNOWN
-
-            self._attr_extra_state_attributes[S_POWER] = plant["solarPower"]
-
-
-class ESolarSensorMeterPower(ESolarMeter):
-    """Representation of an eSolar sensor for the plant."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, module_sn ) -> None:
-        """Initialize the sensor."""
-
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, module_sn=module_sn
-        )
-
-        self._attr_extra_state_attributes = {}
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"Solar_Meter_{self._module_sn}_grid_power"
-
-        self._attr_icon = ICON_POWER
-        self._attr_name = f"Solar Meter {self._module_sn} Grid Power"
-        self._attr_native_unit_of_measurement = UnitOfPower.WATT
-        self._attr_device_class = SensorDeviceClass.POWER
-        self._attr_state_class = SensorStateClass.MEASUREMENT
-        self._attr_native_value = None
-
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if self._offline_blocks_live_sensor(plant):
-                return
-            if "modules" in plant and plant["modules"] is not None:
-                for plant_module in plant["modules"]:
-                    if plant_module['moduleSn'] == self._module_sn and "gridPower" in plant_module and plant_module["gridPower"] is not None:
-                        # Setup static attributes
-                        self._attr_available = True
-                        # Setup state
-                        self._attr_native_value = float(plant_module["gridPower"])
-
-                    copy = plant_module.copy()
-                    to_remove = ["deviceSnList", "moduleFw", "moduleModel", "moduleSn", "plantName", "plantUid"]
-                    for key in to_remove:
-                        if key in copy:
-                            del copy[key]
-
-                    self._attr_extra_state_attributes = copy
-
-
-class ESolarSensorBatteryEntity(ESolarBattery):
-    """Representation of an eSolar sensor for the battery."""
-
-    def __init__(self, coordinator: ESolarCoordinator, plant_name, plant_uid, bat_sn, prop, add_attributes = None, battery_index: int = 1 ) -> None:
-        """Initialize the sensor."""
-
-        super().__init__(
-            coordinator=coordinator, plant_name=plant_name, plant_uid=plant_uid, bat_sn=bat_sn, battery_index=battery_index
-        )
-
-        self._attr_extra_state_attributes = {}
-        self._last_updated: datetime.datetime | None = None
-        self._attr_available = False
-        self._attr_unique_id = f"Solar_battery_{self._bat_sn}_{prop}"
-        self._property = prop
-
-        self._attr_name = f"Battery {self._bat_sn} {split_camel_case(prop)}"
-        self._attr_native_value = None
-        self._add_attributes = add_attributes
+                self._attr_extra_state_attributes[B_GRID_DIRECT] = P_UNKNOWN
 
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        grid_power_watt = plant.sys_grid_power or 0.0
+        if grid_power_watt == 0.0:
+            for kit in plant.devices:
+                for grid in kit.grid_phases:
+                    if grid.power is not None:
+                        grid_power_watt += grid.power
+        self._attr_extra_state_attributes[G_POWER] = grid_power_watt
 
-        if prop == 'batSoc':
-            self._attr_native_unit_of_measurement = PERCENTAGE
-            self._attr_device_class = SensorDeviceClass.BATTERY
-        elif prop == 'batTemperature':
-            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-            self._attr_device_class = SensorDeviceClass.TEMPERATURE
-            self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        elif prop == 'batPower':
-            self._attr_icon = ICON_POWER
-            self._attr_native_unit_of_measurement = UnitOfPower.WATT
-            self._attr_device_class = SensorDeviceClass.POWER
-            self._attr_state_class = SensorStateClass.MEASUREMENT
-            self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        elif prop.endswith('Energy'):
-            self._attr_icon = ICON_METER
-            self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-            self._attr_device_class = SensorDeviceClass.ENERGY
-            self._attr_state_class = SensorStateClass.TOTAL
-        elif prop == "batCurrent":
-            self._attr_icon = ICON_CURRENT_DC
-            self._attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
-            self._attr_device_class = SensorDeviceClass.CURRENT
-            self._attr_state_class = SensorStateClass.MEASUREMENT
-            self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        elif prop == "batVoltage":
-            self._attr_icon = ICON_LIGHTNING
-            self._attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
-            self._attr_device_class = SensorDeviceClass.VOLTAGE
-            self._attr_state_class = SensorStateClass.MEASUREMENT
-            self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        # ???
+        # self._attr_extra_state_attributes[IO_POWER] = kit[
+        #     "storeDevicePower"
+        # ]["inputOutputPower"]
 
-    def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if (
-                self._property in _LIVE_BATTERY_PROPS
-                and self._offline_blocks_live_sensor(plant)
-            ):
-                return
-            if "batteries" in plant and plant["batteries"] is not None:
-                for battery in plant["batteries"]:
-                    if battery['batSn'] == self._bat_sn:
-                        if self._property in battery and battery[self._property] is not None:
-                            # Setup static attributes
-                            self._attr_available = True
-                            # Setup state
-                            if self._property == 'batSoh':
-                                if battery.get("type", 1) == 2:
-                                    self._attr_native_value = battery.get(self._property)
-                                else:
-                                    raw = float(extract_number(battery[self._property]))
-                                    self._attr_native_value = min(
-                                        100.0, max(0.0, 100.0 - raw)
-                                    )
-                            elif isinstance(battery[self._property], float):
-                                self._attr_native_value = battery[self._property]
-                            else:
-                                self._attr_native_value = float(
-                                    extract_number(battery[self._property])
-                                )
+        if plant.output_direction == 1:
+            self._attr_extra_state_attributes[IO_DIRECTION] = B_EXPORT
+        elif plant.output_direction == -1:
+            self._attr_extra_state_attributes[IO_DIRECTION] = B_IMPORT
+        else:
+            self._attr_extra_state_attributes[IO_DIRECTION] = P_UNKNOWN
 
-                            if self._property == "batTemperature" and "unitOfTemperature" in battery and battery["unitOfTemperature"] is not None:
-                                if battery["unitOfTemperature"] == "℃" or battery["unitOfTemperature"] == "C":
-                                    self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-                                elif battery["unitOfTemperature"] == "°F" or battery["unitOfTemperature"] == "C":
-                                    self._attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
-                                elif battery["unitOfTemperature"] == "K":
-                                    self._attr_native_unit_of_measurement = UnitOfTemperature.KELVIN
-                            if self._property == 'batSoc':
-                                self._attr_native_value = min(
-                                    100.0, max(0.0, self._attr_native_value)
-                                )
+        self._attr_extra_state_attributes[PV_POWER] = plant.pv_power
 
-                        if self._add_attributes is not None:
-                            copy = battery.copy()
-                            to_remove = ["deviceSn", "batSn", "bmsHardwareVersion", "bmsSoftwareVersion", "plantName", "plantUid", "batSoc", "batTemperature",
-                                         "solutioUrl", "todayBatChgEnergy", "todayBatDisEnergy", "totalBatChgEnergy", "totalBatDisEnergy", "showBatSoc", "showBatteryNum",
-                                         "showGroupNum", "showHeating", "showNewBatteryFlag", "enableBindPlant", "aiSavingSwitch", "EnableShowBatteryClusterRealDataBtn",
-                                         "EnableShowBatteryRealDataBtn", "EnableShowSingleVoltageBtn", "EnableShowWarranty", "IsHistory", "IsContainCluster", "IsHighVolt"]
-                            for key in to_remove:
-                                if key in copy:
-                                    del copy[key]
+        if plant.pv_direction == 1:
+            self._attr_extra_state_attributes[PV_DIRECTION] = B_EXPORT
+        elif plant.pv_direction == -1:
+            self._attr_extra_state_attributes[PV_DIRECTION] = B_IMPORT
+        else:
+            self._attr_extra_state_attributes[PV_DIRECTION] = P_UNKNOWN
 
-                            self._attr_extra_state_attributes = copy
+        self._attr_extra_state_attributes[S_POWER] = plant.solar_power
 
 
 #unused yet
@@ -2156,23 +1400,23 @@ class ESolarSensorEMSEntity(ESolarEMS):
         self._attr_state_class = SensorStateClass.MEASUREMENT
 
     def process_data(self):
-        for plant in self._coordinator.data["plantList"]:
-            if plant["plantName"] != self._plant_name:
-                continue
-            if "emsModules" in plant and plant["emsModules"] is not None:
-                for ems in plant["emsModules"]:
-                    if ems['emsModuleSn'] == self._ems_sn:
-                        if self._property in ems and ems[self._property] is not None:
-                            # Setup static attributes
-                            self._attr_available = True
-                            # Setup state
-                            self._attr_native_value = float(extract_number(ems[self._property]))
-
-                        if self._add_attributes is not None:
-                            copy = ems.copy()
-                            to_remove = ["deviceSn", "emsModel", "emsModulePc", "emsModuleSn", "firmwareVersion", "hardwareVersion", "plantName", "plantUid"]
-                            for key in to_remove:
-                                if key in copy:
-                                    del copy[key]
-
-                            self._attr_extra_state_attributes = copy
+        plant = self._plant()
+        if plant is None:
+            return
+        ems = self._ems()
+        if ems is None:
+            return
+        if self._property in ems and ems[self._property] is not None:
+            # Setup static attributes
+            self._attr_available = True
+            # Setup state
+            self._attr_native_value = float(extract_number(ems[self._property]))
+
+        if self._add_attributes is not None:
+            copy = ems.copy()
+            to_remove = ["deviceSn", "emsModel", "emsModulePc", "emsModuleSn", "firmwareVersion", "hardwareVersion", "plantName", "plantUid"]
+            for key in to_remove:
+                if key in copy:
+                    del copy[key]
+
+            self._attr_extra_state_attributes = copy
@@ -0,0 +1,569 @@
+"""Entity descriptions of the table driven eSolar sensors."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTemperature,
+)
+
+from .const import (
+    EH_TODAY,
+    EH_TOTAL,
+    I_LAST_MONTH,
+    I_MONTH,
+    I_TODAY,
+    I_TOTAL,
+    I_YESTERDAY,
+    MODULE_SIGN,
+    P_DEVICE_TYPE,
+    P_DISPLAY_FW,
+    P_DPC,
+    P_GRID_AC1,
+    P_GRID_AC2,
+    P_GRID_AC3,
+    P_INSTALL_NAME,
+    P_MASTER_MCU_FW,
+    P_MODULE_FW,
+    P_MODULE_PC,
+    P_MODULE_SN,
+)
+from .elekeeper import split_camel_case
+from .model import (
+    PLANT_BATTERY_ENERGY_SOURCES,
+    PLANT_METER_ENERGY_SOURCES,
+    Battery,
+    Device,
+    Plant,
+    PvString,
+    number,
+)
+
+ICON_POWER = "mdi:solar-power"
+ICON_PANEL = "mdi:solar-panel"
+ICON_LIGHTNING = "mdi:lightning-bolt"
+ICON_LIGHTNING_CIRCLE = "mdi:lightning-bolt-circle"
+ICON_SOCKET = "mdi:power-socket-de"
+ICON_TRIANGLE = "mdi:flash-triangle-outline"
+ICON_METER = "mdi:meter-electric-outline"
+ICON_GRID = "mdi:transmission-tower"
+ICON_GRID_EXPORT = "mdi:transmission-tower-export"
+ICON_GRID_IMPORT = "mdi:transmission-tower-import"
+ICON_THERMOMETER = "mdi:thermometer"
+ICON_UPDATE = "mdi:update"
+ICON_ALARM = "mdi:alarm-light"
+ICON_CURRENT_DC = "mdi:current-dc"
+ICON_CURRENT_AC = "mdi:current-ac"
+ICON_TIMER = "mdi:timer-outline"
+ICON_REQUESTS = "mdi:swap-horizontal"
+ICON_REQUEST_ERRORS = "mdi:alert-circle-outline"
+ICON_DOWNLOAD = "mdi:download"
+
+# the index node a described sensor reads
+NODE_PLANT = "plant"
+NODE_DEVICE = "device"
+NODE_PV = "pv"
+NODE_GRID = "grid"
+NODE_BATTERY = "battery"
+NODE_MODULE = "module"
+
+_PHASE_LETTERS = ("r", "s", "t")
+
+
+def phase_letter(phase: Any) -> str:
+    """Return the letter of a grid phase, r, s and t for the phases 1 to 3."""
+    if isinstance(phase, int) and 1 <= phase <= 3:
+        return _PHASE_LETTERS[phase - 1]
+    return ""
+
+
+def _positive(value: Any) -> float | None:
+    """Return a value as float when it is above zero."""
+    value = number(value)
+    return value if value is not None and value > 0 else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class ESolarSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor reading one value of one record of the plant index.
+
+    The unique id and name formats get the fields plant, uid, sn (the serial
+    of the inverter, meter or battery), key (the PV string or grid phase)
+    and letter (the grid phase letter).
+    """
+
+    node: str
+    unique_id_format: str
+    name_format: str
+    value_fn: Callable[[Any], Any]
+    attributes_fn: Callable[[Any], dict] | None = None
+    unit_fn: Callable[[Any], str | None] | None = None
+    # blocked while the plant is offline
+    live: bool = False
+    # also pushed by the live power refresh
+    live_updates: bool = False
+    # reports zero while the plant or inverter is offline and is unavailable
+    # without data, needs an inverter node
+    strict: bool = False
+    unavailable_without_value: bool = False
+
+
+def _plant_total_income(plant: Plant) -> dict:
+    income = plant.total_income
+    if income is None or income == "--" or _positive(income) is None:
+        income = plant.income_total
+    return {I_TOTAL: income}
+
+
+def _plant_total_energy(plant: Plant) -> float | None:
+    total = _positive(plant.total_pv_energy)
+    return total if total is not None else _positive(plant.total_energy)
+
+
+def _plant_month_income(plant: Plant) -> dict:
+    income = plant.income_month
+    return {
+        I_MONTH: income if _positive(income) is not None else plant.month_income,
+        I_LAST_MONTH: plant.income_last_month,
+    }
+
+
+def _plant_peak_power(plant: Plant) -> float:
+    return 0.0 if plant.peak_power is None else plant.peak_power
+
+
+PLANT_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    ESolarSensorEntityDescription(
+        key="energy_total",
+        node=NODE_PLANT,
+        unique_id_format="plantUid_energy_{uid}",
+        name_format="Plant {plant} Energy Total ",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=_plant_total_energy,
+        attributes_fn=_plant_total_income,
+        unavailable_without_value=True,
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_today",
+        node=NODE_PLANT,
+        unique_id_format="plantUid_energy_{uid}_today",
+        name_format="Plant {plant} Energy Today ",
+        icon=ICON_METER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("today_pv_energy"),
+        attributes_fn=lambda plant: {
+            I_TODAY: plant.income_today,
+            I_YESTERDAY: plant.yesterday_income,
+        },
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_month",
+        node=NODE_PLANT,
+        unique_id_format="plantUid_energy_{uid}_month",
+        name_format="Plant {plant} Energy Month",
+        icon=ICON_METER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("month_pv_energy"),
+        attributes_fn=_plant_month_income,
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_year",
+        node=NODE_PLANT,
+        unique_id_format="plantUid_energy_{uid}_year",
+        name_format="Plant {plant} Energy Year",
+        icon=ICON_METER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("year_pv_energy"),
+    ),
+    ESolarSensorEntityDescription(
+        key="peak_power",
+        node=NODE_PLANT,
+        unique_id_format="plantUid_peakpower_{uid}",
+        name_format="Plant {plant} Peak Power",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_plant_peak_power,
+        live=True,
+    ),
+)
+
+
+def _plant_energy(source: str) -> ESolarSensorEntityDescription:
+    return ESolarSensorEntityDescription(
+        key=source,
+        node=NODE_PLANT,
+        unique_id_format="plantUid_{uid}_" + source,
+        name_format="Plant {plant} " + split_camel_case(source),
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        value_fn=lambda plant: plant.energies.get(source),
+    )
+
+
+PLANT_ENERGY_SENSORS: dict[str, ESolarSensorEntityDescription] = {
+    source: _plant_energy(source)
+    for source in dict.fromkeys(PLANT_BATTERY_ENERGY_SOURCES + PLANT_METER_ENERGY_SOURCES)
+}
+
+
+def _inverter_energy_attributes(device: Device) -> dict:
+    return {
+        EH_TODAY: _positive(device.today_equivalent_hours),
+        EH_TOTAL: _positive(device.total_equivalent_hours),
+        MODULE_SIGN: device.module_signal,
+    }
+
+
+def _inverter_attributes(device: Device) -> dict:
+    return {
+        P_DPC: device.device_pc,
+        P_DEVICE_TYPE: device.device_type,
+        P_DISPLAY_FW: device.display_fw,
+        P_INSTALL_NAME: device.install_name,
+        P_MASTER_MCU_FW: device.master_mcu_fw,
+        P_MODULE_FW: device.module_fw,
+        P_MODULE_PC: device.module_pc,
+        P_MODULE_SN: device.module_sn,
+    }
+
+
+def _inverter_temperature(device: Device) -> float | None:
+    temperature = device.temperature
+    return temperature if temperature is not None and -200 < temperature < 200 else None
+
+
+INVERTER_ENERGY_TOTAL = ESolarSensorEntityDescription(
+    key="energy_total",
+    node=NODE_DEVICE,
+    unique_id_format="inverter_{sn}_energy_total",
+    name_format="Inverter {sn} Energy Total",
+    icon=ICON_POWER,
+    native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    device_class=SensorDeviceClass.ENERGY,
+    state_class=SensorStateClass.TOTAL_INCREASING,
+    value_fn=attrgetter("total_pv_energy"),
+    attributes_fn=_inverter_energy_attributes,
+)
+INVERTER_POWER = ESolarSensorEntityDescription(
+    key="power",
+    node=NODE_DEVICE,
+    unique_id_format="PW_{sn}",
+    name_format="Inverter {sn} Power",
+    icon=ICON_POWER,
+    native_unit_of_measurement=UnitOfPower.WATT,
+    device_class=SensorDeviceClass.POWER,
+    state_class=SensorStateClass.MEASUREMENT,
+    value_fn=attrgetter("power_now"),
+    attributes_fn=_inverter_attributes,
+    live=True,
+    live_updates=True,
+)
+INVERTER_TEMPERATURE = ESolarSensorEntityDescription(
+    key="temperature",
+    node=NODE_DEVICE,
+    unique_id_format="Temp_{sn}",
+    name_format="Inverter {sn} Temperature",
+    icon=ICON_THERMOMETER,
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    value_fn=_inverter_temperature,
+    live=True,
+    strict=True,
+)
+# the period energy counters of every inverter
+INVERTER_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    ESolarSensorEntityDescription(
+        key="energy_today",
+        node=NODE_DEVICE,
+        unique_id_format="inverter_{sn}_today",
+        name_format="Inverter {sn} Energy Today",
+        icon=ICON_METER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("today_pv_energy"),
+    ),
+    ESolarSensorEntityDescription(
+        key="energy_month",
+        node=NODE_DEVICE,
+        unique_id_format="inverter_{sn}_month",
+        name_format="Inverter {sn} Energy Month",
+        icon=ICON_METER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=attrgetter("month_pv_energy"),
+    ),
+)
+
+
+def _string_power(pv: PvString) -> float | None:
+    if pv.power or pv.current is None or pv.voltage is None:
+        return pv.power
+    return pv.current * pv.voltage
+
+
+# the sensors of every PV string of an inverter
+PV_STRING_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    ESolarSensorEntityDescription(
+        key="pv_voltage",
+        node=NODE_PV,
+        unique_id_format="PV{key}_{sn}",
+        name_format="Inverter {sn} PV{key}",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=attrgetter("voltage"),
+        live=True,
+        strict=True,
+    ),
+    ESolarSensorEntityDescription(
+        key="pv_current",
+        node=NODE_PV,
+        unique_id_format="PC{key}_{sn}",
+        name_format="Inverter {sn} PC{key}",
+        icon=ICON_CURRENT_DC,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=attrgetter("current"),
+        live=True,
+    ),
+    ESolarSensorEntityDescription(
+        key="pv_power",
+        node=NODE_PV,
+        unique_id_format="PW{key}_{sn}",
+        name_format="Inverter {sn} string {key} power",
+        icon=ICON_POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=_string_power,
+        live=True,
+    ),
+)
+
+
+def _grid_power(device: Device) -> float:
+    return sum(phase.power or 0 for phase in device.grid_phases)
+
+
+def _grid_power_attributes(device: Device) -> dict:
+    attributes = dict.fromkeys((P_GRID_AC1, P_GRID_AC2, P_GRID_AC3))
+    for phase in device.grid_phases:
+        if phase.power is not None and phase.name in attributes:
+            attributes[phase.name] = phase.power
+    return attributes
+
+
+INVERTER_GRID_POWER = ESolarSensorEntityDescription(
+    key="grid_power",
+    node=NODE_DEVICE,
+    unique_id_format="Grid_Power_watt_{sn}",
+    name_format="Inverter {sn} grid power",
+    icon=ICON_POWER,
+    native_unit_of_measurement=UnitOfPower.WATT,
+    device_class=SensorDeviceClass.POWER,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    value_fn=_grid_power,
+    attributes_fn=_grid_power_attributes,
+    live=True,
+)
+# the sensors of every grid phase of an inverter
+GRID_PHASE_SENSORS: tuple[ESolarSensorEntityDescription, ...] = (
+    ESolarSensorEntityDescription(
+        key="grid_voltage",
+        node=NODE_GRID,
+        unique_id_format="GV{key}{letter}_{sn}",
+        name_format="Inverter {sn} GV{key}{letter}",
+        icon=ICON_GRID_IMPORT,
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=attrgetter("voltage"),
+        live=True,
+        strict=True,
+    ),
+    ESolarSensorEntityDescription(
+        key="grid_current",
+        node=NODE_GRID,
+        unique_id_format="GC{key}{letter}_{sn}",
+        name_format="Inverter {sn} GC{key}{letter}",
+        icon=ICON_CURRENT_AC,
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=attrgetter("current"),
+        live=True,
+    ),
+)
+
+METER_GRID_POWER = ESolarSensorEntityDescription(
+    key="grid_power",
+    node=NODE_MODULE,
+    unique_id_format="Solar_Meter_{sn}_grid_power",
+    name_format="Solar Meter {sn} Grid Power",
+    icon=ICON_POWER,
+    native_unit_of_measurement=UnitOfPower.WATT,
+    device_class=SensorDeviceClass.POWER,
+    state_class=SensorStateClass.MEASUREMENT,
+    value_fn=attrgetter("grid_power"),
+    attributes_fn=attrgetter("attributes"),
+    live=True,
+)
+
+_TEMPERATURE_UNITS = {
+    "℃": UnitOfTemperature.CELSIUS,
+    "C": UnitOfTemperature.CELSIUS,
+    "°F": UnitOfTemperature.FAHRENHEIT,
+    "K": UnitOfTemperature.KELVIN,
+}
+
+
+def _clamp_percent(value: float | None) -> float | None:
+    return None if value is None else min(100.0, max(0.0, value))
+
+
+def _battery_soh(battery: Battery) -> float | None:
+    if battery.soh is None or battery.type == 2:
+        return battery.soh
+    # the cloud reports the wear of the other batteries
+    return _clamp_percent(100.0 - battery.soh)
+
+
+# the battery record field of each battery sensor
+_BATTERY_FIELDS = {
+    "batSoc": "soc",
+    "batTemperature": "temperature",
+    "batPower": "power",
+    "batCurrent": "current",
+    "batVoltage": "voltage",
+    "batSoh": "soh",
+    "todayBatChgEnergy": "today_bat_chg_energy",
+    "todayBatDisEnergy": "today_bat_dis_energy",
+    "totalBatChgEnergy": "total_bat_chg_energy",
+    "totalBatDisEnergy": "total_bat_dis_energy",
+}
+
+
+def _battery_sensor(prop: str, **kwargs: Any) -> ESolarSensorEntityDescription:
+    kwargs.setdefault("state_class", SensorStateClass.MEASUREMENT)
+    kwargs.setdefault("value_fn", attrgetter(_BATTERY_FIELDS[prop]))
+    return ESolarSensorEntityDescription(
+        key=prop,
+        node=NODE_BATTERY,
+        unique_id_format="Solar_battery_{sn}_" + prop,
+        name_format="Battery {sn} " + split_camel_case(prop),
+        **kwargs,
+    )
+
+
+def _battery_energy(prop: str) -> ESolarSensorEntityDescription:
+    return _battery_sensor(
+        prop,
+        icon=ICON_METER,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+    )
+
+
+BATTERY_SENSORS: dict[str, ESolarSensorEntityDescription] = {
+    description.key: description
+    for description in (
+        _battery_sensor(
+            "batSoc",
+            native_unit_of_measurement=PERCENTAGE,
+            device_class=SensorDeviceClass.BATTERY,
+            value_fn=lambda battery: _clamp_percent(battery.soc),
+            attributes_fn=attrgetter("attributes"),
+            live=True,
+        ),
+        _battery_sensor(
+            "batTemperature",
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            device_class=SensorDeviceClass.TEMPERATURE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            unit_fn=lambda battery: _TEMPERATURE_UNITS.get(battery.temperature_unit),
+            live=True,
+        ),
+        _battery_sensor(
+            "batPower",
+            icon=ICON_POWER,
+            native_unit_of_measurement=UnitOfPower.WATT,
+            device_class=SensorDeviceClass.POWER,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            live=True,
+        ),
+        _battery_sensor(
+            "batCurrent",
+            icon=ICON_CURRENT_DC,
+            native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+            device_class=SensorDeviceClass.CURRENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            live=True,
+        ),
+        _battery_sensor(
+            "batVoltage",
+            icon=ICON_LIGHTNING,
+            native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+            device_class=SensorDeviceClass.VOLTAGE,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            live=True,
+        ),
+        _battery_sensor("batSoh", value_fn=_battery_soh),
+        _battery_energy("todayBatChgEnergy"),
+        _battery_energy("todayBatDisEnergy"),
+        _battery_energy("totalBatChgEnergy"),
+        _battery_energy("totalBatDisEnergy"),
+    )
+}
+
+# the batteries of every plant, the builtin ones (type 2) report more
+BATTERY_PROPS = ("batSoc", "batTemperature")
+BUILTIN_BATTERY_PROPS = (
+    "batVoltage",
+    "batCurrent",
+    "batPower",
+    "todayBatChgEnergy",
+    "todayBatDisEnergy",
+    "totalBatChgEnergy",
+    "totalBatDisEnergy",
+)
+EXTERNAL_BATTERY_PROPS = ("batSoh",)
@@ -1,67 +1,22 @@
 """Shared helpers for SAJ eSolar sensor entities."""
 from __future__ import annotations
 
+import time
 from typing import Any
 
-from .const import PLANT_RUNNING_STATE_OFFLINE
+from .model import Device, Plant
+from .plant_index import freeze
 
-_OFFLINE_ONLINE_VALUES = frozenset({"N", "0", "FALSE"})
 
-
-def _as_int(value: Any) -> int | None:
-    if value is None:
-        return None
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        return None
-
-
-def plant_is_offline(plant: dict) -> bool:
-    """Return True when the plant is offline."""
-    state = _as_int(plant.get("runningState"))
-    if state == PLANT_RUNNING_STATE_OFFLINE:
-        return True
-
-    status = _as_int(plant.get("deviceStatus"))
-    if status == PLANT_RUNNING_STATE_OFFLINE:
-        return True
-
-    online = plant.get("isOnline")
-    if online is not None and str(online).upper() in _OFFLINE_ONLINE_VALUES:
-        return True
-
-    return False
-
-
-def device_is_offline(device: dict) -> bool:
-    """Return True when an inverter/device is offline."""
-    state = _as_int(device.get("runningState"))
-    if state == PLANT_RUNNING_STATE_OFFLINE:
-        return True
-
-    online = _as_int(device.get("onLine"))
-    if online == PLANT_RUNNING_STATE_OFFLINE or online == 0:
-        return True
-
-    online_str = _as_int(device.get("onLineStr"))
-    if online_str == PLANT_RUNNING_STATE_OFFLINE:
-        return True
-
-    return False
-
-
-def is_live_data_offline(plant: dict, device: dict | None = None) -> bool:
+def is_live_data_offline(plant: Plant, device: Device | None = None) -> bool:
     """Return True when plant or optional device should not expose live readings."""
-    return plant_is_offline(plant) or (
-        device is not None and device_is_offline(device)
-    )
+    return plant.offline or (device is not None and device.offline)
 
 
 def offline_blocks_live_sensor(
     sensor: Any,
-    plant: dict,
-    device: dict | None = None,
+    plant: Plant,
+    device: Device | None = None,
     *,
     report_zero: bool = False,
 ) -> bool:
@@ -76,3 +31,91 @@ def offline_blocks_live_sensor(
         sensor._attr_available = False
         sensor._attr_native_value = None
     return True
+
+
+def subscribe_live_updates(entity: Any, coordinator: Any) -> None:
+    """Also update a power entity from the live coordinator when it is enabled."""
+    live_coordinator = getattr(coordinator, "live_coordinator", None)
+    if live_coordinator is None:
+        return
+    entity.async_on_remove(
+        live_coordinator.async_add_listener(
+            entity._handle_coordinator_update, entity.coordinator_context
+        )
+    )
+
+
+class StateWriteStats:
+    """Count the state writes the entities of a coordinator made and skipped.
+
+    The coordinators close a cycle when their next refresh starts, after
+    the entities handled the previous one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.written = 0
+        self.skipped = 0
+        self.heartbeats = 0
+        self.total_written = 0
+        self.total_skipped = 0
+        self.last_cycle: dict[str, int] | None = None
+
+    def record(self, written: bool, heartbeat: bool = False) -> None:
+        """Count one entity update."""
+        if written:
+            self.written += 1
+            self.heartbeats += heartbeat
+        else:
+            self.skipped += 1
+
+    def begin_cycle(self) -> dict[str, int] | None:
+        """Close the counts of the previous cycle and return them."""
+        if self.written or self.skipped:
+            self.last_cycle = {
+                "written": self.written,
+                "skipped": self.skipped,
+                "heartbeats": self.heartbeats,
+            }
+            self.total_written += self.written
+            self.total_skipped += self.skipped
+            self.written = self.skipped = self.heartbeats = 0
+            return self.last_cycle
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        """Return the counts of the last cycle and since start."""
+        return {
+            "last_cycle": self.last_cycle,
+            "total_written": self.total_written + self.written,
+            "total_skipped": self.total_skipped + self.skipped,
+        }
+
+
+def publish_state(entity: Any, coordinator: Any) -> bool:
+    """Write the state of an entity when it changed or the heartbeat is due.
+
+    The fingerprint covers availability, value, unit and attributes, which
+    is all a state write would carry. An unchanged state is written again
+    once the heartbeat interval of the coordinator passed, 0 writes always.
+    """
+    fingerprint = (
+        entity.available,
+        entity.native_value,
+        entity.native_unit_of_measurement,
+        freeze(entity.extra_state_attributes),
+    )
+    now = time.monotonic()
+    heartbeat = coordinator.state_heartbeat
+    written_at = getattr(entity, "_state_written_at", None)
+    due = written_at is None or now - written_at >= heartbeat
+    changed = fingerprint != getattr(entity, "_state_fingerprint", None)
+    if not changed and not due:
+        coordinator.state_writes.record(False)
+        return False
+
+    entity._state_fingerprint = fingerprint
+    entity._state_written_at = now
+    entity.async_write_ha_state()
+    coordinator.state_writes.record(True, heartbeat=not changed)
+    return True